@@ -0,0 +1,408 @@
+"""
+Arayüzsüz komut satırı: PySide6 import etmeden WordService ve repository'leri kullanır.
+
+    python -m app.cli import words.csv --group "Book: Dune"
+    python -m app.cli translate serendipity --add
+    python -m app.cli generate --due 50          # cron: vadesi gelen kartlara görev hazırla
+    python -m app.cli grade 42 "I would rather stay home."
+    python -m app.cli export --format csv -o words.csv
+    python -m app.cli backup yedek.sqlite3          # uygulama açıkken de güvenli
+    python -m app.cli maintain                      # cron: arşiv + ANALYZE/vacuum (vadesi gelenler)
+    python -m app.cli regrade --model openai/gpt-4o-mini   # geçmiş cevapları yeni modelle puanla
+    python -m app.cli stats --days 30 --json
+    python -m app.cli usage --refresh              # DeepL karakter kotası, OpenRouter istekleri
+    python -m app.cli sync-export --peer <kopya-id> -o delta.json.gz   # diğer makinede: sync-apply
+
+AI/DeepL anahtarları yalnızca o komut onlara gerçekten ihtiyaç duyarsa aranır.
+"""
+import argparse
+import csv
+import json
+import signal
+import sys
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+from .core import database, rate_limit
+from .services.word_service import WordService
+from .services.sync_service import SyncService, read_bundle, write_bundle
+from .services.export_service import ExportService, EXPORT_FORMATS
+from .services.maintenance_service import MaintenanceService, ARCHIVE_AFTER_DAYS, JOBS
+from .services.regrade_service import RegradeService, REGRADE_BATCH_SIZE, REGRADE_CONCURRENCY
+
+IMPORT_FIELDS = ("term_en", "translation_tr", "group_title")
+
+
+# ---- helpers ----
+def _open_in(path: str):
+    if path == "-":
+        return sys.stdin
+    return open(path, "r", encoding="utf-8-sig", newline="")
+
+
+def _open_out(path: Optional[str]):
+    if not path or path == "-":
+        return sys.stdout
+    return open(path, "w", encoding="utf-8", newline="")
+
+
+def _guess_format(path: str, fmt: Optional[str]) -> str:
+    if fmt:
+        return fmt
+    suffix = Path(path).suffix.lower()
+    return {".jsonl": "jsonl", ".json": "jsonl", ".tsv": "tsv"}.get(suffix, "csv")
+
+
+def _read_rows(fh, fmt: str, default_group: Optional[str]) -> Iterator[Tuple[str, str, Optional[str]]]:
+    """(term_en, translation_tr, group_title) satırları; CSV/TSV başlık satırı opsiyonel."""
+    if fmt == "jsonl":
+        for line in fh:
+            line = line.strip()
+            if not line:
+                continue
+            obj = json.loads(line)
+            yield obj.get("term_en", ""), obj.get("translation_tr", ""), obj.get("group_title") or default_group
+        return
+    reader = csv.reader(fh, delimiter="\t" if fmt == "tsv" else ",")
+    for i, row in enumerate(reader):
+        if not row:
+            continue
+        if i == 0 and [c.strip().lower() for c in row[:3]] == list(IMPORT_FIELDS[:len(row[:3])]):
+            continue  # başlık
+        row = (row + ["", "", ""])[:3]
+        yield row[0], row[1], row[2] or default_group
+
+
+def _word_filters(args) -> dict:
+    filters = {}
+    if args.group is not None:
+        filters["group_title"] = args.group
+    if args.learned is not None:
+        filters["learned"] = args.learned
+    return filters
+
+
+# ---- commands ----
+def cmd_import(service: WordService, args) -> int:
+    fmt = _guess_format(args.file, args.format)
+    with _open_in(args.file) as fh:
+        rows = _read_rows(fh, fmt, args.group)
+        if args.translate_missing:
+            rows = ((t, tr or service.translate(t), g) for t, tr, g in rows)
+        with rate_limit.priority(rate_limit.BULK):  # toplu çeviri, kotanın etkileşimli payına dokunmaz
+            created, updated, unchanged = service.import_words(rows)
+    print(f"eklenen: {created}  güncellenen: {updated}  değişmeyen: {unchanged}")
+    return 0
+
+
+def cmd_translate(service: WordService, args) -> int:
+    for term in args.terms:
+        tr = service.translate(term)
+        print(f"{term}\t{tr}")
+        if args.add and tr and not tr.startswith("Çeviri yapılamadı"):
+            service.add_or_get(term, tr, args.group)
+    return 0
+
+
+def cmd_generate(service: WordService, args) -> int:
+    directions = ("TR", "EN") if args.direction == "both" else (args.direction,)
+    made: List[Tuple[str, str, int]] = []
+    for term in args.terms:
+        w = service.find_word(term)
+        if w is None:
+            print(f"bulunamadı: {term}", file=sys.stderr)
+            continue
+        for d in directions:
+            ex_id = service.create_exercise_tr(w.id) if d == "TR" else service.create_exercise_en(w.id)
+            made.append((w.term_en, d, ex_id))
+    if args.due:
+        # Vadesi gelen kartlar için görev ön-hazırlığı; cevaplanmamış görev varsa yenisi üretilmez
+        for card in service.due_cards(limit=args.due):
+            if args.direction != "both" and card.direction != args.direction:
+                continue
+            w = service.library.get(card.word_id) or service.repo.get_word(card.word_id)
+            made.append((w.term_en if w else str(card.word_id), card.direction, service.exercise_for_card(card)))
+    for term, d, ex_id in made:
+        ex = service.get_exercise(ex_id)
+        print(f"{ex_id}\t{d}\t{term}\t{ex.sentence if ex else ''}")
+    return 0
+
+
+def cmd_grade(service: WordService, args) -> int:
+    if args.file:
+        with _open_in(args.file) as fh:
+            jobs = [(int(o["exercise_id"]), o["answer"]) for o in map(json.loads, filter(str.strip, fh))]
+    elif args.exercise_id is not None and args.answer:
+        jobs = [(args.exercise_id, args.answer)]
+    else:
+        print("grade: EXERCISE_ID ANSWER veya --file gerekli", file=sys.stderr)
+        return 2
+    for ex_id, answer in jobs:
+        score, feedback = service.evaluate_exercise(ex_id, answer)
+        print(json.dumps({"exercise_id": ex_id, "score": score, "feedback": feedback}, ensure_ascii=False))
+    return 0
+
+
+def cmd_export(service: WordService, args) -> int:
+    out = _open_out(args.output)
+    try:
+        n = ExportService().export(out, args.format, examples=args.examples, **_word_filters(args))
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    if out is not sys.stdout:
+        print(f"{n} kelime -> {args.output}", file=sys.stderr)
+    return 0
+
+
+def cmd_backup(service: WordService, args) -> int:
+    def progress(remaining: int, total: int) -> None:
+        if total:
+            print(f"\r{(total - remaining) * 100 // total}%", end="", file=sys.stderr, flush=True)
+
+    dest = ExportService.backup(args.dest, pages=args.pages, progress=None if args.quiet else progress)
+    if not args.quiet:
+        print(f"\ryedek: {dest}", file=sys.stderr)
+    return 0
+
+
+def cmd_stats(service: WordService, args) -> int:
+    series = service.progress(days=args.days, group_title=args.group, direction=args.direction)
+    lib = service.library
+    data = {
+        "words": len(lib),
+        "learned_total": lib.learned_count,
+        "due": service.count_due(),
+        "from": series.days[0],
+        "to": series.days[-1],
+        **series.totals,
+        "score_histogram": [int(n) for n in series.histogram],
+        "word_average_histogram": [int(n) for n in service.word_average_histogram()],
+    }
+    if args.json:
+        print(json.dumps(data, ensure_ascii=False))
+        return 0
+    print(f"Kelime: {data['words']}  Öğrenilen: {data['learned_total']}  Vadesi gelen: {data['due']}")
+    print(f"{data['from']} – {data['to']}: eklenen {data['added']}, öğrenilen {data['learned']}, "
+          f"puanlanan {data['graded']}")
+    print("Puan dağılımı: " + " ".join(f"{i}:{n}" for i, n in enumerate(data["score_histogram"])))
+    return 0
+
+
+def cmd_usage(service: WordService, args) -> int:
+    if args.refresh and not service.translator.refresh_usage():
+        print("DeepL kullanımı alınamadı; yerel sayaç gösteriliyor", file=sys.stderr)
+    rows = rate_limit.status()
+    if args.json:
+        print(json.dumps(rows, ensure_ascii=False))
+        return 0
+    for st in rows:
+        budget = f"{st['used']}/{st['quota']}  kalan {st['remaining']}" if st["quota"] else f"{st['used']} (kota yok)"
+        print(f"{st['provider']}\t{st['period']}\t{budget}\t{st['requests']} istek, "
+              f"{st['rate_per_min']}/dk, 429: {st['throttled']}")
+    return 0
+
+
+def cmd_sync_status(service: WordService, args) -> int:
+    st = SyncService().status()
+    print(f"kopya: {st['replica']}  son seq: {st['seq']}")
+    return 0
+
+
+def cmd_sync_export(service: WordService, args) -> int:
+    bundle = SyncService().export_delta(since=args.since, peer=args.peer)
+    n = len(bundle["words"]) + len(bundle["examples"]) + len(bundle["exercises"]) + len(bundle["deleted"])
+    if args.output and args.output != "-":
+        size = write_bundle(bundle, args.output)
+        print(f"{n} değişiklik (seq {bundle['since']}..{bundle['until']}), {size} bayt -> {args.output}",
+              file=sys.stderr)
+    else:
+        print(json.dumps(bundle, ensure_ascii=False))
+    return 0
+
+
+def cmd_sync_apply(service: WordService, args) -> int:
+    sync = SyncService()
+    for path in args.files:
+        bundle = json.load(sys.stdin) if path == "-" else read_bundle(path)
+        st = sync.apply_delta(bundle)
+        print(f"{path}: " + "  ".join(f"{k}: {v}" for k, v in st.items()))
+    return 0
+
+
+def cmd_maintain(service: WordService, args) -> int:
+    maint = MaintenanceService()
+    if args.dry_run:
+        st = maint.archive(args.days, dry_run=True)
+        print(f"arşivlenecek: {st['words']} kelime, {st['examples']} örnek/görev")
+        return 0
+    jobs = args.only or (JOBS if args.force else maint.due_jobs())
+    results = maint.run(jobs, args.days, full_vacuum=args.full_vacuum)
+    for job, res in results.items():
+        print(f"{job}: {json.dumps(res, ensure_ascii=False)}")
+    s = maint.summary()
+    print(f"arşiv: {s['batches']} paket, {s['examples']} örnek, {s['exercises']} görev, "
+          f"{s['raw_bytes']} -> {s['packed_bytes']} bayt; DB {s['page_count'] * s['page_size']} bayt "
+          f"({s['freelist_count']} boş sayfa)")
+    return 0
+
+
+def cmd_archived(service: WordService, args) -> int:
+    w = service.find_word(args.term)
+    if w is None:
+        print(f"bulunamadı: {args.term}", file=sys.stderr)
+        return 1
+    rows = MaintenanceService().archived(w.id)
+    for kind in ("exercises", "examples"):
+        for r in rows[kind]:
+            print(json.dumps({"kind": kind[:-1], **r}, ensure_ascii=False))
+    return 0
+
+
+def cmd_regrade(service: WordService, args) -> int:
+    regrade = RegradeService(model=args.model)
+
+    def progress(job: dict) -> None:
+        print(f"\r{job['done'] + job['failed']}/{job['total']}  değişen: {job['changed']}  hata: {job['failed']}",
+              end="", file=sys.stderr, flush=True)
+
+    # Ctrl-C: gönderilmiş istekler biter, sayfa yazılır, iş kaldığı yerden devam ettirilebilir
+    signal.signal(signal.SIGINT, lambda *_: regrade.stop_event.set())
+    job = regrade.run(args.batch, args.concurrency, restart=args.restart, progress=progress)
+    print(file=sys.stderr)
+    print(json.dumps(job, ensure_ascii=False))
+    if regrade.last_error:
+        print(f"son hata: {regrade.last_error}", file=sys.stderr)
+    stale = regrade.archived_other_models(job["model"])
+    if stale:
+        print(f"uyarı: arşivde başka modelle verilmiş {stale} puan var; yeniden puanlanmaz, ortalamalarda kalır "
+              f"(bkz. regrade-status)", file=sys.stderr)
+    return 0
+
+
+def cmd_regrade_status(service: WordService, args) -> int:
+    st = RegradeService().status()
+    for m in st["by_model"]:
+        print(f"{m['model'] or '(kayıtsız)'}\t{m['count']} puan\tortalama {m['avg']}")
+    for m in st["archived"]:
+        print(f"arşiv: {m['model'] or '(kayıtsız)'}\t{m['count']} puan\tortalama {m['avg']}\t(yeniden puanlanmaz)")
+    for j in st["jobs"]:
+        print(f"iş {j['id']}: {j['model']} {j['status']} {j['done'] + j['failed']}/{j['total']} "
+              f"(değişen {j['changed']}, hata {j['failed']}) {j['updated_at']}")
+    return 0
+
+
+# ---- entry ----
+def build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(prog="python -m app.cli", description="Kelime kütüphanesi (arayüzsüz)")
+    p.add_argument("--db", help=f"SQLite dosyası (varsayılan: {database.DB_PATH})")
+    sub = p.add_subparsers(dest="command", required=True)
+
+    s = sub.add_parser("import", help="CSV/TSV/JSONL'den kelime içe aktar (- = stdin)")
+    s.add_argument("file")
+    s.add_argument("--format", choices=("csv", "tsv", "jsonl"))
+    s.add_argument("--group", help="grup sütunu boş satırlar için grup başlığı")
+    s.add_argument("--translate-missing", action="store_true", help="çevirisi boş satırları DeepL ile doldur")
+    s.set_defaults(func=cmd_import)
+
+    s = sub.add_parser("translate", help="EN→TR çeviri (DeepL)")
+    s.add_argument("terms", nargs="+")
+    s.add_argument("--add", action="store_true", help="kütüphaneye de ekle")
+    s.add_argument("--group")
+    s.set_defaults(func=cmd_translate)
+
+    s = sub.add_parser("generate", help="AI görev cümlesi üret")
+    s.add_argument("terms", nargs="*", help="kütüphanedeki EN terimler")
+    s.add_argument("--direction", choices=("TR", "EN", "both"), default="both")
+    s.add_argument("--due", type=int, default=0, metavar="N", help="vadesi gelen ilk N kart için görev hazırla")
+    s.set_defaults(func=cmd_generate)
+
+    s = sub.add_parser("grade", help="görev cevabını AI ile puanla")
+    s.add_argument("exercise_id", nargs="?", type=int)
+    s.add_argument("answer", nargs="?")
+    s.add_argument("--file", help='JSONL: {"exercise_id": .., "answer": ..} (- = stdin)')
+    s.set_defaults(func=cmd_grade)
+
+    s = sub.add_parser("export", help="kelimeleri (örnekleriyle) dışa aktar")
+    s.add_argument("--format", choices=EXPORT_FORMATS, default="jsonl",
+                   help="anki: Anki metin içe aktarma dosyası")
+    s.add_argument("-o", "--output", help="çıktı dosyası (varsayılan stdout)")
+    s.add_argument("--no-examples", dest="examples", action="store_false", help="örnek cümleleri katma")
+    s.add_argument("--group")
+    learned = s.add_mutually_exclusive_group()
+    learned.add_argument("--learned", dest="learned", action="store_const", const=True)
+    learned.add_argument("--not-learned", dest="learned", action="store_const", const=False)
+    s.set_defaults(func=cmd_export, learned=None)
+
+    s = sub.add_parser("backup", help="çevrim içi veritabanı yedeği (uygulama açıkken de)")
+    s.add_argument("dest")
+    s.add_argument("--pages", type=int, default=database.BACKUP_PAGES, help="adım başına kopyalanan sayfa")
+    s.add_argument("-q", "--quiet", action="store_true")
+    s.set_defaults(func=cmd_backup)
+
+    s = sub.add_parser("maintain", help="arşivleme ve bakım (vadesi gelen işler)")
+    s.add_argument("--days", type=int, default=ARCHIVE_AFTER_DAYS,
+                   help="öğrenilmiş kelimelerde bundan eski örnek/görevler arşive")
+    s.add_argument("--only", nargs="+", choices=JOBS, help="yalnızca bu işler (zamanlamaya bakmadan)")
+    s.add_argument("--force", action="store_true", help="tüm işler, zamanlamaya bakmadan")
+    s.add_argument("--full-vacuum", action="store_true",
+                   help="tam VACUUM (eski DB'yi incremental vacuum'a geçirir; DB kilitlenir)")
+    s.add_argument("--dry-run", action="store_true", help="yalnızca arşivlenecekleri say")
+    s.set_defaults(func=cmd_maintain)
+
+    s = sub.add_parser("archived", help="bir kelimenin arşivlenmiş örnek/görevleri (JSONL)")
+    s.add_argument("term")
+    s.set_defaults(func=cmd_archived)
+
+    s = sub.add_parser("regrade", help="puanlı geçmiş cevapları tek modelle yeniden puanla (devam ettirilebilir)")
+    s.add_argument("--model", help="varsayılan OPENROUTER_MODEL; fallback kullanılmaz")
+    s.add_argument("--concurrency", type=int, default=REGRADE_CONCURRENCY)
+    s.add_argument("--batch", type=int, default=REGRADE_BATCH_SIZE, help="kontrol noktası başına cevap")
+    s.add_argument("--restart", action="store_true", help="yarım işi bırakıp baştan başla")
+    s.set_defaults(func=cmd_regrade)
+
+    s = sub.add_parser("regrade-status", help="modele göre puan dağılımı ve yeniden puanlama işleri")
+    s.set_defaults(func=cmd_regrade_status)
+
+    s = sub.add_parser("usage", help="DeepL/OpenRouter kullanımı ve kalan kota (bu dönem)")
+    s.add_argument("--refresh", action="store_true", help="DeepL'den güncel kullanımı al")
+    s.add_argument("--json", action="store_true")
+    s.set_defaults(func=cmd_usage)
+
+    s = sub.add_parser("stats", help="ilerleme özeti")
+    s.add_argument("--days", type=int, default=365)
+    s.add_argument("--group")
+    s.add_argument("--direction", choices=("TR", "EN"))
+    s.add_argument("--json", action="store_true")
+    s.set_defaults(func=cmd_stats)
+
+    s = sub.add_parser("sync-status", help="bu kopyanın eşitleme kimliği ve son seq")
+    s.set_defaults(func=cmd_sync_status)
+
+    s = sub.add_parser("sync-export", help="başka bir kopya için değişiklik paketi (delta)")
+    s.add_argument("--peer", help="hedef kopya id'si; since varsayılanı ona son gönderilen seq")
+    s.add_argument("--since", type=int, help="bu seq'ten sonraki değişiklikler (0 = tümü)")
+    s.add_argument("-o", "--output", help="paket dosyası (.gz ise sıkıştırılır; varsayılan stdout)")
+    s.set_defaults(func=cmd_sync_export)
+
+    s = sub.add_parser("sync-apply", help="değişiklik paket(ler)ini uygula (- = stdin)")
+    s.add_argument("files", nargs="+")
+    s.set_defaults(func=cmd_sync_apply)
+    return p
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.db:
+        database.DB_PATH = Path(args.db)
+    try:
+        return args.func(WordService(), args)
+    except (RuntimeError, ValueError) as e:
+        print(f"hata: {e}", file=sys.stderr)
+        return 1
+    except BrokenPipeError:
+        return 0  # ör. `export | head`
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,8 @@
 # app/core/ai_client.py
 import os, json, re, time
 from typing import Tuple
-from openai import OpenAI, APITimeoutError, APIConnectionError, APIError, RateLimitError
+from . import rate_limit
+# openai (~0.7 sn import) ilk AIClient kurulurken yüklenir; açılışta ve AI kullanmayan komutlarda yüklenmez
 
 def _to_int(s, default):
     try:
@@ -9,6 +10,14 @@ def _to_int(s, default):
     except Exception:
         return default
 
+def _retry_after(err, default: float) -> float:
+    """429 yanıtındaki Retry-After (sn); yoksa default."""
+    headers = getattr(getattr(err, "response", None), "headers", None) or {}
+    try:
+        return max(0.0, float(headers.get("retry-after")))
+    except (TypeError, ValueError):
+        return default
+
 class AIClient:
     def __init__(self):
         api_key = os.getenv("OPENROUTER_API_KEY")
@@ -20,8 +29,11 @@ class AIClient:
         self.fallback_model = os.getenv("OPENROUTER_MODEL_FALLBACK", "deepseek/deepseek-r1:free")
         self.timeout = _to_int(os.getenv("OPENROUTER_TIMEOUT", "20"), 20)
         self.max_retries = _to_int(os.getenv("OPENROUTER_MAX_RETRIES", "2"), 2)
+        self.limiter = rate_limit.limiter(rate_limit.OPENROUTER)  # süreçteki tüm AIClient'larla ortak
 
-        self.client = OpenAI(api_key=api_key, base_url=self.base_url)
+        from openai import OpenAI
+        # Yeniden denemeler _complete'te (limiter üzerinden); SDK'nın kendi denemeleri hız sınırını atlardı
+        self.client = OpenAI(api_key=api_key, base_url=self.base_url, max_retries=0)
 
     # ---------- public ----------
     def generate_tr_sentence(self, term_en: str, tr_word: str) -> str:
@@ -55,6 +67,11 @@ class AIClient:
         direction == 'TR': original TR, user EN -> better önerisi İNGİLİZCE döner.
         direction == 'EN': original EN, user TR -> better önerisi TÜRKÇE döner.
         """
+        score, combined, _model = self.grade(direction, original_sentence, user_translation)
+        return score, combined
+
+    def grade(self, direction: str, original_sentence: str, user_translation: str) -> Tuple[int, str, str]:
+        """score_translation + puanı veren model (fallback'e düştüyse o); puanlar modele göre karşılaştırılır."""
         if direction == 'TR':
             src_lang, tgt_lang = 'Turkish', 'English'
             better_hint = "Give 'better' in English."
@@ -75,14 +92,14 @@ class AIClient:
             "  'better': a more fluent/natural target-language version that preserves the meaning.\n"
             f"{better_hint}"
         )}
-        raw = self._complete_compact([system, user], max_tokens=200, temperature=0.2)
+        raw, model = self._complete([system, user], max_tokens=200, temperature=0.2)
 
         score, fb, better = self._parse_grade_json(raw)
         # 'feedback' + daha akıcı öneriyi tek metinde birleştiriyoruz (DB şemasını büyütmeden).
         combined = fb.strip()
         if better:
             combined = f"{combined}\n{better_label}: {better}"
-        return score, combined
+        return score, combined, model
 
     def _parse_grade_json(self, text: str) -> Tuple[int, str, str]:
         """
@@ -109,7 +126,11 @@ class AIClient:
 
     # ---------- internals ----------
     def _complete_compact(self, messages, *, max_tokens=128, temperature=0.7) -> str:
-        """Kısa prompt + timeout + retry + reasoning azaltma + fallback."""
+        return self._complete(messages, max_tokens=max_tokens, temperature=temperature)[0]
+
+    def _complete(self, messages, *, max_tokens=128, temperature=0.7) -> Tuple[str, str]:
+        """Kısa prompt + timeout + retry + reasoning azaltma + fallback. (içerik, yanıtlayan model)"""
+        from openai import APITimeoutError, APIConnectionError, APIError, RateLimitError
         models_try = [self.model]
         if self.fallback_model and self.fallback_model != self.model:
             models_try.append(self.fallback_model)
@@ -129,6 +150,9 @@ class AIClient:
                     if "r1" in model_name.lower() or "reason" in model_name.lower():
                         kwargs["reasoning"] = {"effort": "low"}  # içerik için yer kalsın
 
+                    # kota doluysa BudgetExceeded, priority(stop=...) set edildiyse Cancelled (yeniden denenmez)
+                    if not self.limiter.acquire():
+                        raise rate_limit.Cancelled("istek durduruldu")
                     resp = self.client.chat.completions.create(**kwargs)
                     msg = resp.choices[0].message
                     content = (getattr(msg, "content", "") or "").strip()
@@ -142,9 +166,14 @@ class AIClient:
                     if not content:
                         raise APIError("Empty content from model.")
 
-                    return content
+                    return content, model_name
 
-                except (APITimeoutError, APIConnectionError, RateLimitError, APIError) as e:
+                except RateLimitError as e:
+                    # Bu thread uyumak yerine limiter'ı durdurur: diğer istekler de beklesin
+                    last_err = e
+                    self.limiter.backoff(_retry_after(e, 1.2 * (attempt + 1)))
+                    continue
+                except (APITimeoutError, APIConnectionError, APIError) as e:
                     last_err = e
                     time.sleep(1.2 * (attempt + 1))
                     continue
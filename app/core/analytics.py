@@ -0,0 +1,128 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import List, Optional, Sequence
+from .scheduler import utcnow
+
+np = None  # opsiyonel: vektörel toplama; ilk analizde yüklenir (açılışı yavaşlatmasın)
+_NUMPY_OK: Optional[bool] = None
+
+
+def _numpy_ok() -> bool:
+    global np, _NUMPY_OK
+    if _NUMPY_OK is None:
+        try:
+            import numpy
+        except Exception:
+            _NUMPY_OK = False
+        else:
+            np, _NUMPY_OK = numpy, True
+    return _NUMPY_OK
+
+SCORE_BINS = 11  # 0..10
+
+
+@dataclass(slots=True)
+class ProgressSeries:
+    """Gün gün ilerleme serileri (her dizi len(days) uzunlukta) + toplam puan histogramı."""
+    days: List[str]
+    added: Sequence[int]
+    learned: Sequence[int]
+    graded: Sequence[int]
+    avg_score: Sequence[float]       # o gün puan yoksa 0
+    histogram: Sequence[int] = field(default_factory=lambda: [0] * SCORE_BINS)
+
+    @property
+    def totals(self) -> dict:
+        return {"added": int(sum(self.added)), "learned": int(sum(self.learned)), "graded": int(sum(self.graded))}
+
+
+def _day_range(days: int, end: Optional[date]) -> List[str]:
+    end = end or utcnow().date()  # gün anahtarları SQLite date(CURRENT_TIMESTAMP) gibi UTC
+    start = end - timedelta(days=days - 1)
+    return [(start + timedelta(days=i)).isoformat() for i in range(days)]
+
+
+def progress_series(stats, days: int = 365, end: Optional[date] = None,
+                    group_title: Optional[str] = None, direction: Optional[str] = None) -> ProgressSeries:
+    """
+    Son `days` günün serileri; günlük toplam tablolarından iki sorguyla okunur.
+    stats: StatsRepository. numpy varsa toplama vektörel, yoksa düz Python.
+    """
+    day_list = _day_range(days, end)
+    counts = stats.daily_counts(day_list[0], group_title=group_title)
+    scores = stats.daily_scores(day_list[0], group_title=group_title, direction=direction)
+    if _numpy_ok():
+        return _series_numpy(day_list, counts, scores)
+    return _series_python(day_list, counts, scores)
+
+
+def _series_numpy(day_list: List[str], counts: list, scores: list) -> ProgressSeries:
+    n = len(day_list)
+    start = np.datetime64(day_list[0], "D")
+    added = np.zeros(n, dtype=np.int64)
+    learned = np.zeros(n, dtype=np.int64)
+    graded = np.zeros(n, dtype=np.int64)
+    total = np.zeros(n, dtype=np.int64)
+    hist = np.zeros(SCORE_BINS, dtype=np.int64)
+    if counts:
+        c_days, c_added, c_learned = zip(*counts)
+        idx = (np.array(c_days, dtype="datetime64[D]") - start).astype(np.int64)
+        ok = (idx >= 0) & (idx < n)
+        np.add.at(added, idx[ok], np.asarray(c_added, dtype=np.int64)[ok])
+        np.add.at(learned, idx[ok], np.asarray(c_learned, dtype=np.int64)[ok])
+    if scores:
+        s_days, s_score, s_n = zip(*scores)
+        idx = (np.array(s_days, dtype="datetime64[D]") - start).astype(np.int64)
+        sc = np.asarray(s_score, dtype=np.int64)
+        cnt = np.asarray(s_n, dtype=np.int64)
+        ok = (idx >= 0) & (idx < n)
+        np.add.at(graded, idx[ok], cnt[ok])
+        np.add.at(total, idx[ok], (sc * cnt)[ok])
+        inb = ok & (sc >= 0) & (sc < SCORE_BINS)
+        hist = np.bincount(sc[inb], weights=cnt[inb], minlength=SCORE_BINS).astype(np.int64)
+    avg = np.divide(total, graded, out=np.zeros(n, dtype=np.float64), where=graded > 0)
+    return ProgressSeries(day_list, added, learned, graded, avg, hist)
+
+
+def _series_python(day_list: List[str], counts: list, scores: list) -> ProgressSeries:
+    pos = {d: i for i, d in enumerate(day_list)}
+    n = len(day_list)
+    added, learned, graded, total = [0] * n, [0] * n, [0] * n, [0] * n
+    hist = [0] * SCORE_BINS
+    for d, a, l in counts:
+        i = pos.get(d)
+        if i is not None:
+            added[i] += a
+            learned[i] += l
+    for d, sc, cnt in scores:
+        i = pos.get(d)
+        if i is None:
+            continue
+        graded[i] += cnt
+        total[i] += sc * cnt
+        if 0 <= sc < SCORE_BINS:
+            hist[sc] += cnt
+    avg = [t / g if g else 0.0 for t, g in zip(total, graded)]
+    return ProgressSeries(day_list, added, learned, graded, avg, hist)
+
+
+def word_average_histogram(stats) -> List[int]:
+    """
+    Kelime başına ortalama puanın 0..10 histogramı (puanı olmayanlar hariç).
+    Sütunlar tek sorguda okunur; numpy varsa dizilere yüklenip vektörel toplanır.
+    """
+    rows = stats.word_score_columns()
+    if _numpy_ok():
+        if not rows:
+            return [0] * SCORE_BINS
+        cols = np.array(rows, dtype=np.float64).reshape(-1, 3)
+        sums, cnts = cols[:, 0], cols[:, 1]
+        has = cnts > 0
+        bins = np.clip(np.rint(sums[has] / cnts[has]), 0, SCORE_BINS - 1).astype(np.int64)
+        return np.bincount(bins, minlength=SCORE_BINS).tolist()
+    hist = [0] * SCORE_BINS
+    for s, cnt, _ in rows:
+        if cnt:
+            hist[min(SCORE_BINS - 1, max(0, round(s / cnt)))] += 1
+    return hist
@@ -1,5 +1,12 @@
+import json
+import os
+import queue
 import sqlite3
+import threading
+import zlib
 from pathlib import Path
+from typing import Callable, Optional
+from .term_index import normalize_term
 
 DB_PATH = Path(__file__).resolve().parent.parent / "vocab.sqlite3"
 
@@ -13,7 +20,11 @@ CREATE TABLE IF NOT EXISTS words (
     group_title TEXT DEFAULT NULL,
     is_learned INTEGER DEFAULT 0,
     learned_at DATETIME DEFAULT NULL,
-    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    term_norm TEXT DEFAULT NULL,
+    score_sum INTEGER NOT NULL DEFAULT 0,
+    score_count INTEGER NOT NULL DEFAULT 0,
+    last_score INTEGER DEFAULT NULL
 );
 
 CREATE TABLE IF NOT EXISTS examples (
@@ -47,6 +58,541 @@ CREATE TABLE IF NOT EXISTS exercises (
 CREATE INDEX IF NOT EXISTS idx_exercises_word_id ON exercises(word_id);
 """
 
+# Keyset sayfalama (created_at DESC, id DESC) için bileşik indeksler
+PAGING_INDEXES_SQL = """
+CREATE INDEX IF NOT EXISTS idx_words_created ON words(created_at, id);
+CREATE INDEX IF NOT EXISTS idx_examples_word_created ON examples(word_id, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_exercises_word_created ON exercises(word_id, created_at, id);
+"""
+
+# words.score_sum / score_count / last_score, examples ile aynı transaction'da
+# trigger'larla güncellenir; ortalama için AVG() taraması gerekmez. Arşivlemede
+# (app_flags 'archiving') silme toplamlardan düşülmez: arşivlenen puanlar ortalamada kalır.
+# last_score en yeni puanlı örnektir (senkronla eski tarihli satır da gelebilir);
+# idx_examples_word_created üzerinden ters tarama ile bulunur.
+_LAST_SCORE = """(SELECT e.score FROM examples e WHERE e.word_id = {word} AND e.score IS NOT NULL
+                  ORDER BY e.created_at DESC, e.id DESC LIMIT 1)"""
+
+TRIGGERS_SQL = f"""
+CREATE TRIGGER IF NOT EXISTS trg_examples_score_ins AFTER INSERT ON examples
+WHEN NEW.score IS NOT NULL
+BEGIN
+    UPDATE words SET score_sum = score_sum + NEW.score,
+                     score_count = score_count + 1,
+                     last_score = {_LAST_SCORE.format(word="NEW.word_id")}
+     WHERE id = NEW.word_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_examples_score_del AFTER DELETE ON examples
+WHEN OLD.score IS NOT NULL AND NOT EXISTS (SELECT 1 FROM app_flags WHERE name = 'archiving')
+BEGIN
+    UPDATE words SET score_sum = score_sum - OLD.score,
+                     score_count = score_count - 1,
+                     last_score = {_LAST_SCORE.format(word="OLD.word_id")}
+     WHERE id = OLD.word_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_examples_score_upd AFTER UPDATE OF score, word_id ON examples
+WHEN OLD.score IS NOT NEW.score OR OLD.word_id != NEW.word_id
+BEGIN
+    UPDATE words SET score_sum = score_sum - OLD.score,
+                     score_count = score_count - 1
+     WHERE id = OLD.word_id AND OLD.score IS NOT NULL;
+    UPDATE words SET score_sum = score_sum + NEW.score,
+                     score_count = score_count + 1
+     WHERE id = NEW.word_id AND NEW.score IS NOT NULL;
+    UPDATE words SET last_score = {_LAST_SCORE.format(word="words.id")}
+     WHERE id IN (OLD.word_id, NEW.word_id);
+END;
+"""
+
+BACKFILL_SCORES_SQL = f"""
+UPDATE words SET
+    score_sum = COALESCE((SELECT SUM(e.score) FROM examples e WHERE e.word_id = words.id AND e.score IS NOT NULL), 0),
+    score_count = (SELECT COUNT(e.score) FROM examples e WHERE e.word_id = words.id),
+    last_score = {_LAST_SCORE.format(word="words.id")}
+"""
+
+# last_score'u güncellemeyen eski trigger'lar düşürülüp yeniden kurulur (bkz. _upgrade_triggers)
+_LAST_SCORE_TRIGGERS = ("trg_examples_score_ins", "trg_examples_score_del", "trg_examples_score_upd")
+
+# Tam metin arama: kelime (terim/çeviri/not), örnek cümle ve görev cümlesi tek FTS5
+# tablosunda. rowid = kaynak_id * 4 + tür (1: word, 2: example, 3: exercise), böylece
+# trigger'lar satırı rowid ile O(log n) siler/yeniler.
+SEARCH_SQL = """
+CREATE VIRTUAL TABLE IF NOT EXISTS search_fts USING fts5(
+    term, translation, body,
+    kind UNINDEXED, word_id UNINDEXED,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '3'
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_words_fts_ins AFTER INSERT ON words BEGIN
+    INSERT INTO search_fts(rowid, term, translation, body, kind, word_id)
+    VALUES (NEW.id * 4 + 1, NEW.term_en, NEW.translation_tr, COALESCE(NEW.notes, ''), 'word', NEW.id);
+END;
+CREATE TRIGGER IF NOT EXISTS trg_words_fts_upd AFTER UPDATE OF term_en, translation_tr, notes ON words BEGIN
+    DELETE FROM search_fts WHERE rowid = OLD.id * 4 + 1;
+    INSERT INTO search_fts(rowid, term, translation, body, kind, word_id)
+    VALUES (NEW.id * 4 + 1, NEW.term_en, NEW.translation_tr, COALESCE(NEW.notes, ''), 'word', NEW.id);
+END;
+CREATE TRIGGER IF NOT EXISTS trg_words_fts_del AFTER DELETE ON words BEGIN
+    DELETE FROM search_fts WHERE rowid = OLD.id * 4 + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_examples_fts_ins AFTER INSERT ON examples BEGIN
+    INSERT INTO search_fts(rowid, term, translation, body, kind, word_id)
+    VALUES (NEW.id * 4 + 2, '', '', NEW.text, 'example', NEW.word_id);
+END;
+CREATE TRIGGER IF NOT EXISTS trg_examples_fts_upd AFTER UPDATE OF text, word_id ON examples BEGIN
+    DELETE FROM search_fts WHERE rowid = OLD.id * 4 + 2;
+    INSERT INTO search_fts(rowid, term, translation, body, kind, word_id)
+    VALUES (NEW.id * 4 + 2, '', '', NEW.text, 'example', NEW.word_id);
+END;
+CREATE TRIGGER IF NOT EXISTS trg_examples_fts_del AFTER DELETE ON examples BEGIN
+    DELETE FROM search_fts WHERE rowid = OLD.id * 4 + 2;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_exercises_fts_ins AFTER INSERT ON exercises BEGIN
+    INSERT INTO search_fts(rowid, term, translation, body, kind, word_id)
+    VALUES (NEW.id * 4 + 3, '', '', NEW.sentence, 'exercise', NEW.word_id);
+END;
+CREATE TRIGGER IF NOT EXISTS trg_exercises_fts_upd AFTER UPDATE OF sentence, word_id ON exercises BEGIN
+    DELETE FROM search_fts WHERE rowid = OLD.id * 4 + 3;
+    INSERT INTO search_fts(rowid, term, translation, body, kind, word_id)
+    VALUES (NEW.id * 4 + 3, '', '', NEW.sentence, 'exercise', NEW.word_id);
+END;
+CREATE TRIGGER IF NOT EXISTS trg_exercises_fts_del AFTER DELETE ON exercises BEGIN
+    DELETE FROM search_fts WHERE rowid = OLD.id * 4 + 3;
+END;
+"""
+
+BACKFILL_SEARCH_SQL = """
+INSERT INTO search_fts(rowid, term, translation, body, kind, word_id)
+    SELECT id * 4 + 1, term_en, translation_tr, COALESCE(notes, ''), 'word', id FROM words;
+INSERT INTO search_fts(rowid, term, translation, body, kind, word_id)
+    SELECT id * 4 + 2, '', '', text, 'example', word_id FROM examples;
+INSERT INTO search_fts(rowid, term, translation, body, kind, word_id)
+    SELECT id * 4 + 3, '', '', sentence, 'exercise', word_id FROM exercises;
+"""
+
+# Aralıklı tekrar (SM-2): kelime + yön başına bir kart. due_at CURRENT_TIMESTAMP
+# biçiminde metin; (due_at, word_id) indeksi "sıradaki N kart"ı O(log n + N) verir.
+SCHEDULE_SQL = """
+CREATE TABLE IF NOT EXISTS review_schedule (
+    word_id INTEGER NOT NULL,
+    direction TEXT NOT NULL CHECK(direction IN ('TR','EN')),
+    ease REAL NOT NULL DEFAULT 2.5,
+    interval_days REAL NOT NULL DEFAULT 0,
+    repetitions INTEGER NOT NULL DEFAULT 0,
+    lapses INTEGER NOT NULL DEFAULT 0,
+    due_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    last_reviewed_at DATETIME DEFAULT NULL,
+    PRIMARY KEY (word_id, direction),
+    FOREIGN KEY(word_id) REFERENCES words(id) ON DELETE CASCADE
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_review_due ON review_schedule(due_at, word_id);
+
+CREATE TRIGGER IF NOT EXISTS trg_words_schedule_ins AFTER INSERT ON words BEGIN
+    INSERT OR IGNORE INTO review_schedule(word_id, direction, due_at)
+    VALUES (NEW.id, 'TR', COALESCE(NEW.created_at, CURRENT_TIMESTAMP)),
+           (NEW.id, 'EN', COALESCE(NEW.created_at, CURRENT_TIMESTAMP));
+END;
+CREATE TRIGGER IF NOT EXISTS trg_words_schedule_del AFTER DELETE ON words BEGIN
+    DELETE FROM review_schedule WHERE word_id = OLD.id;
+END;
+"""
+
+# Mevcut kelimeler için kartlar: öğrenilmişler 3 hafta sonra, diğerleri hemen tekrar
+BACKFILL_SCHEDULE_SQL = """
+INSERT OR IGNORE INTO review_schedule(word_id, direction, interval_days, repetitions, due_at)
+    SELECT w.id, d.direction,
+           CASE WHEN w.is_learned THEN 21 ELSE 0 END,
+           CASE WHEN w.is_learned THEN 3 ELSE 0 END,
+           CASE WHEN w.is_learned THEN datetime(COALESCE(w.learned_at, CURRENT_TIMESTAMP), '+21 days')
+                ELSE COALESCE(w.created_at, CURRENT_TIMESTAMP) END
+      FROM words w CROSS JOIN (SELECT 'TR' AS direction UNION ALL SELECT 'EN') d
+"""
+
+# İlerleme istatistikleri: gün + grup (+ yön + puan) başına önceden toplanmış sayaçlar.
+# Trigger'larla artımlı güncellenir; istatistik ekranı words/examples taramaz.
+# Grup değişince kelimenin eklenme/öğrenilme ve puan sayaçları yeni gruba taşınır.
+ANALYTICS_SQL = """
+CREATE TABLE IF NOT EXISTS stats_daily (
+    day TEXT NOT NULL,
+    group_title TEXT NOT NULL DEFAULT '',
+    words_added INTEGER NOT NULL DEFAULT 0,
+    words_learned INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, group_title)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS stats_daily_scores (
+    day TEXT NOT NULL,
+    group_title TEXT NOT NULL DEFAULT '',
+    direction TEXT NOT NULL DEFAULT '',
+    score INTEGER NOT NULL,
+    n INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, group_title, direction, score)
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS trg_stats_words_ins AFTER INSERT ON words BEGIN
+    INSERT INTO stats_daily(day, group_title, words_added)
+    VALUES (date(COALESCE(NEW.created_at, CURRENT_TIMESTAMP)), COALESCE(NEW.group_title, ''), 1)
+    ON CONFLICT(day, group_title) DO UPDATE SET words_added = words_added + 1;
+    INSERT INTO stats_daily(day, group_title, words_learned)
+    SELECT date(COALESCE(NEW.learned_at, NEW.created_at, CURRENT_TIMESTAMP)), COALESCE(NEW.group_title, ''), 1
+     WHERE NEW.is_learned
+    ON CONFLICT(day, group_title) DO UPDATE SET words_learned = words_learned + 1;
+END;
+
+-- Kelime silinmeden önce örneklerinin puanları düşülür (cascade/yetim örnekler sayılmaz)
+CREATE TRIGGER IF NOT EXISTS trg_stats_words_before_del BEFORE DELETE ON words BEGIN
+    UPDATE stats_daily_scores SET n = n - (
+        SELECT COUNT(*) FROM examples e
+         WHERE e.word_id = OLD.id AND e.score = stats_daily_scores.score
+           AND COALESCE(e.direction, '') = stats_daily_scores.direction
+           AND date(e.created_at) = stats_daily_scores.day)
+     WHERE group_title = COALESCE(OLD.group_title, '')
+       AND (day, direction, score) IN (
+           SELECT date(created_at), COALESCE(direction, ''), score FROM examples
+            WHERE word_id = OLD.id AND score IS NOT NULL);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_stats_words_del AFTER DELETE ON words BEGIN
+    UPDATE stats_daily SET words_added = words_added - 1
+     WHERE day = date(OLD.created_at) AND group_title = COALESCE(OLD.group_title, '');
+    UPDATE stats_daily SET words_learned = words_learned - 1
+     WHERE OLD.is_learned AND day = date(COALESCE(OLD.learned_at, OLD.created_at))
+       AND group_title = COALESCE(OLD.group_title, '');
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_stats_words_upd AFTER UPDATE OF is_learned, learned_at, group_title ON words
+WHEN OLD.is_learned IS NOT NEW.is_learned OR OLD.learned_at IS NOT NEW.learned_at
+  OR OLD.group_title IS NOT NEW.group_title
+BEGIN
+    -- eklenme sayacı yalnızca grup değişince taşınır
+    UPDATE stats_daily SET words_added = words_added - 1
+     WHERE OLD.group_title IS NOT NEW.group_title
+       AND day = date(OLD.created_at) AND group_title = COALESCE(OLD.group_title, '');
+    INSERT INTO stats_daily(day, group_title, words_added)
+    SELECT date(NEW.created_at), COALESCE(NEW.group_title, ''), 1
+     WHERE OLD.group_title IS NOT NEW.group_title
+    ON CONFLICT(day, group_title) DO UPDATE SET words_added = words_added + 1;
+    -- öğrenilme: eski katkıyı çıkar, yenisini ekle
+    UPDATE stats_daily SET words_learned = words_learned - 1
+     WHERE OLD.is_learned AND day = date(COALESCE(OLD.learned_at, OLD.created_at))
+       AND group_title = COALESCE(OLD.group_title, '');
+    INSERT INTO stats_daily(day, group_title, words_learned)
+    SELECT date(COALESCE(NEW.learned_at, NEW.created_at)), COALESCE(NEW.group_title, ''), 1
+     WHERE NEW.is_learned
+    ON CONFLICT(day, group_title) DO UPDATE SET words_learned = words_learned + 1;
+    -- puan histogramı yeni gruba
+    UPDATE stats_daily_scores SET n = n - (
+        SELECT COUNT(*) FROM examples e
+         WHERE e.word_id = OLD.id AND e.score = stats_daily_scores.score
+           AND COALESCE(e.direction, '') = stats_daily_scores.direction
+           AND date(e.created_at) = stats_daily_scores.day)
+     WHERE OLD.group_title IS NOT NEW.group_title AND group_title = COALESCE(OLD.group_title, '')
+       AND (day, direction, score) IN (
+           SELECT date(created_at), COALESCE(direction, ''), score FROM examples
+            WHERE word_id = OLD.id AND score IS NOT NULL);
+    INSERT INTO stats_daily_scores(day, group_title, direction, score, n)
+    SELECT date(created_at), COALESCE(NEW.group_title, ''), COALESCE(direction, ''), score, COUNT(*)
+      FROM examples
+     WHERE OLD.group_title IS NOT NEW.group_title AND word_id = NEW.id AND score IS NOT NULL
+     GROUP BY 1, 3, 4
+    ON CONFLICT(day, group_title, direction, score) DO UPDATE SET n = n + excluded.n;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_stats_examples_ins AFTER INSERT ON examples
+WHEN NEW.score IS NOT NULL
+BEGIN
+    INSERT INTO stats_daily_scores(day, group_title, direction, score, n)
+    VALUES (date(COALESCE(NEW.created_at, CURRENT_TIMESTAMP)),
+            COALESCE((SELECT group_title FROM words WHERE id = NEW.word_id), ''),
+            COALESCE(NEW.direction, ''), NEW.score, 1)
+    ON CONFLICT(day, group_title, direction, score) DO UPDATE SET n = n + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_stats_examples_del AFTER DELETE ON examples
+WHEN OLD.score IS NOT NULL AND EXISTS (SELECT 1 FROM words WHERE id = OLD.word_id)
+  AND NOT EXISTS (SELECT 1 FROM app_flags WHERE name = 'archiving')
+BEGIN
+    UPDATE stats_daily_scores SET n = n - 1
+     WHERE day = date(OLD.created_at)
+       AND group_title = COALESCE((SELECT group_title FROM words WHERE id = OLD.word_id), '')
+       AND direction = COALESCE(OLD.direction, '') AND score = OLD.score;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_stats_examples_upd AFTER UPDATE OF score, direction ON examples
+WHEN OLD.score IS NOT NEW.score OR OLD.direction IS NOT NEW.direction
+BEGIN
+    UPDATE stats_daily_scores SET n = n - 1
+     WHERE OLD.score IS NOT NULL AND day = date(OLD.created_at)
+       AND group_title = COALESCE((SELECT group_title FROM words WHERE id = OLD.word_id), '')
+       AND direction = COALESCE(OLD.direction, '') AND score = OLD.score;
+    INSERT INTO stats_daily_scores(day, group_title, direction, score, n)
+    SELECT date(NEW.created_at), COALESCE((SELECT group_title FROM words WHERE id = NEW.word_id), ''),
+           COALESCE(NEW.direction, ''), NEW.score, 1
+     WHERE NEW.score IS NOT NULL
+    ON CONFLICT(day, group_title, direction, score) DO UPDATE SET n = n + 1;
+END;
+"""
+
+BACKFILL_ANALYTICS_SQL = """
+INSERT INTO stats_daily(day, group_title, words_added)
+    SELECT date(created_at), COALESCE(group_title, ''), COUNT(*) FROM words WHERE 1 GROUP BY 1, 2;
+INSERT INTO stats_daily(day, group_title, words_learned)
+    SELECT date(COALESCE(learned_at, created_at)), COALESCE(group_title, ''), COUNT(*) FROM words
+     WHERE is_learned GROUP BY 1, 2
+    ON CONFLICT(day, group_title) DO UPDATE SET words_learned = words_learned + excluded.words_learned;
+INSERT INTO stats_daily_scores(day, group_title, direction, score, n)
+    SELECT date(e.created_at), COALESCE(w.group_title, ''), COALESCE(e.direction, ''), e.score, COUNT(*)
+      FROM examples e JOIN words w ON w.id = e.word_id
+     WHERE e.score IS NOT NULL GROUP BY 1, 2, 3, 4;
+"""
+
+# SQLite FTS5 olmadan derlenmişse arama LIKE taramasına düşer
+FTS_AVAILABLE = True
+
+# Uygulama bayrakları (transaction içinde set edilip trigger'larca okunur) ve bakım
+# işlerinin son çalışma zamanları. Trigger'lardan önce kurulur.
+FLAGS_SQL = """
+CREATE TABLE IF NOT EXISTS app_flags (
+    name TEXT PRIMARY KEY,
+    value TEXT
+) WITHOUT ROWID;
+"""
+
+# Bu trigger'lar 'archiving' bayrağını tanımayan eski sürümleriyle kuruluysa yenilenir
+_ARCHIVE_GUARDED_TRIGGERS = ("trg_examples_score_del", "trg_stats_examples_del",
+                             "trg_cdc_examples_del", "trg_cdc_exercises_del")
+
+# Soğuk arşiv: öğrenilmiş kelimelerin eski örnek/görevleri ardışık kelimeler halinde
+# zlib ile sıkıştırılmış JSON paketlerinde ({"examples": [...], "exercises": [...]}).
+# Özet sütunlar paketi açmadan sayım/ortalama verir.
+ARCHIVE_SQL = """
+CREATE TABLE IF NOT EXISTS archive_batches (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    first_word_id INTEGER NOT NULL,
+    last_word_id INTEGER NOT NULL,
+    words INTEGER NOT NULL,
+    examples INTEGER NOT NULL DEFAULT 0,
+    exercises INTEGER NOT NULL DEFAULT 0,
+    scored INTEGER NOT NULL DEFAULT 0,
+    score_sum INTEGER NOT NULL DEFAULT 0,
+    oldest DATETIME,
+    newest DATETIME,
+    raw_bytes INTEGER NOT NULL,
+    payload BLOB NOT NULL,
+    archived_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_archive_words ON archive_batches(last_word_id, first_word_id);
+
+-- Arşivlenmiş satırların dizini: eşitleme uid ile paketi bulur, satırı sıcak tabloya geri eklemez.
+-- Kelime puan toplamları ve istatistikler arşivlenen puanları içerdiğinden, arşivdeki bir
+-- örneğin puanı değişince/silinince aşağıdaki trigger'lar düzeltir.
+CREATE TABLE IF NOT EXISTS archived_rows (
+    entity TEXT NOT NULL CHECK(entity IN ('example', 'exercise')),
+    uid TEXT NOT NULL,
+    batch_id INTEGER NOT NULL,
+    word_id INTEGER NOT NULL,
+    score INTEGER,
+    direction TEXT,
+    created_at DATETIME,
+    grader_model TEXT,
+    PRIMARY KEY (entity, uid)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_archived_rows_word ON archived_rows(word_id, entity);
+
+CREATE TRIGGER IF NOT EXISTS trg_archived_score_upd AFTER UPDATE OF score, direction ON archived_rows
+WHEN OLD.entity = 'example' AND (OLD.score IS NOT NEW.score OR OLD.direction IS NOT NEW.direction)
+BEGIN
+    UPDATE words SET score_sum = score_sum - OLD.score + COALESCE(NEW.score, 0),
+                     score_count = score_count - 1 + (NEW.score IS NOT NULL)
+     WHERE id = OLD.word_id AND OLD.score IS NOT NULL;
+    UPDATE words SET score_sum = score_sum + NEW.score, score_count = score_count + 1
+     WHERE id = OLD.word_id AND OLD.score IS NULL AND NEW.score IS NOT NULL;
+    UPDATE stats_daily_scores SET n = n - 1
+     WHERE OLD.score IS NOT NULL AND day = date(OLD.created_at)
+       AND group_title = COALESCE((SELECT group_title FROM words WHERE id = OLD.word_id), '')
+       AND direction = COALESCE(OLD.direction, '') AND score = OLD.score;
+    INSERT INTO stats_daily_scores(day, group_title, direction, score, n)
+    SELECT date(NEW.created_at), COALESCE((SELECT group_title FROM words WHERE id = NEW.word_id), ''),
+           COALESCE(NEW.direction, ''), NEW.score, 1
+     WHERE NEW.score IS NOT NULL
+    ON CONFLICT(day, group_title, direction, score) DO UPDATE SET n = n + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_archived_score_del AFTER DELETE ON archived_rows
+WHEN OLD.entity = 'example' AND OLD.score IS NOT NULL
+BEGIN
+    UPDATE words SET score_sum = score_sum - OLD.score, score_count = score_count - 1
+     WHERE id = OLD.word_id;
+    UPDATE stats_daily_scores SET n = n - 1
+     WHERE day = date(OLD.created_at)
+       AND group_title = COALESCE((SELECT group_title FROM words WHERE id = OLD.word_id), '')
+       AND direction = COALESCE(OLD.direction, '') AND score = OLD.score;
+END;
+"""
+
+# Paketler satırları konumsal saklar: yeni alanlar yalnızca sona eklenir (eski paketlerde eksik kalır)
+ARCHIVE_EXAMPLE_FIELDS = ("id", "word_id", "uid", "text", "origin", "direction", "score", "feedback",
+                          "exercise_id", "created_at", "grader_model")
+ARCHIVE_EXERCISE_FIELDS = ("id", "word_id", "uid", "direction", "source_en", "source_tr", "sentence",
+                           "user_answer", "score", "feedback", "created_at", "grader_model")
+# archived_rows sütunları, paket satırındaki alan adlarıyla
+ARCHIVED_ROW_FIELDS = ("uid", "word_id", "score", "direction", "created_at", "grader_model")
+
+
+def archived_row_values(fields, row) -> tuple:
+    """Paket satırından archived_rows değerleri (ARCHIVED_ROW_FIELDS sırasıyla; eksik alan None)."""
+    return tuple(row[fields.index(f)] if fields.index(f) < len(row) else None for f in ARCHIVED_ROW_FIELDS)
+
+# Toplu yeniden puanlama: iş başına kontrol noktası (examples.id sırasıyla son işlenen).
+# Puanı veren model examples/exercises.grader_model'de (NULL: model kaydından önceki puan).
+REGRADE_SQL = """
+CREATE TABLE IF NOT EXISTS regrade_jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    model TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'running' CHECK(status IN ('running','done','cancelled')),
+    last_example_id INTEGER NOT NULL DEFAULT 0,
+    total INTEGER NOT NULL DEFAULT 0,
+    done INTEGER NOT NULL DEFAULT 0,
+    changed INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0,
+    started_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+# Dış API kullanımı (rate_limit): sağlayıcı + dönem ('2026-10' aylık, '2026-10-19' günlük) başına.
+# units: kotaya sayılan birim (DeepL: karakter, OpenRouter: istek); quota: sağlayıcının bildirdiği limit.
+USAGE_SQL = """
+CREATE TABLE IF NOT EXISTS api_usage (
+    provider TEXT NOT NULL,
+    period TEXT NOT NULL,
+    units INTEGER NOT NULL DEFAULT 0,
+    requests INTEGER NOT NULL DEFAULT 0,
+    throttled INTEGER NOT NULL DEFAULT 0,
+    quota INTEGER,
+    updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (provider, period)
+) WITHOUT ROWID;
+"""
+
+# Şema kontrolü/migration her bağlantıda değil, süreç başına DB dosyası için bir kez yapılır
+_SCHEMA_READY: set = set()
+
+# Eşitleme için değişiklik günlüğü (CDC). Anahtar: kelimede term_norm, örnek/görevde uid
+# (makineler arası sabit kimlik). Anahtar başına tek satır tutulur: her değişiklik eski
+# satırı yeni seq ile değiştirir, silinenler op='delete' olarak (tombstone) kalır.
+# origin: değişiklik başka bir kopyadan uygulandıysa o kopyanın id'si (geri yankı olmasın).
+# Arşivleme silmeleri günlüğe yazılmaz: arşiv yereldir, diğer kopyalardan silinmez.
+SYNC_SQL = """
+CREATE TABLE IF NOT EXISTS change_log (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    entity TEXT NOT NULL CHECK(entity IN ('word','example','exercise')),
+    key TEXT NOT NULL,
+    op TEXT NOT NULL CHECK(op IN ('upsert','delete')),
+    origin TEXT DEFAULT NULL,
+    changed_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE UNIQUE INDEX IF NOT EXISTS ux_change_log_key ON change_log(entity, key);
+
+CREATE TABLE IF NOT EXISTS sync_peers (
+    peer_id TEXT PRIMARY KEY,
+    sent_seq INTEGER NOT NULL DEFAULT 0,      -- bu kopyaya gönderilen son yerel seq
+    received_seq INTEGER NOT NULL DEFAULT 0,  -- bu kopyadan uygulanan son seq
+    synced_at DATETIME DEFAULT NULL
+) WITHOUT ROWID;
+
+CREATE UNIQUE INDEX IF NOT EXISTS ux_examples_uid ON examples(uid);
+CREATE UNIQUE INDEX IF NOT EXISTS ux_exercises_uid ON exercises(uid);
+
+CREATE TRIGGER IF NOT EXISTS trg_cdc_words_ins AFTER INSERT ON words
+WHEN NEW.term_norm IS NOT NULL
+BEGIN
+    INSERT OR REPLACE INTO change_log(entity, key, op, origin)
+    VALUES ('word', NEW.term_norm, 'upsert', (SELECT value FROM app_flags WHERE name = 'sync_origin'));
+END;
+CREATE TRIGGER IF NOT EXISTS trg_cdc_words_upd
+AFTER UPDATE OF term_en, translation_tr, notes, group_title, is_learned, learned_at, term_norm ON words
+WHEN NEW.term_norm IS NOT NULL AND (
+    OLD.translation_tr IS NOT NEW.translation_tr OR OLD.notes IS NOT NEW.notes
+    OR OLD.group_title IS NOT NEW.group_title OR OLD.is_learned IS NOT NEW.is_learned
+    OR OLD.learned_at IS NOT NEW.learned_at OR OLD.term_norm IS NOT NEW.term_norm)
+BEGIN
+    INSERT OR REPLACE INTO change_log(entity, key, op, origin)
+    SELECT 'word', OLD.term_norm, 'delete', (SELECT value FROM app_flags WHERE name = 'sync_origin')
+     WHERE OLD.term_norm IS NOT NULL AND OLD.term_norm IS NOT NEW.term_norm;
+    INSERT OR REPLACE INTO change_log(entity, key, op, origin)
+    VALUES ('word', NEW.term_norm, 'upsert', (SELECT value FROM app_flags WHERE name = 'sync_origin'));
+END;
+CREATE TRIGGER IF NOT EXISTS trg_cdc_words_del AFTER DELETE ON words
+WHEN OLD.term_norm IS NOT NULL
+BEGIN
+    INSERT OR REPLACE INTO change_log(entity, key, op, origin)
+    VALUES ('word', OLD.term_norm, 'delete', (SELECT value FROM app_flags WHERE name = 'sync_origin'));
+END;
+
+-- uid verilmemişse burada üretilir (ALTER TABLE ifade varsayılanı kabul etmiyor)
+CREATE TRIGGER IF NOT EXISTS trg_cdc_examples_ins AFTER INSERT ON examples BEGIN
+    UPDATE examples SET uid = lower(hex(randomblob(16))) WHERE id = NEW.id AND uid IS NULL;
+    INSERT OR REPLACE INTO change_log(entity, key, op, origin)
+    SELECT 'example', uid, 'upsert', (SELECT value FROM app_flags WHERE name = 'sync_origin')
+      FROM examples WHERE id = NEW.id;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_cdc_examples_upd
+AFTER UPDATE OF word_id, text, origin, direction, score, feedback, exercise_id ON examples
+WHEN NEW.uid IS NOT NULL
+BEGIN
+    INSERT OR REPLACE INTO change_log(entity, key, op, origin)
+    VALUES ('example', NEW.uid, 'upsert', (SELECT value FROM app_flags WHERE name = 'sync_origin'));
+END;
+CREATE TRIGGER IF NOT EXISTS trg_cdc_examples_del AFTER DELETE ON examples
+WHEN OLD.uid IS NOT NULL AND NOT EXISTS (SELECT 1 FROM app_flags WHERE name = 'archiving')
+BEGIN
+    INSERT OR REPLACE INTO change_log(entity, key, op, origin)
+    VALUES ('example', OLD.uid, 'delete', (SELECT value FROM app_flags WHERE name = 'sync_origin'));
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_cdc_exercises_ins AFTER INSERT ON exercises BEGIN
+    UPDATE exercises SET uid = lower(hex(randomblob(16))) WHERE id = NEW.id AND uid IS NULL;
+    INSERT OR REPLACE INTO change_log(entity, key, op, origin)
+    SELECT 'exercise', uid, 'upsert', (SELECT value FROM app_flags WHERE name = 'sync_origin')
+      FROM exercises WHERE id = NEW.id;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_cdc_exercises_upd
+AFTER UPDATE OF word_id, direction, source_en, source_tr, sentence, user_answer, score, feedback ON exercises
+WHEN NEW.uid IS NOT NULL
+BEGIN
+    INSERT OR REPLACE INTO change_log(entity, key, op, origin)
+    VALUES ('exercise', NEW.uid, 'upsert', (SELECT value FROM app_flags WHERE name = 'sync_origin'));
+END;
+CREATE TRIGGER IF NOT EXISTS trg_cdc_exercises_del AFTER DELETE ON exercises
+WHEN OLD.uid IS NOT NULL AND NOT EXISTS (SELECT 1 FROM app_flags WHERE name = 'archiving')
+BEGIN
+    INSERT OR REPLACE INTO change_log(entity, key, op, origin)
+    VALUES ('exercise', OLD.uid, 'delete', (SELECT value FROM app_flags WHERE name = 'sync_origin'));
+END;
+"""
+
+# Günlük ilk kez kurulurken mevcut satırlar eklenme sırasıyla günlüğe yazılır (since=0 = tüm kütüphane)
+BACKFILL_SYNC_SQL = """
+UPDATE examples SET uid = lower(hex(randomblob(16))) WHERE uid IS NULL;
+UPDATE exercises SET uid = lower(hex(randomblob(16))) WHERE uid IS NULL;
+INSERT OR IGNORE INTO change_log(entity, key, op, changed_at)
+    SELECT 'word', term_norm, 'upsert', COALESCE(created_at, CURRENT_TIMESTAMP)
+      FROM words WHERE term_norm IS NOT NULL ORDER BY id;
+INSERT OR IGNORE INTO change_log(entity, key, op, changed_at)
+    SELECT 'exercise', uid, 'upsert', COALESCE(created_at, CURRENT_TIMESTAMP) FROM exercises ORDER BY id;
+INSERT OR IGNORE INTO change_log(entity, key, op, changed_at)
+    SELECT 'example', uid, 'upsert', COALESCE(created_at, CURRENT_TIMESTAMP) FROM examples ORDER BY id;
+INSERT OR IGNORE INTO app_flags(name, value) VALUES ('replica_id', lower(hex(randomblob(8))));
+"""
+
+
 def _add_col(conn, table, col, decl):
     if not any(r[1] == col for r in conn.execute(f"PRAGMA table_info({table})")):
         conn.execute(f"ALTER TABLE {table} ADD COLUMN {col} {decl}")
@@ -64,9 +610,146 @@ def _column_exists(conn: sqlite3.Connection, table: str, col: str) -> bool:
         return False
 
 
+class _PooledConnection(sqlite3.Connection):
+    """close() bağlantıyı kapatmaz, havuza iade eder (repository kodu değişmeden havuzdan yararlanır)."""
+    pool: Optional["ConnectionPool"] = None
+
+    def close(self) -> None:
+        if self.pool is None:
+            super().close()
+        else:
+            self.pool.release(self)
+
+
+class ConnectionPool:
+    """
+    Aynı DB dosyası için en fazla `size` açık bağlantı; thread'ler arasında paylaşılır
+    (aynı anda tek thread kullanır). Sunucu modunda her istekte connect/PRAGMA maliyeti olmaz.
+    """
+
+    def __init__(self, path: Path, size: int = 8, timeout: float = 30.0):
+        self.path = Path(path)
+        self.size = size
+        self.timeout = timeout
+        self._idle: "queue.LifoQueue[_PooledConnection]" = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                return self._open()
+        return self._idle.get(timeout=self.timeout)  # havuz dolu: iade bekle
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, factory=_PooledConnection, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        _ready(conn, self.path)
+        conn.pool = self
+        return conn
+
+    def release(self, conn: "_PooledConnection") -> None:
+        if conn.in_transaction:
+            conn.rollback()  # yarım kalan iş bir sonraki kullanıcıya sızmasın
+        if self._closed:
+            conn.pool = None
+            conn.close()
+            return
+        self._idle.put(conn)
+
+    def close(self) -> None:
+        self._closed = True
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.pool = None
+            conn.close()
+
+
+_POOL: Optional[ConnectionPool] = None
+
+
+def enable_pool(size: int = 8) -> ConnectionPool:
+    """get_conn() bundan sonra DB_PATH için havuzdan bağlantı verir (sunucu / çok thread'li işler)."""
+    global _POOL
+    disable_pool()
+    _POOL = ConnectionPool(DB_PATH, size=size)
+    return _POOL
+
+
+def disable_pool() -> None:
+    global _POOL
+    if _POOL is not None:
+        _POOL.close()
+        _POOL = None
+
+
+def _ready(conn: sqlite3.Connection, path) -> None:
+    key = str(path)
+    if key not in _SCHEMA_READY:
+        _ensure_schema(conn)
+        _SCHEMA_READY.add(key)
+
+
 def get_conn():
+    if _POOL is not None and _POOL.path == Path(DB_PATH):
+        return _POOL.acquire()
     conn = sqlite3.connect(DB_PATH)
     conn.row_factory = sqlite3.Row
+    _ready(conn, DB_PATH)
+    return conn
+
+
+BACKUP_PAGES = 256  # adım başına sayfa (4 KB sayfada ~1 MB)
+
+
+def backup(dest, pages: int = BACKUP_PAGES, progress: Optional[Callable[[int, int], None]] = None,
+           sleep: float = 0.005) -> Path:
+    """
+    Çevrim içi yedek (sqlite3 backup API), `pages` sayfalık adımlarla. Kaynak bağlantıda
+    önceden açılan okuma transaction'ı tüm adımlarda aynı WAL anlık görüntüsünü okutur:
+    uygulama bu sırada okumaya/yazmaya devam eder ve başka bağlantıların yazmaları kopyayı
+    baştan başlatmaz (sürekli yazılırken yedek hiç bitmeyebilirdi). Önce `<dest>.part`
+    dosyasına yazılır, bitince hedefin yerine taşınır; yarım yedek hedef adında durmaz.
+    progress(kalan_sayfa, toplam_sayfa) her adımdan sonra çağrılır.
+    """
+    dest = Path(dest)
+    part = dest.with_name(dest.name + ".part")
+    src = sqlite3.connect(DB_PATH)
+    try:
+        _ready(src, DB_PATH)
+        src.execute("BEGIN")
+        src.execute("SELECT 1 FROM sqlite_master").fetchone()  # anlık görüntü burada alınır
+        dst = sqlite3.connect(part)
+        try:
+            src.backup(dst, pages=pages, sleep=sleep,
+                       progress=(lambda _status, remaining, total: progress(remaining, total)) if progress else None)
+        finally:
+            dst.close()
+        src.rollback()
+        os.replace(part, dest)
+    except BaseException:
+        part.unlink(missing_ok=True)
+        raise
+    finally:
+        src.close()
+    return dest
+
+
+def _ensure_schema(conn: sqlite3.Connection) -> None:
+    if not _table_exists(conn, "words"):
+        # Yeni DB: boşalan sayfalar dosyaya kalır, bakımda incremental_vacuum ile geri verilir
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    # WAL: commit başına tek fsync, okuyucular yazarı beklemez (kalıcı ayar)
+    conn.execute("PRAGMA journal_mode=WAL")
     if not _table_exists(conn, "exercises"):
         conn.executescript(SCHEMA_SQL)
         conn.commit()
@@ -110,7 +793,112 @@ def get_conn():
                 conn.execute("ALTER TABLE words ADD COLUMN is_learned INTEGER DEFAULT 0")
             if not _column_exists(conn, "words", "learned_at"):
                 conn.execute("ALTER TABLE words ADD COLUMN learned_at DATETIME DEFAULT NULL")
+            if not _column_exists(conn, "words", "score_count"):
+                conn.execute("ALTER TABLE words ADD COLUMN score_sum INTEGER NOT NULL DEFAULT 0")
+                conn.execute("ALTER TABLE words ADD COLUMN score_count INTEGER NOT NULL DEFAULT 0")
+                conn.execute("ALTER TABLE words ADD COLUMN last_score INTEGER DEFAULT NULL")
+                conn.execute(BACKFILL_SCORES_SQL)
+            if not _column_exists(conn, "words", "term_norm"):
+                conn.execute("ALTER TABLE words ADD COLUMN term_norm TEXT DEFAULT NULL")
+                rows = conn.execute("SELECT id, term_en FROM words").fetchall()
+                conn.executemany("UPDATE words SET term_norm = ? WHERE id = ?",
+                                 [(normalize_term(r[1]), r[0]) for r in rows])
             conn.commit()
         except Exception:
             pass
-    return conn
\ No newline at end of file
+    _ensure_term_norm_index(conn)
+    _ensure_search_index(conn)
+    conn.executescript(FLAGS_SQL)
+    _upgrade_triggers(conn, _ARCHIVE_GUARDED_TRIGGERS, "'archiving'")
+    stale_last = _upgrade_triggers(conn, _LAST_SCORE_TRIGGERS, "last_score = (SELECT")
+    conn.executescript(TRIGGERS_SQL)
+    if stale_last:  # eski trigger'lar güncelleme/silmede last_score'u bayat bırakıyordu
+        conn.execute(f"UPDATE words SET last_score = {_LAST_SCORE.format(word='words.id')}")
+    conn.executescript(PAGING_INDEXES_SQL)
+    _ensure_schedule(conn)
+    _ensure_analytics(conn)
+    _ensure_sync(conn)
+    _add_col(conn, "examples", "grader_model", "TEXT DEFAULT NULL")
+    _add_col(conn, "exercises", "grader_model", "TEXT DEFAULT NULL")
+    _ensure_archive(conn)
+    conn.executescript(REGRADE_SQL)
+    conn.executescript(USAGE_SQL)
+    conn.commit()
+
+
+def _upgrade_triggers(conn: sqlite3.Connection, names, marker: str) -> bool:
+    """Gövdesinde marker geçmeyen eski trigger'ları düşürür; ardından IF NOT EXISTS yenisini kurar."""
+    marks = ",".join("?" * len(names))
+    dropped = False
+    for name, sql in conn.execute(
+            f"SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND name IN ({marks})",
+            names).fetchall():
+        if marker not in sql:
+            conn.execute(f"DROP TRIGGER {name}")
+            dropped = True
+    return dropped
+
+
+def _ensure_term_norm_index(conn: sqlite3.Connection) -> None:
+    # Eski DB'lerde aynı terimin tekrarları olabilir; o durumda tekil olmayan indeksle yetin
+    try:
+        conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS ux_words_term_norm ON words(term_norm)")
+    except sqlite3.IntegrityError:
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_words_term_norm ON words(term_norm)")
+    conn.commit()
+
+
+def _ensure_search_index(conn: sqlite3.Connection) -> None:
+    global FTS_AVAILABLE
+    fresh = not _table_exists(conn, "search_fts")
+    try:
+        conn.executescript(SEARCH_SQL)
+    except sqlite3.OperationalError:
+        FTS_AVAILABLE = False  # "no such module: fts5"
+        return
+    if fresh:
+        # Sütun ağırlıkları: terim > çeviri > gövde; "ORDER BY rank" FTS5 içinde sıralanır
+        conn.execute("INSERT INTO search_fts(search_fts, rank) VALUES ('rank', 'bm25(10.0, 5.0, 1.0)')")
+        conn.executescript(BACKFILL_SEARCH_SQL)
+    conn.commit()
+
+
+def _ensure_schedule(conn: sqlite3.Connection) -> None:
+    fresh = not _table_exists(conn, "review_schedule")
+    conn.executescript(SCHEDULE_SQL)
+    if fresh:
+        conn.execute(BACKFILL_SCHEDULE_SQL)
+    conn.commit()
+
+
+def _ensure_archive(conn: sqlite3.Connection) -> None:
+    fresh = not _table_exists(conn, "archived_rows")
+    conn.executescript(ARCHIVE_SQL)
+    if fresh:  # dizinden önce yazılmış paketler
+        for batch_id, payload in conn.execute("SELECT id, payload FROM archive_batches").fetchall():
+            data = json.loads(zlib.decompress(payload))
+            for entity, key, fields in (("example", "examples", ARCHIVE_EXAMPLE_FIELDS),
+                                        ("exercise", "exercises", ARCHIVE_EXERCISE_FIELDS)):
+                conn.executemany(
+                    f"INSERT OR IGNORE INTO archived_rows(entity, batch_id, {', '.join(ARCHIVED_ROW_FIELDS)}) "
+                    f"VALUES (?, ?, {', '.join('?' * len(ARCHIVED_ROW_FIELDS))})",
+                    [(entity, batch_id) + archived_row_values(fields, r) for r in data[key] if r[fields.index("uid")] is not None])
+    conn.commit()
+
+
+def _ensure_sync(conn: sqlite3.Connection) -> None:
+    fresh = not _table_exists(conn, "change_log")
+    _add_col(conn, "examples", "uid", "TEXT DEFAULT NULL")
+    _add_col(conn, "exercises", "uid", "TEXT DEFAULT NULL")
+    conn.executescript(SYNC_SQL)
+    if fresh:
+        conn.executescript(BACKFILL_SYNC_SQL)
+    conn.commit()
+
+
+def _ensure_analytics(conn: sqlite3.Connection) -> None:
+    fresh = not _table_exists(conn, "stats_daily")
+    conn.executescript(ANALYTICS_SQL)
+    if fresh:
+        conn.executescript(BACKFILL_ANALYTICS_SQL)
+    conn.commit()
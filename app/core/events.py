@@ -0,0 +1,55 @@
+import threading
+import weakref
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Sequence
+
+# WordChanged.kind değerleri
+WORD_CREATED = "created"
+WORD_UPDATED = "updated"
+WORD_DELETED = "deleted"
+
+
+@dataclass(slots=True, frozen=True)
+class WordChanged:
+    """Bir kelime satırı (veya skor toplamları) commit edildi; okuma modelleri tazelenmeli."""
+    word_id: int
+    kind: str = WORD_UPDATED
+
+
+Handler = Callable[[Sequence[WordChanged]], None]  # bir commit'in (tekilleştirilmiş) olayları
+_subscribers: List[Callable[[], Optional[Handler]]] = []  # dinleyiciyi döndüren referanslar
+_lock = threading.Lock()
+
+
+def subscribe(handler: Handler, weak: bool = False) -> Callable[[], None]:
+    """
+    Değişiklik dinleyicisi ekler; dönen fonksiyon aboneliği kaldırır.
+    weak=True (bound method için): sahibi silinince abonelik kendiliğinden düşer.
+    """
+    ref = weakref.WeakMethod(handler) if weak else (lambda: handler)
+    with _lock:
+        _subscribers.append(ref)
+
+    def unsubscribe() -> None:
+        with _lock:
+            if ref in _subscribers:
+                _subscribers.remove(ref)
+    return unsubscribe
+
+
+def publish(changes: Sequence[WordChanged]) -> None:
+    """
+    Bir commit'in olaylarını dinleyicilere tek seferde, senkron iletir (dinleyici toplu
+    okuyabilsin). Yalnızca commit'ten SONRA çağrılır; yazan thread'de çalışır, UI tarafı
+    kendi thread'ine kendisi taşır.
+    """
+    if not changes:
+        return
+    with _lock:
+        handlers = [(ref, ref()) for ref in _subscribers]
+        dead = [ref for ref, h in handlers if h is None]
+        for ref in dead:
+            _subscribers.remove(ref)
+    for _, handler in handlers:
+        if handler is not None:
+            handler(changes)
@@ -0,0 +1,176 @@
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from ..models import Word
+
+# group_title'ı olmayan kelimelerin grup anahtarı (repository.NO_GROUP ile aynı)
+NO_GROUP = ""
+
+
+def date_key(w: Word) -> str:
+    """Ağaçtaki tarih düğümü: YYYY-MM-DD."""
+    created = w.created_at
+    if isinstance(created, datetime):
+        return created.date().isoformat()  # strftime'dan belirgin şekilde hızlı
+    return str(created)[:10]
+
+
+def _view(w: Word) -> tuple:
+    # Ağaçta görünen alanlar; yalnızca notes gibi alanlar değişince yeniden çizim gerekmez
+    return (w.term_en, w.translation_tr, w.group_title, w.is_learned, date_key(w), w.score_sum, w.score_count)
+
+
+class LibraryIndex:
+    """
+    Kütüphane için bellek içi okuma modeli: id -> Word, grup -> tarih -> id kümesi
+    ve öğrenildi bit kümesi. Başlangıçta tek toplu sorguyla dolar, sonra
+    repository değişiklik olaylarıyla (upsert/remove) güncel tutulur; filtreleme,
+    gruplama, sayımlar ve grup başlıkları SQLite'a gitmeden yapılır.
+    Olaylar yazan thread'de uygulanabildiği için erişim kilitlidir.
+    """
+
+    def __init__(self, words: Iterable[Word] = ()):
+        self._lock = threading.RLock()
+        self._words: Dict[int, Word] = {}
+        self._groups: Dict[str, Dict[str, Set[int]]] = {}
+        self._learned = bytearray()  # bit i: id'si i olan kelime öğrenildi
+        self._learned_count = 0
+        self._sorted: Dict[Tuple[str, str], List[int]] = {}  # (grup, tarih) -> terime göre sıralı id'ler
+        self._titles: Optional[List[str]] = None
+        self._group_size: Dict[str, int] = {}
+        self._group_learned: Dict[str, int] = {}
+        self.version = 0  # ağaçta görünen bir şey değiştikçe artar
+        for w in words:
+            self._put(w)
+
+    # ---- learned bitset ----
+    def _set_learned(self, word_id: int, on: bool) -> None:
+        byte, bit = divmod(word_id, 8)
+        if byte >= len(self._learned):
+            if not on:
+                return
+            self._learned.extend(bytes(byte - len(self._learned) + 1))
+        was = self._learned[byte] >> bit & 1
+        if on and not was:
+            self._learned[byte] |= 1 << bit
+            self._learned_count += 1
+        elif was and not on:
+            self._learned[byte] &= ~(1 << bit) & 0xFF
+            self._learned_count -= 1
+
+    def is_learned(self, word_id: int) -> bool:
+        byte, bit = divmod(word_id, 8)
+        return byte < len(self._learned) and bool(self._learned[byte] >> bit & 1)
+
+    # ---- mutation ----
+    def _put(self, w: Word) -> None:
+        g = w.group_title or NO_GROUP
+        d = date_key(w)
+        self._words[w.id] = w
+        dates = self._groups.get(g)
+        if dates is None:
+            dates = self._groups[g] = {}
+            self._titles = None
+        dates.setdefault(d, set()).add(w.id)
+        self._sorted.pop((g, d), None)
+        self._set_learned(w.id, bool(w.is_learned))
+        self._group_size[g] = self._group_size.get(g, 0) + 1
+        if w.is_learned:
+            self._group_learned[g] = self._group_learned.get(g, 0) + 1
+
+    def _drop(self, word_id: int) -> None:
+        w = self._words.pop(word_id, None)
+        if w is None:
+            return
+        g = w.group_title or NO_GROUP
+        d = date_key(w)
+        dates = self._groups.get(g, {})
+        ids = dates.get(d)
+        if ids is not None:
+            ids.discard(word_id)
+            if not ids:
+                del dates[d]
+            if not dates:
+                self._groups.pop(g, None)
+                self._titles = None
+        self._sorted.pop((g, d), None)
+        self._set_learned(word_id, False)
+        self._group_size[g] -= 1
+        if w.is_learned:
+            self._group_learned[g] -= 1
+        if not self._group_size[g]:
+            del self._group_size[g]
+            self._group_learned.pop(g, None)
+
+    def upsert(self, w: Word) -> None:
+        with self._lock:
+            old = self._words.get(w.id)
+            if old is None or _view(old) != _view(w):
+                self.version += 1
+            self._drop(w.id)
+            self._put(w)
+
+    def remove(self, word_id: int) -> None:
+        with self._lock:
+            if word_id in self._words:
+                self.version += 1
+            self._drop(word_id)
+
+    # ---- queries ----
+    def __len__(self) -> int:
+        return len(self._words)
+
+    def __contains__(self, word_id: int) -> bool:
+        return word_id in self._words
+
+    def get(self, word_id: int) -> Optional[Word]:
+        return self._words.get(word_id)
+
+    def words(self) -> List[Word]:
+        with self._lock:
+            return list(self._words.values())
+
+    @property
+    def learned_count(self) -> int:
+        return self._learned_count
+
+    def group_titles(self) -> List[str]:
+        """Grupsuz hariç grup başlıkları, büyük/küçük harf duyarsız sıralı."""
+        with self._lock:
+            if self._titles is None:
+                self._titles = sorted((g for g in self._groups if g), key=str.casefold)
+            return list(self._titles)
+
+    def counts(self, show_learned: bool = True) -> Dict[str, int]:
+        """Grup anahtarı -> kelime sayısı (show_learned=False ise öğrenilenler hariç)."""
+        with self._lock:
+            if show_learned:
+                return dict(self._group_size)
+            return {g: n - self._group_learned.get(g, 0) for g, n in self._group_size.items()}
+
+    def _bucket(self, g: str, d: str) -> List[int]:
+        key = (g, d)
+        ids = self._sorted.get(key)
+        if ids is None:
+            ids = sorted(self._groups[g][d], key=lambda i: self._words[i].term_en.lower())
+            self._sorted[key] = ids
+        return ids
+
+    def tree(self, show_learned: bool = True) -> List[Tuple[str, List[Tuple[str, List[Word]]]]]:
+        """
+        [(grup, [(tarih, [Word])])]: gruplar harf sırasıyla (grupsuz en başta),
+        tarihler yeniden eskiye, kelimeler terime göre. Boş kalan düğümler atlanır.
+        """
+        with self._lock:
+            out = []
+            for g in sorted(self._groups, key=str.casefold):
+                dates = []
+                for d in sorted(self._groups[g], reverse=True):
+                    ids = self._bucket(g, d)
+                    if not show_learned:
+                        ids = [i for i in ids if not self.is_learned(i)]
+                    if ids:
+                        dates.append((d, [self._words[i] for i in ids]))
+                if dates:
+                    out.append((g, dates))
+            return out
@@ -0,0 +1,308 @@
+"""
+Sağlayıcı başına ortak istek hızı sınırı ve kota takibi (DeepL, OpenRouter).
+
+Her sağlayıcının tek bir token bucket'ı vardır (saniyede `rate` istek, en fazla `burst`
+birikir) ve dönemlik bir kotası (DeepL: aylık karakter, OpenRouter: günlük istek; 0 =
+sınırsız). Süreçteki tüm thread'ler aynı limiter'ı kullanır; bekleyenler öncelik
+sırasıyla jeton alır, etkileşimli çağrı (UI/CLI) arka plan ön hazırlığının ve toplu
+işlerin önüne geçer. Kullanım api_usage'da dönem başına tutulur (aynı DB'yi kullanan
+süreçler ortak sayar); istek başına değil, bellekte biriktirilip en fazla USAGE_FLUSH_S
+aralıkla, iade/kota dolumunda ve çıkışta tek UPSERT'le yazılır. Kotanın son `reserve`
+kısmı etkileşimli çağrılara kalır.
+Sağlayıcı yine 429 dönerse backoff() herkesi birlikte bekletir.
+
+    with rate_limit.priority(rate_limit.BULK, stop=stop_event):
+        ai.grade(...)   # AIClient her istekten önce limiter(OPENROUTER).acquire() çağırır;
+                        # stop_event set edilince bekleyiş bırakılır (Cancelled)
+"""
+import atexit
+import heapq
+import itertools
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .repository import UsageRepository
+from .scheduler import utcnow
+
+DEEPL = "deepl"
+OPENROUTER = "openrouter"
+
+# Öncelikler (küçük olan önce)
+INTERACTIVE = 0  # kullanıcı sonucu bekliyor
+PREFETCH = 1     # sıradaki kartların görevleri
+BULK = 2         # içe aktarma çevirisi, yeniden puanlama
+
+MONTHLY = "month"
+DAILY = "day"
+QUOTA_RESERVE = 0.1  # kotanın bu kısmını arka plan işleri kullanamaz
+STOP_POLL = 0.1      # stop event'i verilmiş bekleyişlerde kontrol aralığı (sn)
+USAGE_FLUSH_S = 5.0  # biriken kullanım en geç bu kadar sonra DB'ye (diğer süreçler bu gecikmeyle görür)
+
+_priority: ContextVar[int] = ContextVar("rate_limit_priority", default=INTERACTIVE)
+_stop: ContextVar[Optional[threading.Event]] = ContextVar("rate_limit_stop", default=None)
+
+
+class BudgetExceeded(RuntimeError):
+    """Dönem kotası (arka plan işleri için: kota eksi pay) doldu; istek gönderilmedi."""
+
+
+class Cancelled(RuntimeError):
+    """Jeton beklenirken priority(stop=...) olayı set edildi; istek gönderilmedi."""
+
+
+@contextmanager
+def priority(level: int, stop: Optional[threading.Event] = None):
+    """Bu thread'de (blok boyunca) yapılan sağlayıcı çağrılarının önceliği ve bekleyişi kesen olay."""
+    token, stop_token = _priority.set(level), _stop.set(stop)
+    try:
+        yield
+    finally:
+        _stop.reset(stop_token)
+        _priority.reset(token)
+
+
+class ProviderLimiter:
+    def __init__(self, name: str, rate: float, burst: int = 1, quota: int = 0, period: str = MONTHLY,
+                 reserve: float = QUOTA_RESERVE, repo: Optional[UsageRepository] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.rate = rate            # saniyede istek; 0: hız sınırı yok (yalnızca kota/backoff)
+        self.burst = max(1, burst)
+        self.quota = quota          # dönem başına birim; 0: sınırsız
+        self.period = period
+        self.reserve = reserve
+        self.repo = repo or UsageRepository()
+        self.throttled = 0          # bu süreçte alınan 429
+        self._clock = clock         # saniye, monoton (testler sahte saat verir)
+        self._cond = threading.Condition()
+        self._waiters: List[Tuple[int, int]] = []  # heap: (öncelik, geliş sırası)
+        self._seq = itertools.count()
+        self._tokens = float(self.burst)
+        self._stamp = self._clock()
+        self._paused_until = 0.0
+        self._used: Optional[Tuple[str, int]] = None  # (dönem, units); DB'den tembel yüklenir, yazılmamışlar dahil
+        self._unsaved: List[int] = [0, 0, 0]  # henüz yazılmamış units, requests, throttled
+        self._unsaved_period: Optional[str] = None
+        self._saved_at = self._clock()
+        self._usage_lock = threading.RLock()  # acquire() kontrol + sayma sırasında tutar, _record da alır
+
+    # ---- usage ----
+    def period_key(self) -> str:
+        return utcnow().strftime("%Y-%m" if self.period == MONTHLY else "%Y-%m-%d")
+
+    def used(self) -> int:
+        with self._usage_lock:  # yükleme + birikmiş toplama, eşzamanlı _record/_flush ile karışmasın
+            period = self.period_key()
+            used = self._used
+            if used is None or used[0] != period:
+                row = self._load(period)
+                unsaved = self._unsaved[0] if self._unsaved_period == period else 0
+                used = self._used = (period, (row["units"] if row else 0) + unsaved)
+            return used[1]
+
+    def remaining(self) -> Optional[int]:
+        """Dönemde kalan birim (None: kota yok)."""
+        return max(0, self.quota - self.used()) if self.quota else None
+
+    def _load(self, period: str) -> Optional[dict]:
+        try:
+            row = self.repo.get(self.name, period)
+        except sqlite3.Error:
+            return None
+        if row and row["quota"]:
+            self.quota = row["quota"]  # sağlayıcının bildirdiği limit ortam ayarından önce gelir
+        return row
+
+    def _record(self, units: int, requests: int = 0, throttled: int = 0, flush: bool = False) -> None:
+        """Kullanımı bellekte sayar; USAGE_FLUSH_S geçtiyse (veya flush) birikmişi tek UPSERT'le yazar."""
+        with self._usage_lock:
+            period = self.period_key()
+            if self._unsaved_period not in (None, period):
+                self._flush_locked()  # önceki dönemin birikmişi kendi dönemine
+            used = self.used()
+            self._unsaved_period = period
+            for i, n in enumerate((units, requests, throttled)):
+                self._unsaved[i] += n
+            self._used = (period, max(0, used + units))
+            if flush or self._clock() - self._saved_at >= USAGE_FLUSH_S:
+                self._flush_locked()
+
+    def flush(self) -> None:
+        """Biriken kullanımı DB'ye yazar."""
+        with self._usage_lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        self._saved_at = self._clock()
+        period = self._unsaved_period
+        if period is None:
+            return
+        try:
+            total = self.repo.add(self.name, period, *self._unsaved)
+        except sqlite3.Error:
+            return  # birikmiş bellekte kalır, sonraki yazmada yeniden denenir
+        self._unsaved, self._unsaved_period = [0, 0, 0], None
+        if period == self.period_key():
+            self._used = (period, total)  # diğer süreçlerin kullanımı da dahil
+
+    def refund(self, units: int) -> None:
+        """acquire() ile sayılan ama sağlayıcıya ulaşmayan/ücretlenmeyen birimleri geri verir."""
+        if units:
+            self._record(-units, flush=True)
+
+    def sync(self, units: int, quota: Optional[int] = None) -> None:
+        """Sağlayıcının bildirdiği kullanımı esas alır (DeepL get_usage)."""
+        if quota:
+            self.quota = quota
+        with self._usage_lock:
+            self._flush_locked()  # istek/429 sayaçları yazılsın; birimleri aşağıda sağlayıcınınki ezer
+            period = self.period_key()
+            try:
+                self.repo.set_units(self.name, period, units, quota)
+            except sqlite3.Error:
+                pass
+            self._used = (period, units)
+
+    def exhaust(self) -> None:
+        """Sağlayıcı kotanın dolduğunu söyledi: dönem sonuna kadar istek gönderilmez."""
+        self.sync(max(self.used(), self.quota))
+
+    def _check_quota(self, units: int, level: int) -> None:
+        if not self.quota:
+            return
+        used = self.used()
+        limit = self.quota if level == INTERACTIVE else int(self.quota * (1 - self.reserve))
+        if used + units > limit:
+            part = "kota" if level == INTERACTIVE else "arka plan payı"
+            raise BudgetExceeded(f"{self.name} {part} doldu ({used}/{self.quota}, dönem {self.period_key()})")
+
+    # ---- pacing ----
+    def acquire(self, units: int = 1, level: Optional[int] = None,
+                stop: Optional[threading.Event] = None) -> bool:
+        """
+        Sıra ve jeton gelene kadar bekler, birimleri sayar. Kota doluysa BudgetExceeded;
+        `stop` (verilmezse priority(stop=...)) set edilirse beklemeyi bırakır ve False döner
+        (hiçbir şey sayılmaz).
+        """
+        level = _priority.get() if level is None else level
+        stop = _stop.get() if stop is None else stop
+        self._check_quota(units, level)  # beklemeden önce: kota doluysa sıraya girme
+        if not self._take(level, stop):
+            return False
+        with self._usage_lock:  # kontrol + sayma birlikte; eşzamanlı çağrılar payı aşmasın
+            self._check_quota(units, level)
+            self._record(units, requests=1)
+        return True
+
+    def _refill(self, now: float) -> None:
+        if now <= self._stamp:
+            return  # backoff süresi içinde jeton birikmez
+        if self.rate > 0:
+            self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+        self._stamp = now
+
+    def _take(self, level: int, stop: Optional[threading.Event]) -> bool:
+        entry = (level, next(self._seq))
+        with self._cond:
+            heapq.heappush(self._waiters, entry)
+            try:
+                while True:
+                    if stop is not None and stop.is_set():
+                        return False
+                    now = self._clock()
+                    self._refill(now)
+                    timeout = None  # sıra başka bekleyendeyse o çıkınca uyandırır
+                    if self._waiters[0] == entry:
+                        need = (1 - self._tokens) / self.rate if self.rate > 0 else 0.0
+                        timeout = max(self._paused_until - now, need)
+                        if timeout <= 0:
+                            if self.rate > 0:
+                                self._tokens -= 1
+                            return True
+                    if stop is not None:
+                        timeout = STOP_POLL if timeout is None else min(timeout, STOP_POLL)
+                    self._cond.wait(timeout)
+            finally:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+                self._cond.notify_all()
+
+    def backoff(self, seconds: float) -> None:
+        """Sağlayıcı 429 döndü: biriken jetonlar silinir, bu limiter'ı kullanan herkes `seconds` bekler."""
+        with self._cond:
+            self._paused_until = max(self._paused_until, self._clock() + seconds)
+            self._tokens = 0.0
+            self._stamp = self._paused_until  # bekleme bitince patlama değil, `rate` hızıyla başla
+            self._cond.notify_all()
+        self.throttled += 1
+        self._record(0, throttled=1)
+
+    def status(self) -> dict:
+        self.flush()
+        used = self.used()
+        with self._cond:
+            now = self._clock()
+            self._refill(now)
+            tokens, queued = self._tokens, len(self._waiters)
+            paused = max(0.0, self._paused_until - now)
+        try:
+            row = self.repo.get(self.name, self.period_key()) or {}
+        except sqlite3.Error:
+            row = {}
+        return {
+            "provider": self.name, "period": self.period_key(),
+            "rate_per_min": round(self.rate * 60, 1), "burst": self.burst,
+            "tokens": round(tokens, 2), "queued": queued, "paused_s": round(paused, 1),
+            "used": used, "quota": self.quota or None, "remaining": self.remaining(),
+            "requests": row.get("requests", 0), "throttled": row.get("throttled", 0),
+        }
+
+
+# ---- process-wide registry ----
+def _env_num(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _from_env(name: str) -> ProviderLimiter:
+    if name == DEEPL:
+        # DeepL Free: 500.000 karakter/ay; gerçek sınır ilk çeviride get_usage ile güncellenir
+        return ProviderLimiter(DEEPL, rate=_env_num("DEEPL_RATE", 5), burst=int(_env_num("DEEPL_BURST", 5)),
+                               quota=int(_env_num("DEEPL_CHAR_QUOTA", 500_000)), period=MONTHLY)
+    if name == OPENROUTER:
+        return ProviderLimiter(OPENROUTER, rate=_env_num("OPENROUTER_RPM", 60) / 60,
+                               burst=int(_env_num("OPENROUTER_BURST", 5)),
+                               quota=int(_env_num("OPENROUTER_DAILY_LIMIT", 0)), period=DAILY)
+    raise ValueError(f"bilinmeyen sağlayıcı: {name}")
+
+
+_limiters: Dict[str, ProviderLimiter] = {}
+_lock = threading.Lock()
+
+
+def limiter(name: str) -> ProviderLimiter:
+    """Sağlayıcının süreç genelindeki limiter'ı (ortam değişkenlerinden, ilk kullanımda kurulur)."""
+    with _lock:
+        if name not in _limiters:
+            _limiters[name] = _from_env(name)
+        return _limiters[name]
+
+
+def status() -> List[dict]:
+    return [limiter(name).status() for name in (DEEPL, OPENROUTER)]
+
+
+@atexit.register
+def flush_all() -> None:
+    """Süreç kapanırken (ve isteyen çağıran) tüm limiter'ların biriken kullanımını yazar."""
+    with _lock:
+        limiters = list(_limiters.values())
+    for lim in limiters:
+        lim.flush()
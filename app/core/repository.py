@@ -1,137 +1,382 @@
-from typing import List, Optional
-from .database import get_conn
-from ..models import Word, Example, Exercise
+import re
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+from . import database, events
+from .database import (
+    get_conn, ARCHIVE_EXAMPLE_FIELDS, ARCHIVE_EXERCISE_FIELDS, ARCHIVED_ROW_FIELDS, archived_row_values
+)
+from .scheduler import utcnow
+from .term_index import normalize_term
+from ..models import Word, Example, Exercise, SearchHit, ReviewCard
 
+# apply_word_updates ile toplu yazılabilen kelime alanları
+UPDATABLE_WORD_FIELDS = ("notes", "translation_tr", "group_title")
 
-class WordRepository:
+# Keyset sayfalama: (created_at, id) son görülen satır; sıralama created_at DESC, id DESC
+Cursor = Tuple[str, int]
+DEFAULT_PAGE_SIZE = 200
+NO_GROUP = ""  # group_title filtresinde "grupsuz (NULL)" anlamında
+
+
+def _keyset_sql(columns: str, table: str, where: List[str], params: list,
+                after: Optional[Cursor], limit: int) -> Tuple[str, list]:
+    """
+    Keyset sayfa sorgusu. (created_at, id) < (?, ?) indekste yalnızca created_at ile
+    aranır; aynı saniyede eklenen (ör. toplu içe aktarma) satırlar her sayfada baştan
+    taranmasın diye imleç iki dala bölünür: aynı created_at içinde id < ? ve daha eski
+    created_at. Her dal (…, created_at, id) indeksinde doğrudan konumlanır.
+    """
+    order = " ORDER BY created_at DESC, id DESC LIMIT ?"
+    if after is None:
+        sql = f"SELECT {columns} FROM {table}"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        return sql + order, params + [limit]
+    base = "".join(w + " AND " for w in where)
+    same = f"SELECT * FROM (SELECT {columns} FROM {table} WHERE {base}created_at = ? AND id < ?{order})"
+    older = f"SELECT * FROM (SELECT {columns} FROM {table} WHERE {base}created_at < ?{order})"
+    created_at, last_id = after
+    return (f"SELECT * FROM ({same} UNION ALL {older}){order}",
+            params + [created_at, last_id, limit] + params + [created_at, limit, limit])
+
+
+def _next_cursor(items, limit: int) -> Optional[Cursor]:
+    if len(items) < limit:
+        return None
+    last = items[-1]
+    return (_ts_text(last.created_at), last.id)
+
+
+# ---- row mapping ----
+# Sabit sütun listeleri + sütun sırasıyla model kuran row factory'ler (sqlite3.Row ve
+# anahtar araması yok). SELECT * kullanılmaz: migration ile eklenen sütunların
+# tablodaki sırası eski ve yeni DB'lerde farklıdır.
+WORD_COLUMNS = ("id, term_en, translation_tr, notes, group_title, is_learned, learned_at, created_at, "
+                "score_sum, score_count, last_score")
+EXAMPLE_COLUMNS = "id, word_id, text, origin, direction, score, feedback, exercise_id, created_at"
+EXERCISE_COLUMNS = ("id, word_id, direction, source_en, source_tr, sentence, user_answer, score, feedback, "
+                    "created_at")
+
+
+def _ts(value):
+    """SQLite 'YYYY-MM-DD HH:MM:SS' metnini datetime'a çevirir; tanınmayan değer olduğu gibi kalır."""
+    if value is None or isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return value
+
+
+def _ts_text(value) -> Optional[str]:
+    """_ts'nin tersi: keyset imleci SQL'deki CURRENT_TIMESTAMP metniyle karşılaştırılır."""
+    return value.isoformat(sep=" ") if isinstance(value, datetime) else value
+
+
+def _word_row(_cursor, r) -> Word:
+    return Word(r[0], r[1], r[2], r[3], r[4], r[5], _ts(r[6]), _ts(r[7]), r[8], r[9], r[10])
+
+
+def _example_row(_cursor, r) -> Example:
+    return Example(r[0], r[1], r[2], r[3], r[4], r[5], r[6], r[7], _ts(r[8]))
+
+
+def _exercise_row(_cursor, r) -> Exercise:
+    return Exercise(r[0], r[1], r[2], r[3], r[4], r[5], r[6], r[7], r[8], _ts(r[9]))
+
+
+CARD_COLUMNS = "word_id, direction, ease, interval_days, repetitions, lapses, due_at, last_reviewed_at"
+
+
+def _card_row(_cursor, r) -> ReviewCard:
+    return ReviewCard(r[0], r[1], r[2], r[3], r[4], r[5], _ts(r[6]), _ts(r[7]))
+
+
+def _query(c: sqlite3.Connection, row_factory, sql: str, params=()) -> sqlite3.Cursor:
+    cur = c.cursor()
+    cur.row_factory = row_factory
+    return cur.execute(sql, params)
+
+
+class _Repository:
+    def __init__(self, conn: Optional[sqlite3.Connection] = None, pending: Optional[list] = None):
+        # UnitOfWork içinden verilen bağlantı; None ise her çağrı kendi bağlantısını açar
+        self._conn = conn
+        self._pending = pending  # UnitOfWork'ün olay kuyruğu (commit'te yayınlanır)
+
+    def _changed(self, word_id: int, kind: str = events.WORD_UPDATED) -> None:
+        """Kelime değişikliğini bildirir; with self._session() bloğu kapandıktan sonra çağrılmalı."""
+        event = events.WordChanged(word_id, kind)
+        if self._pending is not None:
+            self._pending.append(event)  # UnitOfWork commit edene kadar beklet
+        else:
+            events.publish([event])
+
+    @contextmanager
+    def _session(self):
+        if self._conn is not None:
+            yield self._conn  # commit/rollback UnitOfWork'e ait
+            return
+        conn = get_conn()
+        try:
+            with conn:  # hata yoksa commit, varsa rollback
+                yield conn
+        finally:
+            conn.close()
+
+
+class WordRepository(_Repository):
     def add_word(self, term_en: str, translation_tr: str, group_title: Optional[str] = None) -> int:
-        with get_conn() as c:
+        with self._session() as c:
             cur = c.execute(
-                "INSERT INTO words(term_en, translation_tr, group_title) VALUES (?, ?, ?)",
-                (term_en.strip(), translation_tr.strip(), (group_title or None)),
+                "INSERT INTO words(term_en, translation_tr, group_title, term_norm) VALUES (?, ?, ?, ?)",
+                (term_en.strip(), translation_tr.strip(), (group_title or None), normalize_term(term_en)),
             )
-            c.commit()
-            return int(cur.lastrowid)
+            word_id = int(cur.lastrowid)
+        self._changed(word_id, events.WORD_CREATED)
+        return word_id
+
+    def create_word(self, term_en: str, translation_tr: str, group_title: Optional[str] = None) -> Word:
+        """add_word + get_word tek ifadede (INSERT ... RETURNING)."""
+        with self._session() as c:
+            w = _query(
+                c, _word_row,
+                "INSERT INTO words(term_en, translation_tr, group_title, term_norm) VALUES (?, ?, ?, ?) "
+                f"RETURNING {WORD_COLUMNS}",
+                (term_en.strip(), translation_tr.strip(), (group_title or None), normalize_term(term_en)),
+            ).fetchone()
+        self._changed(w.id, events.WORD_CREATED)
+        return w
+
+    def update_fields(self, word_id: int, fields: Dict[str, object]) -> Optional[Word]:
+        """İzin verilen alanları günceller ve güncel satırı döner (UPDATE ... RETURNING)."""
+        cols = [f for f in fields if f in UPDATABLE_WORD_FIELDS]
+        if not cols:
+            return self.get_word(word_id)
+        sets = ", ".join(f"{f} = ?" for f in cols)
+        with self._session() as c:
+            w = _query(
+                c, _word_row,
+                f"UPDATE words SET {sets} WHERE id = ? RETURNING {WORD_COLUMNS}",
+                [fields[f] for f in cols] + [word_id],
+            ).fetchone()
+        if w is not None:
+            self._changed(w.id)
+        return w
 
     def update_notes(self, word_id: int, notes: str) -> None:
-        with get_conn() as c:
+        with self._session() as c:
             c.execute("UPDATE words SET notes = ? WHERE id = ?", (notes, word_id))
-            c.commit()
+        self._changed(word_id)
+
+    def apply_word_updates(self, updates: Dict[int, Dict[str, object]]) -> None:
+        """Birden çok kelimenin küçük alan güncellemelerini tek transaction'da yazar."""
+        if not updates:
+            return
+        with self._session() as c:
+            for word_id, fields in updates.items():
+                cols = [f for f in fields if f in UPDATABLE_WORD_FIELDS]
+                if not cols:
+                    continue
+                sets = ", ".join(f"{f} = ?" for f in cols)
+                c.execute(f"UPDATE words SET {sets} WHERE id = ?", [fields[f] for f in cols] + [word_id])
+        for word_id in updates:
+            self._changed(word_id)
 
     def update_translation(self, word_id: int, new_translation_tr: str) -> None:
-        with get_conn() as c:
+        with self._session() as c:
             c.execute("UPDATE words SET translation_tr = ? WHERE id = ?", (new_translation_tr, word_id))
-            c.commit()
+        self._changed(word_id)
 
     def update_group(self, word_id: int, group_title: Optional[str]) -> None:
-        with get_conn() as c:
+        with self._session() as c:
             c.execute("UPDATE words SET group_title = ? WHERE id = ?", (group_title, word_id))
-            c.commit()
+        self._changed(word_id)
 
     def set_learned(self, word_id: int, learned: bool) -> None:
-        with get_conn() as c:
+        with self._session() as c:
             if learned:
                 c.execute("UPDATE words SET is_learned = 1, learned_at = CURRENT_TIMESTAMP WHERE id = ?", (word_id,))
             else:
                 c.execute("UPDATE words SET is_learned = 0, learned_at = NULL WHERE id = ?", (word_id,))
-            c.commit()
+        self._changed(word_id)
 
-    def get_word(self, word_id: int) -> Optional[Word]:
-        with get_conn() as c:
-            row = c.execute("SELECT * FROM words WHERE id = ?", (word_id,)).fetchone()
-            if not row:
-                return None
-            return Word(
-                id=row["id"], term_en=row["term_en"], translation_tr=row["translation_tr"],
-                notes=row["notes"], group_title=row["group_title"], is_learned=row["is_learned"],
-                learned_at=row["learned_at"], created_at=row["created_at"]
+    def mark_learned_if_avg_above(self, word_id: int, min_avg: float) -> bool:
+        """Ortalama (score_sum/score_count) eşiği geçtiyse tek UPDATE ile öğrenildi yapar."""
+        with self._session() as c:
+            cur = c.execute(
+                """
+                UPDATE words SET is_learned = 1, learned_at = CURRENT_TIMESTAMP
+                 WHERE id = ? AND is_learned = 0 AND score_count > 0
+                   AND CAST(score_sum AS REAL) / score_count > ?
+                """,
+                (word_id, min_avg),
             )
+            marked = cur.rowcount > 0
+        if marked:
+            self._changed(word_id)
+        return marked
+
+    def get_word(self, word_id: int) -> Optional[Word]:
+        with self._session() as c:
+            return _query(c, _word_row, f"SELECT {WORD_COLUMNS} FROM words WHERE id = ?", (word_id,)).fetchone()
+
+    def get_words(self, word_ids: List[int]) -> Dict[int, Word]:
+        """{id: Word} tek bağlantıda (IN listesi parça parça); olmayan id'ler sonuçta yok."""
+        out: Dict[int, Word] = {}
+        with self._session() as c:
+            for chunk in _chunks(list(word_ids)):
+                for w in _query(c, _word_row, f"SELECT {WORD_COLUMNS} FROM words "
+                                              f"WHERE id IN ({','.join('?' * len(chunk))})", chunk):
+                    out[w.id] = w
+        return out
 
     def find_by_term(self, term_en: str) -> Optional[Word]:
-        with get_conn() as c:
-            row = c.execute(
-                "SELECT * FROM words WHERE lower(term_en) = lower(?)", (term_en.strip(),)
+        with self._session() as c:
+            return _query(
+                c, _word_row, f"SELECT {WORD_COLUMNS} FROM words WHERE term_norm = ?", (normalize_term(term_en),)
             ).fetchone()
-            if not row:
-                return None
-            return Word(
-                id=row["id"], term_en=row["term_en"], translation_tr=row["translation_tr"],
-                notes=row["notes"], group_title=row["group_title"], is_learned=row["is_learned"],
-                learned_at=row["learned_at"], created_at=row["created_at"]
-            )
+
+    def all_words(self) -> List[Word]:
+        """Bellek içi kütüphane indeksini tek toplu sorguyla kurmak için."""
+        with self._session() as c:
+            return _query(c, _word_row, f"SELECT {WORD_COLUMNS} FROM words").fetchall()
+
+    def list_terms(self) -> List[tuple]:
+        """TermIndex'i tek sorguda kurmak için (id, term_en) çiftleri."""
+        with self._session() as c:
+            return [(r[0], r[1]) for r in c.execute("SELECT id, term_en FROM words")]
 
     def list_group_titles(self) -> List[str]:
-        with get_conn() as c:
+        with self._session() as c:
             rows = c.execute("SELECT DISTINCT group_title FROM words WHERE group_title IS NOT NULL ORDER BY group_title COLLATE NOCASE").fetchall()
             return [r[0] for r in rows if r[0]]
 
     def list_words(self, include_learned: bool = True) -> List[Word]:
-        with get_conn() as c:
-            if include_learned:
-                rows = c.execute("SELECT * FROM words ORDER BY created_at DESC, id DESC").fetchall()
+        return list(self.iter_words(learned=None if include_learned else False))
+
+    def list_words_page(self, limit: int = DEFAULT_PAGE_SIZE, after: Optional[Cursor] = None,
+                        group_title: Optional[str] = None, learned: Optional[bool] = None,
+                        min_avg: Optional[float] = None, max_avg: Optional[float] = None
+                        ) -> Tuple[List[Word], Optional[Cursor]]:
+        """
+        Bir sayfa kelime + sonraki sayfanın imleci (son sayfada None).
+        group_title=NO_GROUP grupsuz kelimeler; min_avg/max_avg skorlu örnek ortalaması.
+        """
+        sql, params = self._words_page_sql(limit, after, group_title, learned, min_avg, max_avg)
+        with self._session() as c:
+            items = _query(c, _word_row, sql, params).fetchall()
+            return items, _next_cursor(items, limit)
+
+    @staticmethod
+    def _words_page_sql(limit, after, group_title=None, learned=None, min_avg=None, max_avg=None):
+        where: List[str] = []
+        params: list = []
+        if group_title is not None:
+            if group_title == NO_GROUP:
+                where.append("group_title IS NULL")
             else:
-                rows = c.execute("SELECT * FROM words WHERE is_learned = 0 ORDER BY created_at DESC, id DESC").fetchall()
-            return [
-                Word(
-                    id=r["id"], term_en=r["term_en"], translation_tr=r["translation_tr"],
-                    notes=r["notes"], group_title=r["group_title"], is_learned=r["is_learned"],
-                    learned_at=r["learned_at"], created_at=r["created_at"]
-                ) for r in rows
-            ]
+                where.append("group_title = ?")
+                params.append(group_title)
+        if learned is not None:
+            where.append("is_learned = ?")
+            params.append(1 if learned else 0)
+        if min_avg is not None:
+            where.append("score_count > 0 AND CAST(score_sum AS REAL) / score_count >= ?")
+            params.append(min_avg)
+        if max_avg is not None:
+            where.append("score_count > 0 AND CAST(score_sum AS REAL) / score_count <= ?")
+            params.append(max_avg)
+        return _keyset_sql(WORD_COLUMNS, "words", where, params, after, limit)
+
+    def iter_words(self, batch_size: int = DEFAULT_PAGE_SIZE, **filters) -> Iterator[Word]:
+        """Sayfa sayfa akış (tüm sayfalar tek bağlantıda); bellekte en fazla bir sayfa tutulur."""
+        with self._session() as c:
+            after = None
+            while True:
+                sql, params = self._words_page_sql(batch_size, after, **filters)
+                page = _query(c, _word_row, sql, params).fetchall()
+                yield from page
+                after = _next_cursor(page, batch_size)
+                if after is None:
+                    return
 
 
-class ExampleRepository:
+class ExampleRepository(_Repository):
     def add_example(self, word_id: int, text: str,
                     origin: str = "MANUAL",
                     direction: Optional[str] = None,
                     score: Optional[int] = None,
                     feedback: str = "",
-                    exercise_id: Optional[int] = None) -> int:
-        with get_conn() as c:
+                    exercise_id: Optional[int] = None,
+                    grader_model: Optional[str] = None) -> int:
+        with self._session() as c:
             cur = c.execute(
                 """
-                INSERT INTO examples(word_id, text, origin, direction, score, feedback, exercise_id)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
+                INSERT INTO examples(word_id, text, origin, direction, score, feedback, exercise_id, grader_model)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
                 """,
-                (word_id, text.strip(), origin, direction, score, feedback, exercise_id)
+                (word_id, text.strip(), origin, direction, score, feedback, exercise_id, grader_model)
             )
-            c.commit()
-            return int(cur.lastrowid)
+            example_id = int(cur.lastrowid)
+        if score is not None:
+            self._changed(word_id)  # trigger words skor toplamlarını değiştirdi
+        return example_id
 
-    def list_examples(self, word_id: int) -> List[Example]:
-        with get_conn() as c:
-            rows = c.execute(
-                "SELECT * FROM examples WHERE word_id = ? ORDER BY created_at DESC, id DESC",
-                (word_id,),
+    def list_examples(self, word_id: int, limit: Optional[int] = None, offset: int = 0) -> List[Example]:
+        with self._session() as c:
+            return _query(
+                c, _example_row,
+                f"SELECT {EXAMPLE_COLUMNS} FROM examples WHERE word_id = ? "
+                "ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?",
+                (word_id, -1 if limit is None else limit, offset),
             ).fetchall()
-            result: List[Example] = []
-            for r in rows:
-                keys = r.keys()  # sqlite3.Row
-                result.append(
-                    Example(
-                        id=r["id"], word_id=r["word_id"], text=r["text"],
-                        origin=r["origin"] if "origin" in keys else "MANUAL",
-                        direction=r["direction"] if "direction" in keys else None,
-                        score=r["score"] if "score" in keys else None,
-                        feedback=r["feedback"] if "feedback" in keys else "",
-                        exercise_id=r["exercise_id"] if "exercise_id" in keys else None,
-                        created_at=r["created_at"],
-                    )
-                )
-            return result
+
+    def list_examples_page(self, word_id: int, limit: int = DEFAULT_PAGE_SIZE, after: Optional[Cursor] = None,
+                           min_score: Optional[int] = None, max_score: Optional[int] = None
+                           ) -> Tuple[List[Example], Optional[Cursor]]:
+        sql, params = self._examples_page_sql(word_id, limit, after, min_score, max_score)
+        with self._session() as c:
+            items = _query(c, _example_row, sql, params).fetchall()
+            return items, _next_cursor(items, limit)
+
+    @staticmethod
+    def _examples_page_sql(word_id, limit, after, min_score=None, max_score=None):
+        where = ["word_id = ?"]
+        params: list = [word_id]
+        if min_score is not None:
+            where.append("score >= ?")
+            params.append(min_score)
+        if max_score is not None:
+            where.append("score <= ?")
+            params.append(max_score)
+        return _keyset_sql(EXAMPLE_COLUMNS, "examples", where, params, after, limit)
+
+    def iter_examples(self, word_id: int, batch_size: int = DEFAULT_PAGE_SIZE, **filters) -> Iterator[Example]:
+        with self._session() as c:
+            after = None
+            while True:
+                sql, params = self._examples_page_sql(word_id, batch_size, after, **filters)
+                page = _query(c, _example_row, sql, params).fetchall()
+                yield from page
+                after = _next_cursor(page, batch_size)
+                if after is None:
+                    return
 
     def avg_score(self, word_id: int) -> float:
-        with get_conn() as c:
+        with self._session() as c:
             row = c.execute(
-                "SELECT AVG(score) FROM examples WHERE word_id = ? AND score IS NOT NULL",
+                "SELECT CAST(score_sum AS REAL) / score_count FROM words WHERE id = ? AND score_count > 0",
                 (word_id,)
             ).fetchone()
             return float(row[0]) if row and row[0] is not None else 0.0
 
 
-class ExerciseRepository:
+class ExerciseRepository(_Repository):
     def add_exercise(self, word_id: int, direction: str, source_en: str, source_tr: str, sentence: str) -> int:
-        with get_conn() as c:
+        with self._session() as c:
             cur = c.execute(
                 """
                 INSERT INTO exercises(word_id, direction, source_en, source_tr, sentence)
@@ -139,40 +384,823 @@ class ExerciseRepository:
                 """,
                 (word_id, direction, source_en, source_tr, sentence.strip()),
             )
-            c.commit()
             return int(cur.lastrowid)
 
-    def list_exercises(self, word_id: int) -> List[Exercise]:
-        with get_conn() as c:
-            rows = c.execute(
-                "SELECT * FROM exercises WHERE word_id = ? ORDER BY created_at DESC, id DESC",
-                (word_id,),
+    def list_exercises(self, word_id: int, limit: Optional[int] = None, offset: int = 0) -> List[Exercise]:
+        with self._session() as c:
+            return _query(
+                c, _exercise_row,
+                f"SELECT {EXERCISE_COLUMNS} FROM exercises WHERE word_id = ? "
+                "ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?",
+                (word_id, -1 if limit is None else limit, offset),
             ).fetchall()
-            return [
-                Exercise(
-                    id=r["id"], word_id=r["word_id"], direction=r["direction"],
-                    source_en=r["source_en"], source_tr=r["source_tr"], sentence=r["sentence"],
-                    user_answer=r["user_answer"], score=r["score"], feedback=r["feedback"],
-                    created_at=r["created_at"]
-                ) for r in rows
-            ]
+
+    def list_exercises_page(self, word_id: int, limit: int = DEFAULT_PAGE_SIZE, after: Optional[Cursor] = None,
+                            direction: Optional[str] = None, answered: Optional[bool] = None,
+                            min_score: Optional[int] = None, max_score: Optional[int] = None
+                            ) -> Tuple[List[Exercise], Optional[Cursor]]:
+        sql, params = self._exercises_page_sql(word_id, limit, after, direction, answered, min_score, max_score)
+        with self._session() as c:
+            items = _query(c, _exercise_row, sql, params).fetchall()
+            return items, _next_cursor(items, limit)
+
+    @staticmethod
+    def _exercises_page_sql(word_id, limit, after, direction=None, answered=None, min_score=None, max_score=None):
+        where = ["word_id = ?"]
+        params: list = [word_id]
+        if direction is not None:
+            where.append("direction = ?")
+            params.append(direction)
+        if answered is not None:
+            where.append("score IS NOT NULL" if answered else "score IS NULL")
+        if min_score is not None:
+            where.append("score >= ?")
+            params.append(min_score)
+        if max_score is not None:
+            where.append("score <= ?")
+            params.append(max_score)
+        return _keyset_sql(EXERCISE_COLUMNS, "exercises", where, params, after, limit)
+
+    def iter_exercises(self, word_id: int, batch_size: int = DEFAULT_PAGE_SIZE, **filters) -> Iterator[Exercise]:
+        with self._session() as c:
+            after = None
+            while True:
+                sql, params = self._exercises_page_sql(word_id, batch_size, after, **filters)
+                page = _query(c, _exercise_row, sql, params).fetchall()
+                yield from page
+                after = _next_cursor(page, batch_size)
+                if after is None:
+                    return
 
     def get_exercise(self, ex_id: int) -> Optional[Exercise]:
-        with get_conn() as c:
-            r = c.execute("SELECT * FROM exercises WHERE id = ?", (ex_id,)).fetchone()
-            if not r:
-                return None
-            return Exercise(
-                id=r["id"], word_id=r["word_id"], direction=r["direction"],
-                source_en=r["source_en"], source_tr=r["source_tr"], sentence=r["sentence"],
-                user_answer=r["user_answer"], score=r["score"], feedback=r["feedback"],
-                created_at=r["created_at"]
+        with self._session() as c:
+            return _query(c, _exercise_row, f"SELECT {EXERCISE_COLUMNS} FROM exercises WHERE id = ?",
+                          (ex_id,)).fetchone()
+
+    def update_answer_and_score(self, ex_id: int, user_answer: str, score: int, feedback: str,
+                                grader_model: Optional[str] = None) -> None:
+        with self._session() as c:
+            c.execute(
+                "UPDATE exercises SET user_answer = ?, score = ?, feedback = ?, grader_model = ? WHERE id = ?",
+                (user_answer.strip(), score, feedback, grader_model, ex_id),
+            )
+
+
+class ScheduleRepository(_Repository):
+    """review_schedule: kelime + yön başına SM-2 kartı ve due_at indeksli tekrar kuyruğu."""
+
+    def get_card(self, word_id: int, direction: str) -> Optional[ReviewCard]:
+        with self._session() as c:
+            return _query(
+                c, _card_row,
+                f"SELECT {CARD_COLUMNS} FROM review_schedule WHERE word_id = ? AND direction = ?",
+                (word_id, direction),
+            ).fetchone()
+
+    def save_card(self, card: ReviewCard) -> None:
+        with self._session() as c:
+            c.execute(
+                """
+                INSERT INTO review_schedule(word_id, direction, ease, interval_days, repetitions, lapses,
+                                            due_at, last_reviewed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(word_id, direction) DO UPDATE SET
+                    ease = excluded.ease, interval_days = excluded.interval_days,
+                    repetitions = excluded.repetitions, lapses = excluded.lapses,
+                    due_at = excluded.due_at, last_reviewed_at = excluded.last_reviewed_at
+                """,
+                (card.word_id, card.direction, card.ease, card.interval_days, card.repetitions, card.lapses,
+                 _ts_text(card.due_at), _ts_text(card.last_reviewed_at)),
+            )
+
+    def due_cards(self, limit: int = 20, now: Optional[datetime] = None,
+                  direction: Optional[str] = None) -> List[ReviewCard]:
+        """Vadesi gelmiş ilk `limit` kart (en gecikmiş önce); idx_review_due üzerinden sıralı okuma."""
+        where = ["due_at <= ?"]
+        params: list = [_ts_text(now or utcnow())]
+        if direction is not None:
+            where.append("direction = ?")
+            params.append(direction)
+        with self._session() as c:
+            return _query(
+                c, _card_row,
+                f"SELECT {CARD_COLUMNS} FROM review_schedule WHERE {' AND '.join(where)} "
+                "ORDER BY due_at, word_id LIMIT ?",
+                params + [limit],
+            ).fetchall()
+
+    def count_due(self, now: Optional[datetime] = None) -> int:
+        with self._session() as c:
+            row = c.execute("SELECT COUNT(*) FROM review_schedule WHERE due_at <= ?",
+                            (_ts_text(now or utcnow()),)).fetchone()
+            return int(row[0])
+
+
+class StatsRepository(_Repository):
+    """Günlük istatistik tabloları (trigger'larla güncel) ve analiz için toplu sütun okumaları (tuple)."""
+
+    def daily_counts(self, since_day: str, group_title: Optional[str] = None) -> List[tuple]:
+        """[(day, words_added, words_learned)] since_day (YYYY-MM-DD) ve sonrası."""
+        where, params = ["day >= ?"], [since_day]
+        if group_title is not None:
+            where.append("group_title = ?")
+            params.append(group_title)
+        with self._session() as c:
+            return _query(
+                c, None,
+                f"SELECT day, SUM(words_added), SUM(words_learned) FROM stats_daily "
+                f"WHERE {' AND '.join(where)} GROUP BY day",
+                params,
+            ).fetchall()
+
+    def daily_scores(self, since_day: str, group_title: Optional[str] = None,
+                     direction: Optional[str] = None) -> List[tuple]:
+        """[(day, score, n)]: gün + puan başına puanlanmış cevap sayısı."""
+        where, params = ["day >= ?"], [since_day]
+        if group_title is not None:
+            where.append("group_title = ?")
+            params.append(group_title)
+        if direction is not None:
+            where.append("direction = ?")
+            params.append(direction)
+        with self._session() as c:
+            return _query(
+                c, None,
+                f"SELECT day, score, SUM(n) FROM stats_daily_scores "
+                f"WHERE {' AND '.join(where)} GROUP BY day, score HAVING SUM(n) > 0",
+                params,
+            ).fetchall()
+
+    def word_score_columns(self) -> List[tuple]:
+        """[(score_sum, score_count, is_learned)] tüm kelimeler, tek sorguda (vektörel analiz için)."""
+        with self._session() as c:
+            return _query(c, None, "SELECT score_sum, score_count, is_learned FROM words").fetchall()
+
+
+EXPORT_WORD_FIELDS = ("id", "term_en", "translation_tr", "group_title", "notes", "is_learned",
+                      "learned_at", "created_at", "score_sum", "score_count")
+EXPORT_EXAMPLE_FIELDS = ("text", "origin", "direction", "score", "feedback", "created_at")
+
+
+class ExportRepository(_Repository):
+    """Dışa aktarma için kelime (+ örnek) akışı; satırlar alan adlı dict olarak döner."""
+
+    def iter_words_with_examples(self, batch_size: int = 500, group_title: Optional[str] = None,
+                                 learned: Optional[bool] = None, examples: bool = True) -> Iterator[dict]:
+        """
+        Kelimeler id sırasıyla keyset (id > ?) sayfalarıyla, her sayfanın örnekleri tek
+        IN sorgusuyla (word_id indeksi) okunur; bellekte en fazla bir sayfa durur.
+        Kendi bağlantısında tüm akış tek okuma transaction'ıdır: çıktı tutarlı bir anlık
+        görüntüdür, WAL sayesinde yazarlar beklemez.
+        """
+        where, params = ["id > ?"], []
+        if group_title is not None:
+            if group_title == NO_GROUP:
+                where.append("group_title IS NULL")
+            else:
+                where.append("group_title = ?")
+                params.append(group_title)
+        if learned is not None:
+            where.append("is_learned = ?")
+            params.append(1 if learned else 0)
+        word_sql = (f"SELECT {', '.join(EXPORT_WORD_FIELDS)} FROM words WHERE {' AND '.join(where)} "
+                    "ORDER BY id LIMIT ?")
+        with self._session() as c:
+            if not c.in_transaction:
+                c.execute("BEGIN")  # anlık görüntü; with bloğu sonunda kapanır
+            last_id = 0
+            while True:
+                page = _query(c, None, word_sql, [last_id] + params + [batch_size]).fetchall()
+                if not page:
+                    return
+                by_word: Dict[int, list] = {r[0]: [] for r in page}
+                if examples:
+                    rows = _query(
+                        c, None,
+                        f"SELECT word_id, {', '.join(EXPORT_EXAMPLE_FIELDS)} FROM examples "
+                        f"WHERE word_id IN ({','.join('?' * len(page))}) ORDER BY word_id, id",
+                        list(by_word),
+                    )
+                    for r in rows:
+                        by_word[r[0]].append(dict(zip(EXPORT_EXAMPLE_FIELDS, r[1:])))
+                for r in page:
+                    word = dict(zip(EXPORT_WORD_FIELDS, r))
+                    if examples:
+                        word["examples"] = by_word[r[0]]
+                    yield word
+                if len(page) < batch_size:
+                    return
+                last_id = page[-1][0]
+
+
+# Eşitleme paketlerinde taşınan alanlar; skor toplamları (score_sum vb.) örneklerden türetilir
+SYNC_WORD_FIELDS = ("term_en", "translation_tr", "notes", "group_title", "is_learned", "learned_at", "created_at")
+SYNC_EXERCISE_FIELDS = ("direction", "source_en", "source_tr", "sentence", "user_answer", "score", "feedback",
+                        "created_at", "grader_model")
+SYNC_EXAMPLE_FIELDS = ("text", "origin", "direction", "score", "feedback", "created_at", "grader_model")
+_IN_CHUNK = 500  # IN (...) başına parametre
+
+
+def _chunks(keys: List[str]):
+    for i in range(0, len(keys), _IN_CHUNK):
+        yield keys[i:i + _IN_CHUNK]
+
+
+class SyncRepository(_Repository):
+    """
+    Değişiklik günlüğü (change_log), eşitleme kopyaları (sync_peers), app_flags ve
+    kopyalar arası anahtarla (kelime: term_norm, örnek/görev: uid) satır okuma/yazma.
+    Satırlar paket formatına hazır dict olarak döner.
+    """
+
+    # ---- flags / replica ----
+    def get_flag(self, name: str) -> Optional[str]:
+        with self._session() as c:
+            row = c.execute("SELECT value FROM app_flags WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def set_flag(self, name: str, value: Optional[str]) -> None:
+        with self._session() as c:
+            if value is None:
+                c.execute("DELETE FROM app_flags WHERE name = ?", (name,))
+            else:
+                c.execute("INSERT INTO app_flags(name, value) VALUES (?, ?) "
+                          "ON CONFLICT(name) DO UPDATE SET value = excluded.value", (name, value))
+
+    def replica_id(self) -> str:
+        return self.get_flag("replica_id")
+
+    # ---- change log ----
+    def max_seq(self) -> int:
+        with self._session() as c:
+            return c.execute("SELECT COALESCE(MAX(seq), 0) FROM change_log").fetchone()[0]
+
+    def changes_since(self, since: int, exclude_origin: Optional[str] = None) -> List[tuple]:
+        """[(seq, entity, key, op, changed_at)] seq sırasıyla; exclude_origin'den gelenler hariç."""
+        sql = "SELECT seq, entity, key, op, changed_at FROM change_log WHERE seq > ?"
+        params: list = [since]
+        if exclude_origin is not None:
+            sql += " AND origin IS NOT ?"
+            params.append(exclude_origin)
+        with self._session() as c:
+            return _query(c, None, sql + " ORDER BY seq", params).fetchall()
+
+    def log_entry(self, entity: str, key: str) -> Optional[tuple]:
+        """(seq, op, origin, changed_at) ya da None."""
+        with self._session() as c:
+            return _query(c, None, "SELECT seq, op, origin, changed_at FROM change_log WHERE entity = ? AND key = ?",
+                          (entity, key)).fetchone()
+
+    def mark_local(self, entity: str, key: str) -> None:
+        """Birleştirilmiş sonucu yerel değişiklik say (kaynağına da geri gönderilsin)."""
+        with self._session() as c:
+            c.execute("UPDATE change_log SET origin = NULL WHERE entity = ? AND key = ?", (entity, key))
+
+    # ---- peers ----
+    def get_peer(self, peer_id: str) -> Tuple[int, int]:
+        """(sent_seq, received_seq); bilinmeyen kopya için (0, 0)."""
+        with self._session() as c:
+            row = c.execute("SELECT sent_seq, received_seq FROM sync_peers WHERE peer_id = ?", (peer_id,)).fetchone()
+        return (row[0], row[1]) if row else (0, 0)
+
+    def save_peer(self, peer_id: str, sent_seq: Optional[int] = None, received_seq: Optional[int] = None) -> None:
+        with self._session() as c:
+            c.execute(
+                "INSERT INTO sync_peers(peer_id, sent_seq, received_seq, synced_at) "
+                "VALUES (?, COALESCE(?, 0), COALESCE(?, 0), CURRENT_TIMESTAMP) "
+                "ON CONFLICT(peer_id) DO UPDATE SET sent_seq = COALESCE(?, sent_seq), "
+                "received_seq = COALESCE(?, received_seq), synced_at = CURRENT_TIMESTAMP",
+                (peer_id, sent_seq, received_seq, sent_seq, received_seq),
+            )
+
+    # ---- rows by sync key ----
+    def _rows(self, sql: str, keys: List[str], names: Tuple[str, ...]) -> Dict[str, dict]:
+        out: Dict[str, dict] = {}
+        with self._session() as c:
+            for chunk in _chunks(keys):
+                marks = ",".join("?" * len(chunk))
+                for row in _query(c, None, sql.format(marks=marks), chunk):
+                    out[row[0]] = dict(zip(names, row[1:]))
+        return out
+
+    def word_rows(self, keys: List[str]) -> Dict[str, dict]:
+        return self._rows(f"SELECT term_norm, {', '.join(SYNC_WORD_FIELDS)} FROM words WHERE term_norm IN ({{marks}})",
+                          keys, SYNC_WORD_FIELDS)
+
+    def exercise_rows(self, keys: List[str]) -> Dict[str, dict]:
+        cols = ", ".join(f"x.{f}" for f in SYNC_EXERCISE_FIELDS)
+        return self._rows(f"SELECT x.uid, w.term_norm, {cols} FROM exercises x JOIN words w ON w.id = x.word_id "
+                          f"WHERE x.uid IN ({{marks}})", keys, ("word",) + SYNC_EXERCISE_FIELDS)
+
+    def example_rows(self, keys: List[str]) -> Dict[str, dict]:
+        cols = ", ".join(f"e.{f}" for f in SYNC_EXAMPLE_FIELDS)
+        return self._rows(f"SELECT e.uid, w.term_norm, x.uid, {cols} FROM examples e JOIN words w ON w.id = e.word_id "
+                          f"LEFT JOIN exercises x ON x.id = e.exercise_id WHERE e.uid IN ({{marks}})",
+                          keys, ("word", "exercise") + SYNC_EXAMPLE_FIELDS)
+
+    def id_by_key(self, entity: str, key: Optional[str]) -> Optional[int]:
+        if key is None:
+            return None
+        sql = {"word": "SELECT id FROM words WHERE term_norm = ?",
+               "example": "SELECT id FROM examples WHERE uid = ?",
+               "exercise": "SELECT id FROM exercises WHERE uid = ?"}[entity]
+        with self._session() as c:
+            row = c.execute(sql, (key,)).fetchone()
+        return row[0] if row else None
+
+    # ---- apply ----
+    def upsert_word(self, key: str, row: dict) -> int:
+        # ON CONFLICT kullanılmaz: eski DB'lerde term_norm indeksi tekil olmayabilir
+        values = [row.get(f) for f in SYNC_WORD_FIELDS]
+        with self._session() as c:
+            found = c.execute("SELECT id FROM words WHERE term_norm = ?", (key,)).fetchone()
+            if found is None:
+                word_id = c.execute(
+                    f"INSERT INTO words(term_norm, {', '.join(SYNC_WORD_FIELDS)}) "
+                    f"VALUES (?, {', '.join('?' * len(SYNC_WORD_FIELDS))}) RETURNING id",
+                    [key] + values,
+                ).fetchone()[0]
+            else:
+                word_id = found[0]
+                fields = [f for f in SYNC_WORD_FIELDS if f != "created_at"]
+                c.execute(f"UPDATE words SET {', '.join(f + ' = ?' for f in fields)} WHERE id = ?",
+                          [row.get(f) for f in fields] + [word_id])
+        self._changed(word_id, events.WORD_CREATED if found is None else events.WORD_UPDATED)
+        return word_id
+
+    def upsert_exercise(self, key: str, word_id: int, row: dict) -> int:
+        values = [row.get(f) for f in SYNC_EXERCISE_FIELDS]
+        with self._session() as c:
+            return c.execute(
+                f"INSERT INTO exercises(uid, word_id, {', '.join(SYNC_EXERCISE_FIELDS)}) "
+                f"VALUES (?, ?, {', '.join('?' * len(SYNC_EXERCISE_FIELDS))}) "
+                f"ON CONFLICT(uid) DO UPDATE SET word_id = excluded.word_id, "
+                + ", ".join(f"{f} = excluded.{f}" for f in SYNC_EXERCISE_FIELDS if f != "created_at")
+                + " RETURNING id",
+                [key, word_id] + values,
+            ).fetchone()[0]
+
+    def upsert_example(self, key: str, word_id: int, exercise_id: Optional[int], row: dict) -> int:
+        values = [row.get(f) for f in SYNC_EXAMPLE_FIELDS]
+        with self._session() as c:
+            example_id = c.execute(
+                f"INSERT INTO examples(uid, word_id, exercise_id, {', '.join(SYNC_EXAMPLE_FIELDS)}) "
+                f"VALUES (?, ?, ?, {', '.join('?' * len(SYNC_EXAMPLE_FIELDS))}) "
+                f"ON CONFLICT(uid) DO UPDATE SET word_id = excluded.word_id, exercise_id = excluded.exercise_id, "
+                + ", ".join(f"{f} = excluded.{f}" for f in SYNC_EXAMPLE_FIELDS if f != "created_at")
+                + " RETURNING id",
+                [key, word_id, exercise_id] + values,
+            ).fetchone()[0]
+        self._changed(word_id)  # skor toplamları trigger ile değişmiş olabilir
+        return example_id
+
+    def delete_by_key(self, entity: str, key: str) -> bool:
+        """Satırı siler (kelimede örnek ve görevleriyle birlikte); silinecek satır yoksa False."""
+        with self._session() as c:
+            if entity == "word":
+                row = c.execute("SELECT id FROM words WHERE term_norm = ?", (key,)).fetchone()
+                if row is None:
+                    return False
+                c.execute("DELETE FROM examples WHERE word_id = ?", (row[0],))
+                c.execute("DELETE FROM exercises WHERE word_id = ?", (row[0],))
+                c.execute("DELETE FROM words WHERE id = ?", (row[0],))
+            else:
+                table = "examples" if entity == "example" else "exercises"
+                row = c.execute(f"DELETE FROM {table} WHERE uid = ? RETURNING word_id", (key,)).fetchone()
+                if row is None:
+                    return False
+        self._changed(row[0], events.WORD_DELETED if entity == "word" else events.WORD_UPDATED)
+        return True
+
+
+class ArchiveRepository(_Repository):
+    """
+    Soğuk arşiv (archive_batches). Paket içeriği (sıkıştırma) serviste; burada satır
+    seçme/silme ve paket kayıtları. Silmeler 'archiving' bayrağı açıkken yapılmalı
+    (bkz. MaintenanceService.archive), yoksa puan toplamları ve istatistikler düşer.
+    """
+
+    def candidates(self, cutoff: str, after_word_id: int = 0, limit: int = 500) -> List[Tuple[int, int]]:
+        """[(word_id, eski satır sayısı)] öğrenilmiş kelimeler, created_at < cutoff olan örnek/görevleri olan."""
+        with self._session() as c:
+            return _query(
+                c, None,
+                """
+                SELECT id, n FROM (
+                    SELECT w.id,
+                           (SELECT COUNT(*) FROM examples e WHERE e.word_id = w.id AND e.created_at < ?)
+                         + (SELECT COUNT(*) FROM exercises x WHERE x.word_id = w.id AND x.created_at < ?) AS n
+                      FROM words w
+                     WHERE w.is_learned = 1 AND w.id > ?
+                     ORDER BY w.id)
+                 WHERE n > 0 LIMIT ?
+                """,
+                (cutoff, cutoff, after_word_id, limit),
+            ).fetchall()
+
+    def old_rows(self, word_ids: List[int], cutoff: str) -> Tuple[List[tuple], List[tuple]]:
+        marks = ",".join("?" * len(word_ids))
+        with self._session() as c:
+            examples = _query(
+                c, None,
+                f"SELECT {', '.join(ARCHIVE_EXAMPLE_FIELDS)} FROM examples "
+                f"WHERE word_id IN ({marks}) AND created_at < ? ORDER BY word_id, id",
+                word_ids + [cutoff],
+            ).fetchall()
+            exercises = _query(
+                c, None,
+                f"SELECT {', '.join(ARCHIVE_EXERCISE_FIELDS)} FROM exercises "
+                f"WHERE word_id IN ({marks}) AND created_at < ? ORDER BY word_id, id",
+                word_ids + [cutoff],
+            ).fetchall()
+            return examples, exercises
+
+    def delete_rows(self, example_ids: List[int], exercise_ids: List[int]) -> None:
+        with self._session() as c:
+            for table, ids in (("examples", example_ids), ("exercises", exercise_ids)):
+                for chunk in _chunks(ids):
+                    c.execute(f"DELETE FROM {table} WHERE id IN ({','.join('?' * len(chunk))})", chunk)
+
+    def add_batch(self, first_word_id: int, last_word_id: int, words: int, examples: int, exercises: int,
+                  scored: int, score_sum: int, oldest: Optional[str], newest: Optional[str],
+                  raw_bytes: int, payload: bytes) -> int:
+        with self._session() as c:
+            cur = c.execute(
+                """
+                INSERT INTO archive_batches(first_word_id, last_word_id, words, examples, exercises,
+                                            scored, score_sum, oldest, newest, raw_bytes, payload)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (first_word_id, last_word_id, words, examples, exercises, scored, score_sum,
+                 oldest, newest, raw_bytes, payload),
+            )
+            return int(cur.lastrowid)
+
+    def index_rows(self, batch_id: int, examples: List[tuple], exercises: List[tuple]) -> None:
+        """Paketteki satırları archived_rows'a yazar (uid ile eşitleme bulur)."""
+        cols = ", ".join(ARCHIVED_ROW_FIELDS)
+        with self._session() as c:
+            for entity, fields, rows in (("example", ARCHIVE_EXAMPLE_FIELDS, examples),
+                                         ("exercise", ARCHIVE_EXERCISE_FIELDS, exercises)):
+                c.executemany(
+                    f"INSERT OR REPLACE INTO archived_rows(entity, batch_id, {cols}) "
+                    f"VALUES (?, ?, {', '.join('?' * len(ARCHIVED_ROW_FIELDS))})",
+                    [(entity, batch_id) + archived_row_values(fields, r)
+                     for r in rows if r[fields.index("uid")] is not None],
+                )
+
+    def locate(self, entity: str, uid: str) -> Optional[Tuple[int, bytes]]:
+        """Arşivlenmiş satırın (batch_id, paket); arşivde değilse None."""
+        with self._session() as c:
+            return c.execute(
+                "SELECT b.id, b.payload FROM archived_rows a JOIN archive_batches b ON b.id = a.batch_id "
+                "WHERE a.entity = ? AND a.uid = ?",
+                (entity, uid),
+            ).fetchone()
+
+    def rewrite_batch(self, batch_id: int, examples: int, exercises: int, scored: int, score_sum: int,
+                      raw_bytes: int, payload: bytes) -> None:
+        with self._session() as c:
+            c.execute(
+                "UPDATE archive_batches SET examples = ?, exercises = ?, scored = ?, score_sum = ?, "
+                "raw_bytes = ?, payload = ? WHERE id = ?",
+                (examples, exercises, scored, score_sum, raw_bytes, payload, batch_id),
+            )
+
+    def update_row(self, entity: str, uid: str, fields, row: Optional[tuple]) -> None:
+        """archived_rows kaydını paketteki satırla eşitler (row None: kaldırır); puan trigger'ları toplamları düzeltir."""
+        with self._session() as c:
+            if row is None:
+                found = c.execute("DELETE FROM archived_rows WHERE entity = ? AND uid = ? RETURNING word_id",
+                                  (entity, uid)).fetchone()
+            else:
+                values = archived_row_values(fields, row)
+                found = c.execute(
+                    f"UPDATE archived_rows SET {', '.join(f + ' = ?' for f in ARCHIVED_ROW_FIELDS[1:])} "
+                    f"WHERE entity = ? AND uid = ? RETURNING word_id",
+                    values[1:] + (entity, uid),
+                ).fetchone()
+        if found is not None:
+            self._changed(found[0])  # ortalama değişmiş olabilir
+
+    def counts_for_word(self, word_id: int) -> Dict[str, int]:
+        """{"example": n, "exercise": n} arşivdeki satırlar (paket açılmaz)."""
+        with self._session() as c:
+            rows = c.execute("SELECT entity, COUNT(*) FROM archived_rows WHERE word_id = ? GROUP BY entity",
+                             (word_id,)).fetchall()
+        return {"example": 0, "exercise": 0, **{r[0]: r[1] for r in rows}}
+
+    def payloads_for_word(self, word_id: int) -> List[bytes]:
+        with self._session() as c:
+            rows = c.execute(
+                "SELECT payload FROM archive_batches WHERE last_word_id >= ? AND first_word_id <= ? ORDER BY id",
+                (word_id, word_id),
+            ).fetchall()
+            return [r[0] for r in rows]
+
+    def summary(self) -> dict:
+        with self._session() as c:
+            r = c.execute(
+                "SELECT COUNT(*), COALESCE(SUM(examples), 0), COALESCE(SUM(exercises), 0), "
+                "COALESCE(SUM(scored), 0), COALESCE(SUM(score_sum), 0), COALESCE(SUM(raw_bytes), 0), "
+                "COALESCE(SUM(length(payload)), 0), MIN(oldest), MAX(newest) FROM archive_batches"
+            ).fetchone()
+            return dict(zip(("batches", "examples", "exercises", "scored", "score_sum", "raw_bytes",
+                             "packed_bytes", "oldest", "newest"), tuple(r)))
+
+
+class MaintenanceRepository(_Repository):
+    """Bakım PRAGMA'ları. VACUUM / incremental_vacuum transaction dışında çalışır; UnitOfWork'le kullanılmaz."""
+
+    def page_stats(self) -> Dict[str, int]:
+        with self._session() as c:
+            return {name: c.execute(f"PRAGMA {name}").fetchone()[0]
+                    for name in ("page_size", "page_count", "freelist_count", "auto_vacuum")}
+
+    def incremental_vacuum(self) -> int:
+        """Boş sayfaları dosyadan geri verir (auto_vacuum=INCREMENTAL); geri verilen sayfa sayısı."""
+        with self._session() as c:
+            before = c.execute("PRAGMA freelist_count").fetchone()[0]
+            # execute() tek adım atar (adım başına bir sayfa); executescript sonuna kadar çalıştırır
+            c.executescript("PRAGMA incremental_vacuum")
+            freed = before - c.execute("PRAGMA freelist_count").fetchone()[0]
+        self.checkpoint()
+        return freed
+
+    def vacuum(self, incremental: bool = True) -> None:
+        """Tam VACUUM; eski (auto_vacuum=NONE) DB'ler bu sırada INCREMENTAL'a geçirilir."""
+        conn = get_conn()
+        try:
+            if incremental:
+                conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.execute("VACUUM")
+        finally:
+            conn.close()
+        self.checkpoint()
+
+    def checkpoint(self) -> None:
+        with self._session() as c:
+            c.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchall()
+
+    def analyze(self, limit: int = 1000) -> None:
+        # analysis_limit: büyük tablolarda indeks başına örneklem (tam tarama değil)
+        with self._session() as c:
+            c.execute(f"PRAGMA analysis_limit = {int(limit)}").fetchall()
+            c.execute("ANALYZE")
+
+    def optimize_search(self) -> bool:
+        if not database.FTS_AVAILABLE:
+            return False
+        with self._session() as c:
+            c.execute("INSERT INTO search_fts(search_fts) VALUES ('optimize')")  # segmentleri birleştir
+        return True
+
+    def optimize(self) -> None:
+        with self._session() as c:
+            c.execute("PRAGMA optimize").fetchall()
+
+
+REGRADE_JOB_FIELDS = ("id", "model", "status", "last_example_id", "total", "done", "changed", "failed",
+                      "started_at", "updated_at")
+
+
+class RegradeRepository(_Repository):
+    """
+    Yeniden puanlama: görevden gelen puanlı örnekler (examples.id sırasıyla, keyset) ve
+    regrade_jobs kontrol noktaları. Kaynak satır: (example_id, exercise_id, word_id, direction,
+    sentence, answer, score).
+    """
+
+    _PENDING_WHERE = ("e.score IS NOT NULL AND e.exercise_id IS NOT NULL "
+                      "AND (e.grader_model IS NULL OR e.grader_model != ?)")
+
+    def count_pending(self, model: str, after_id: int = 0) -> int:
+        with self._session() as c:
+            return c.execute(
+                f"SELECT COUNT(*) FROM examples e JOIN exercises x ON x.id = e.exercise_id "
+                f"WHERE {self._PENDING_WHERE} AND e.id > ?",
+                (model, after_id),
+            ).fetchone()[0]
+
+    def pending(self, model: str, after_id: int, limit: int) -> List[tuple]:
+        with self._session() as c:
+            return _query(
+                c, None,
+                f"SELECT e.id, e.exercise_id, e.word_id, x.direction, x.sentence, e.text, e.score "
+                f"FROM examples e JOIN exercises x ON x.id = e.exercise_id "
+                f"WHERE {self._PENDING_WHERE} AND e.id > ? ORDER BY e.id LIMIT ?",
+                (model, after_id, limit),
+            ).fetchall()
+
+    def save_grade(self, example_id: int, exercise_id: int, word_id: int, answer: str, score: int,
+                   feedback: str, model: str) -> None:
+        """Örneği ve (bu cevap görevin son cevabıysa) görevi günceller; toplamlar/istatistik trigger'larla."""
+        with self._session() as c:
+            c.execute("UPDATE examples SET score = ?, feedback = ?, grader_model = ? WHERE id = ?",
+                      (score, feedback, model, example_id))
+            c.execute("UPDATE exercises SET score = ?, feedback = ?, grader_model = ? "
+                      "WHERE id = ? AND user_answer = ?", (score, feedback, model, exercise_id, answer.strip()))
+        self._changed(word_id)
+
+    def open_job(self, model: str) -> Optional[dict]:
+        with self._session() as c:
+            row = c.execute(
+                f"SELECT {', '.join(REGRADE_JOB_FIELDS)} FROM regrade_jobs "
+                "WHERE model = ? AND status = 'running' ORDER BY id DESC LIMIT 1", (model,)
+            ).fetchone()
+            return dict(zip(REGRADE_JOB_FIELDS, tuple(row))) if row else None
+
+    def get_job(self, job_id: int) -> Optional[dict]:
+        with self._session() as c:
+            row = c.execute(f"SELECT {', '.join(REGRADE_JOB_FIELDS)} FROM regrade_jobs WHERE id = ?",
+                            (job_id,)).fetchone()
+            return dict(zip(REGRADE_JOB_FIELDS, tuple(row))) if row else None
+
+    def create_job(self, model: str, total: int) -> dict:
+        with self._session() as c:
+            c.execute("UPDATE regrade_jobs SET status = 'cancelled', updated_at = CURRENT_TIMESTAMP "
+                      "WHERE model = ? AND status = 'running'", (model,))
+            row = c.execute(
+                f"INSERT INTO regrade_jobs(model, total) VALUES (?, ?) RETURNING {', '.join(REGRADE_JOB_FIELDS)}",
+                (model, total),
+            ).fetchone()
+            return dict(zip(REGRADE_JOB_FIELDS, tuple(row)))
+
+    def checkpoint(self, job_id: int, last_example_id: int, done: int, changed: int, failed: int,
+                   status: str = "running") -> None:
+        with self._session() as c:
+            c.execute(
+                "UPDATE regrade_jobs SET last_example_id = ?, done = done + ?, changed = changed + ?, "
+                "failed = failed + ?, status = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+                (last_example_id, done, changed, failed, status, job_id),
             )
 
-    def update_answer_and_score(self, ex_id: int, user_answer: str, score: int, feedback: str) -> None:
-        with get_conn() as c:
+    def list_jobs(self, limit: int = 10) -> List[dict]:
+        with self._session() as c:
+            rows = c.execute(f"SELECT {', '.join(REGRADE_JOB_FIELDS)} FROM regrade_jobs ORDER BY id DESC LIMIT ?",
+                             (limit,)).fetchall()
+            return [dict(zip(REGRADE_JOB_FIELDS, tuple(r))) for r in rows]
+
+    def scores_by_model(self) -> List[tuple]:
+        """[(grader_model | None, puanlı örnek sayısı, ortalama)]"""
+        with self._session() as c:
+            return c.execute(
+                "SELECT grader_model, COUNT(*), AVG(score) FROM examples WHERE score IS NOT NULL "
+                "GROUP BY grader_model ORDER BY COUNT(*) DESC"
+            ).fetchall()
+
+    def archived_scores_by_model(self) -> List[tuple]:
+        """scores_by_model'in arşivdeki karşılığı (archived_rows; paket açılmaz)."""
+        with self._session() as c:
+            return c.execute(
+                "SELECT grader_model, COUNT(*), AVG(score) FROM archived_rows "
+                "WHERE entity = 'example' AND score IS NOT NULL GROUP BY grader_model ORDER BY COUNT(*) DESC"
+            ).fetchall()
+
+
+USAGE_FIELDS = ("provider", "period", "units", "requests", "throttled", "quota", "updated_at")
+
+
+class UsageRepository(_Repository):
+    """api_usage sayaçları; add() birleşik toplamı döner, aynı DB'yi kullanan süreçler kotayı paylaşır."""
+
+    def add(self, provider: str, period: str, units: int, requests: int = 0, throttled: int = 0) -> int:
+        """Sayaçları artırır (units < 0: iade, ör. gönderilemeyen istek); dönemin güncel units toplamı."""
+        with self._session() as c:
+            row = c.execute(
+                "INSERT INTO api_usage(provider, period, units, requests, throttled) VALUES (?, ?, MAX(0, ?), ?, ?) "
+                "ON CONFLICT(provider, period) DO UPDATE SET units = MAX(0, units + ?), "
+                "requests = requests + excluded.requests, throttled = throttled + excluded.throttled, "
+                "updated_at = CURRENT_TIMESTAMP RETURNING units",
+                (provider, period, units, requests, throttled, units),
+            ).fetchone()
+            return row[0]
+
+    def set_units(self, provider: str, period: str, units: int, quota: Optional[int] = None) -> None:
+        """Sağlayıcının bildirdiği kullanımı (ve limiti) yazar; yerel sayaç ona göre düzelir."""
+        with self._session() as c:
             c.execute(
-                "UPDATE exercises SET user_answer = ?, score = ?, feedback = ? WHERE id = ?",
-                (user_answer.strip(), score, feedback, ex_id),
+                "INSERT INTO api_usage(provider, period, units, quota) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(provider, period) DO UPDATE SET units = excluded.units, "
+                "quota = COALESCE(excluded.quota, quota), updated_at = CURRENT_TIMESTAMP",
+                (provider, period, units, quota),
             )
-            c.commit()
\ No newline at end of file
+
+    def get(self, provider: str, period: str) -> Optional[dict]:
+        with self._session() as c:
+            row = c.execute(f"SELECT {', '.join(USAGE_FIELDS)} FROM api_usage WHERE provider = ? AND period = ?",
+                            (provider, period)).fetchone()
+            return dict(zip(USAGE_FIELDS, tuple(row))) if row else None
+
+    def history(self, provider: str, limit: int = 12) -> List[dict]:
+        with self._session() as c:
+            rows = c.execute(f"SELECT {', '.join(USAGE_FIELDS)} FROM api_usage WHERE provider = ? "
+                             "ORDER BY period DESC LIMIT ?", (provider, limit)).fetchall()
+            return [dict(zip(USAGE_FIELDS, tuple(r))) for r in rows]
+
+
+_KIND_OF_ROWID = {1: "word", 2: "example", 3: "exercise"}
+
+
+def build_match_query(text: str) -> str:
+    """
+    Kullanıcı girdisini güvenli bir FTS5 sorgusuna çevirir (kelimeler VE ile).
+    Yazarken arama için yalnızca son kelime önek olarak aranır; 3 harften kısa
+    önekler çok sayıda satırla eşleşeceğinden tam kelime sayılır.
+    """
+    tokens = re.findall(r"\w+", text or "")
+    parts = [f'"{t}"' for t in tokens]
+    if tokens and len(tokens[-1]) >= 3:
+        parts[-1] += "*"
+    return " ".join(parts)
+
+
+class SearchRepository(_Repository):
+    def search(self, text: str, limit: int = 20, offset: int = 0) -> List[SearchHit]:
+        """Kelime/not/örnek/görev cümlelerinde bm25 ile sıralı, sayfalı arama."""
+        match = build_match_query(text)
+        if not match:
+            return []
+        if not database.FTS_AVAILABLE:
+            return self._search_like(text, limit, offset)
+        with self._session() as c:
+            rows = c.execute(
+                """
+                SELECT f.id, f.word_id, f.snip, f.rank, w.term_en, w.translation_tr
+                  FROM (SELECT rowid AS id, word_id, rank,
+                               snippet(search_fts, -1, '[', ']', '…', 12) AS snip
+                          FROM search_fts
+                         WHERE search_fts MATCH ?
+                         ORDER BY rank
+                         LIMIT ? OFFSET ?) f
+                  JOIN words w ON w.id = f.word_id
+                 ORDER BY f.rank
+                """,
+                (match, limit, offset),
+            ).fetchall()
+            return [
+                SearchHit(
+                    kind=_KIND_OF_ROWID[r[0] % 4], ref_id=r[0] // 4, word_id=r[1],
+                    term_en=r[4], translation_tr=r[5], snippet=r[2], rank=r[3],
+                ) for r in rows
+            ]
+
+    def _search_like(self, text: str, limit: int, offset: int) -> List[SearchHit]:
+        pat = f"%{text.strip()}%"
+        with self._session() as c:
+            rows = c.execute(
+                """
+                SELECT 'word', id, id, term_en || ' ' || translation_tr || ' ' || COALESCE(notes, '')
+                  FROM words WHERE term_en LIKE ?1 OR translation_tr LIKE ?1 OR notes LIKE ?1
+                UNION ALL
+                SELECT 'example', id, word_id, text FROM examples WHERE text LIKE ?1
+                UNION ALL
+                SELECT 'exercise', id, word_id, sentence FROM exercises WHERE sentence LIKE ?1
+                LIMIT ?2 OFFSET ?3
+                """,
+                (pat, limit, offset),
+            ).fetchall()
+            out = []
+            for kind, ref_id, word_id, body in rows:
+                w = c.execute("SELECT term_en, translation_tr FROM words WHERE id = ?", (word_id,)).fetchone()
+                if w:
+                    out.append(SearchHit(kind, ref_id, word_id, w[0], w[1], body))
+            return out
+
+
+class UnitOfWork:
+    """
+    Bir servis işlemini tek bağlantı ve tek transaction içinde çalıştırır:
+
+        with UnitOfWork() as uow:
+            uow.exercises.update_answer_and_score(...)
+            uow.examples.add_example(...)
+
+    Blok hatasız biterse commit, istisnada rollback yapılır; repository değişiklik
+    olayları (events.WordChanged) yalnızca commit başarılı olursa yayınlanır.
+    """
+
+    def __enter__(self) -> "UnitOfWork":
+        self.conn = get_conn()
+        # Yazma kilidini baştan al; okuma-sonra-yazma arasında başka yazar araya girmesin
+        self.conn.execute("BEGIN IMMEDIATE")
+        self.changes: list = []  # commit'ten sonra yayınlanır, rollback'te atılır
+        self.words = WordRepository(self.conn, self.changes)
+        self.examples = ExampleRepository(self.conn, self.changes)
+        self.exercises = ExerciseRepository(self.conn, self.changes)
+        self.schedule = ScheduleRepository(self.conn, self.changes)
+        self.sync = SyncRepository(self.conn, self.changes)
+        self.archive = ArchiveRepository(self.conn, self.changes)
+        self.regrade = RegradeRepository(self.conn, self.changes)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            if exc_type is None:
+                self.conn.commit()
+            else:
+                self.conn.rollback()
+                self.changes.clear()
+        finally:
+            self.conn.close()
+        events.publish(list(dict.fromkeys(self.changes)))  # aynı olay bir kez, commit başına tek yayın
@@ -0,0 +1,44 @@
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from ..models import ReviewCard
+
+MIN_EASE = 1.3
+RELEARN_MINUTES = 10  # başarısız tekrar aynı oturumda kısa süre sonra yeniden sorulur
+PASS_QUALITY = 3      # SM-2: q < 3 başarısız
+# AI puanı (0-10) -> SM-2 kalite notu (0-5), tekdüze artan: her not iki puanı kapsar, 5 yalnızca 10.
+# Geçme eşiği PASS_QUALITY = 3, yani puan >= 6; 5 ve altı kartı kısa tekrara döndürür.
+_QUALITY = (0, 0, 1, 1, 2, 2, 3, 3, 4, 4, 5)
+PASS_SCORE = _QUALITY.index(PASS_QUALITY)
+
+
+def utcnow() -> datetime:
+    # due_at SQLite CURRENT_TIMESTAMP ile karşılaştırılır: saniye hassasiyetinde, tz'siz UTC
+    return datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+
+
+def quality_from_score(score: int) -> int:
+    """AI puanı (0-10) -> SM-2 kalite notu (0-5); aralık dışı puan sınıra çekilir."""
+    return _QUALITY[max(0, min(10, int(score)))]
+
+
+def review(card: ReviewCard, score: int, now: Optional[datetime] = None) -> ReviewCard:
+    """
+    SM-2 adımı: puana göre kolaylık, aralık ve bir sonraki tekrar zamanı.
+    Kartın kendisi değişmez; güncellenmiş kopya döner.
+    """
+    now = now or utcnow()
+    q = quality_from_score(score)
+    ease = max(MIN_EASE, card.ease + 0.1 - (5 - q) * (0.08 + (5 - q) * 0.02))
+    if q < PASS_QUALITY:
+        return replace(card, ease=ease, interval_days=0.0, repetitions=0, lapses=card.lapses + 1,
+                       due_at=now + timedelta(minutes=RELEARN_MINUTES), last_reviewed_at=now)
+    reps = card.repetitions + 1
+    if reps == 1:
+        interval = 1.0
+    elif reps == 2:
+        interval = 6.0
+    else:
+        interval = round(max(card.interval_days, 1.0) * ease, 2)
+    return replace(card, ease=ease, interval_days=interval, repetitions=reps,
+                   due_at=now + timedelta(days=interval), last_reviewed_at=now)
@@ -0,0 +1,136 @@
+import bisect
+import math
+import re
+import unicodedata
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+_WS = re.compile(r"\s+")
+
+
+def normalize_term(term: str) -> str:
+    """Arama/tekillik anahtarı: NFKC + casefold + tek boşluk ('Run ' == 'run')."""
+    return _WS.sub(" ", unicodedata.normalize("NFKC", term or "").casefold()).strip()
+
+
+def _trigrams(norm: str) -> Set[str]:
+    padded = f"  {norm} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TermIndex:
+    """
+    Bellek içi terim indeksi: tam eşleşme (dict), önek (sıralı liste + bisect)
+    ve yazım hatalarına toleranslı bulanık eşleşme (trigram ters indeksi).
+    """
+
+    def __init__(self, items: Iterable[Tuple[int, str]] = ()):
+        self._by_id: Dict[int, str] = {}        # word_id -> görünen terim
+        self._norm_of: Dict[int, str] = {}      # word_id -> normalize terim
+        self._by_norm: Dict[str, int] = {}      # normalize terim -> word_id
+        self._sorted: List[Tuple[str, int]] = []  # (norm, id), önek araması için
+        self._grams: Dict[str, Set[int]] = {}
+        for word_id, term in items:
+            self._put(word_id, term)
+        self._sorted.sort()
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def _put(self, word_id: int, term: str, keep_sorted: bool = False) -> None:
+        norm = normalize_term(term)
+        self._by_id[word_id] = term
+        self._norm_of[word_id] = norm
+        self._by_norm.setdefault(norm, word_id)
+        if keep_sorted:
+            bisect.insort(self._sorted, (norm, word_id))
+        else:
+            self._sorted.append((norm, word_id))
+        for g in _trigrams(norm):
+            self._grams.setdefault(g, set()).add(word_id)
+
+    def add(self, word_id: int, term: str) -> None:
+        if self._by_id.get(word_id) == term:
+            return
+        if word_id in self._by_id:
+            self.remove(word_id)
+        self._put(word_id, term, keep_sorted=True)
+
+    def remove(self, word_id: int) -> None:
+        norm = self._norm_of.pop(word_id, None)
+        if norm is None:
+            return
+        self._by_id.pop(word_id, None)
+        if self._by_norm.get(norm) == word_id:
+            del self._by_norm[norm]
+        i = bisect.bisect_left(self._sorted, (norm, word_id))
+        if i < len(self._sorted) and self._sorted[i] == (norm, word_id):
+            del self._sorted[i]
+        for g in _trigrams(norm):
+            ids = self._grams.get(g)
+            if ids is not None:
+                ids.discard(word_id)
+                if not ids:
+                    del self._grams[g]
+
+    def exact(self, term: str) -> Optional[int]:
+        return self._by_norm.get(normalize_term(term))
+
+    def prefix(self, term: str, limit: int = 8) -> List[int]:
+        norm = normalize_term(term)
+        if not norm:
+            return []
+        out = []
+        i = bisect.bisect_left(self._sorted, (norm, -1))
+        while i < len(self._sorted) and len(out) < limit:
+            n, word_id = self._sorted[i]
+            if not n.startswith(norm):
+                break
+            out.append(word_id)
+            i += 1
+        return out
+
+    def suggest(self, term: str, limit: int = 8, min_similarity: float = 0.35) -> List[Tuple[int, str, float]]:
+        """
+        "Bunu mu demek istediniz / zaten var" önerileri: önce önek eşleşmeleri,
+        sonra trigram Dice benzerliğine göre sıralı bulanık eşleşmeler.
+        Dönüş: [(word_id, term_en, benzerlik 0..1)].
+        """
+        norm = normalize_term(term)
+        if not norm:
+            return []
+        out: List[Tuple[int, str, float]] = []
+        seen: Set[int] = set()
+        for word_id in self.prefix(norm, limit):
+            sim = 1.0 if self._norm_of[word_id] == norm else 0.9
+            out.append((word_id, self._by_id[word_id], sim))
+            seen.add(word_id)
+        if len(out) >= limit:
+            return out
+
+        qgrams = _trigrams(norm)
+        nq = len(qgrams)
+        # Eşiği geçen bir terim en az k trigram paylaşmalı (en kısa terim 2 trigram);
+        # güvercin yuvası: en nadir (nq - k + 1) trigram'dan biri mutlaka ortaktır,
+        # böylece en yaygın trigram'ların uzun listeleri hiç taranmaz.
+        k = max(1, math.ceil(min_similarity * (nq + 2) / 2))
+        postings = sorted((self._grams.get(g, ()) for g in qgrams), key=len)
+        split = max(1, nq - k + 1)
+        counts: Counter = Counter()
+        for ids in postings[:split]:
+            counts.update(ids)
+        rest = postings[split:]  # yaygın trigram'lar: yalnızca üyelik kontrolü
+        scored = []
+        for word_id, shared in counts.items():
+            if word_id in seen:
+                continue
+            for ids in rest:
+                if word_id in ids:
+                    shared += 1
+            sim = 2.0 * shared / (nq + len(self._norm_of[word_id]) + 1)
+            if sim >= min_similarity:
+                scored.append((sim, word_id))
+        scored.sort(reverse=True)
+        for sim, word_id in scored[:limit - len(out)]:
+            out.append((word_id, self._by_id[word_id], round(sim, 3)))
+        return out
@@ -1,11 +1,22 @@
 from __future__ import annotations
 import os
 
-try:
-    import deepl  # DeepL resmi SDK
-    _DEEPL_OK = True
-except Exception:
-    _DEEPL_OK = False
+from . import rate_limit
+
+DEEPL_BACKOFF = 5.0  # 429 sonrası tüm DeepL çağrılarının bekleme süresi (sn)
+
+deepl = None  # DeepL resmi SDK; ilk Translator kurulurken yüklenir (_load_deepl)
+
+
+def _load_deepl() -> bool:
+    global deepl
+    if deepl is None:
+        try:
+            import deepl as _deepl
+        except Exception:
+            return False
+        deepl = _deepl
+    return True
 
 class Translator:
     """
@@ -14,6 +25,7 @@ class Translator:
     Gerekli ortam değişkeni:
       - DEEPL_API_KEY: DeepL API anahtarın (Free veya Pro)
         * Free hesaplar için anahtar genelde "...:fx" ile biter.
+      - (Opsiyonel) DEEPL_SERVER_URL: API adresi (ör. yerel taklit sunucu)
     """
 
     def __init__(self, source: str = "en", target: str = "tr"):
@@ -22,14 +34,37 @@ class Translator:
         self.api_key = os.getenv("DEEPL_API_KEY")
         if not self.api_key:
             raise RuntimeError("DEEPL_API_KEY tanımlı değil. Lütfen ortam değişkenini ayarlayın.")
-        if not _DEEPL_OK:
+        if not _load_deepl():
             raise RuntimeError("deepl paketi yüklü değil. 'pip install deepl' ile kurun.")
-        self._client = deepl.Translator(self.api_key)
+        # DEEPL_SERVER_URL: yerel taklit sunucu (benchmarks/standins.py) veya vekil; boşsa anahtara göre Free/Pro
+        self._client = deepl.Translator(self.api_key, server_url=os.getenv("DEEPL_SERVER_URL") or None)
+        self.limiter = rate_limit.limiter(rate_limit.DEEPL)  # karakter kotası + istek hızı, süreçte ortak
+        self._usage_synced = False
+
+    def refresh_usage(self) -> bool:
+        """DeepL'in bildirdiği dönem kullanımını yerel sayaca yazar (faturalama dönemi takvim ayından kayabilir)."""
+        self._usage_synced = True  # çeviri başına değil, kurulumdan sonra bir kez (ya da CLI `usage --refresh`)
+        try:
+            usage = self._client.get_usage()
+        except Exception:
+            return False
+        ch = usage.character
+        if ch is None or not ch.valid:
+            return False
+        self.limiter.sync(ch.count, ch.limit)
+        return True
 
     def translate(self, text: str) -> str:
         text = (text or "").strip()
         if not text:
             return ""
+        if not self._usage_synced:
+            self.refresh_usage()
+        units = len(text)  # DeepL kaynak metnin karakterlerini sayar
+        try:
+            self.limiter.acquire(units)
+        except rate_limit.BudgetExceeded:
+            return "Çeviri yapılamadı: DeepL kota sınırı aşıldı."
         try:
             result = self._client.translate_text(
                 text,
@@ -38,8 +73,16 @@ class Translator:
             )
             return result.text
         except deepl.exceptions.AuthorizationException:
+            self.limiter.refund(units)
             return "Çeviri yapılamadı: DeepL yetkilendirme hatası (API anahtarı)."
         except deepl.exceptions.QuotaExceededException:
+            self.limiter.exhaust()
             return "Çeviri yapılamadı: DeepL kota sınırı aşıldı."
+        except deepl.exceptions.TooManyRequestsException:
+            # SDK kendi denemelerini bitirdi; sıradaki çağrılar da beklesin
+            self.limiter.refund(units)
+            self.limiter.backoff(DEEPL_BACKOFF)
+            return "Çeviri yapılamadı: DeepL istek sınırı aşıldı, biraz sonra tekrar deneyin."
         except Exception as e:
-            return f"Çeviri yapılamadı: {e}"
\ No newline at end of file
+            self.limiter.refund(units)
+            return f"Çeviri yapılamadı: {e}"
@@ -0,0 +1,63 @@
+import atexit
+import threading
+from typing import Dict, Optional
+from .repository import WordRepository, UPDATABLE_WORD_FIELDS
+
+
+class WriteBehindBuffer:
+    """
+    Notlar gibi küçük düzenlemeler için yazma tamponu.
+    Aynı kelimenin ardışık güncellemeleri birleştirilir (son değer kazanır);
+    flush() bekleyen her şeyi tek transaction'da yazar. Zamanlama (boşta kalma,
+    sekme kapatma, çıkış) çağıran tarafa aittir; atexit yalnızca son güvencedir.
+    """
+
+    def __init__(self, repo: Optional[WordRepository] = None, flush_at_exit: bool = True):
+        self.repo = repo or WordRepository()
+        self._pending: Dict[int, Dict[str, object]] = {}
+        self._lock = threading.Lock()
+        self._at_exit = flush_at_exit
+        if flush_at_exit:
+            atexit.register(self.flush)
+
+    def put(self, word_id: int, field: str, value) -> None:
+        if field not in UPDATABLE_WORD_FIELDS:
+            raise ValueError(f"buffered update not supported for field: {field}")
+        with self._lock:
+            self._pending.setdefault(word_id, {})[field] = value
+
+    def put_notes(self, word_id: int, notes: str) -> None:
+        self.put(word_id, "notes", notes)
+
+    def has_pending(self, word_id: Optional[int] = None) -> bool:
+        with self._lock:
+            return bool(self._pending) if word_id is None else word_id in self._pending
+
+    def flush(self, word_id: Optional[int] = None) -> int:
+        """Bekleyen güncellemeleri yazar (word_id verilirse sadece o kelimeninkileri)."""
+        with self._lock:
+            if word_id is None:
+                batch, self._pending = self._pending, {}
+            else:
+                fields = self._pending.pop(word_id, None)
+                batch = {word_id: fields} if fields else {}
+        if not batch:
+            return 0
+        try:
+            self.repo.apply_word_updates(batch)
+        except Exception:
+            # Yazılamayanları geri koy; bu arada gelen daha yeni değerleri ezme
+            with self._lock:
+                for wid, fields in batch.items():
+                    merged = dict(fields)
+                    merged.update(self._pending.get(wid, {}))
+                    self._pending[wid] = merged
+            raise
+        return len(batch)
+
+    def close(self) -> None:
+        """Bekleyenleri yazar ve atexit kaydını kaldırır; yazılamazsa kayıt son güvence olarak kalır."""
+        self.flush()
+        if self._at_exit:
+            atexit.unregister(self.flush)
+            self._at_exit = False
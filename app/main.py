@@ -6,4 +6,5 @@ if __name__ == "__main__":
     app = QApplication(sys.argv)
     win = MainWindow()
     win.show()
+    app.aboutToQuit.connect(win.flush_pending_writes)
     sys.exit(app.exec())
\ No newline at end of file
@@ -1,8 +1,15 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional
-from datetime import datetime
+from datetime import datetime, timezone
 
-@dataclass
+
+def _utcnow() -> datetime:
+    # SQLite CURRENT_TIMESTAMP ile aynı: saat dilimi bilgisi olmayan UTC
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+# slots=True: satır başına __dict__ yok; alan sırası repository'deki SELECT sütun sırasıyla aynı
+@dataclass(slots=True)
 class Word:
     id: Optional[int]
     term_en: str
@@ -11,9 +18,16 @@ class Word:
     group_title: Optional[str] = None  # Örn: "Book: Atomic Habits"
     is_learned: int = 0               # 0/1
     learned_at: Optional[datetime] = None
-    created_at: datetime = datetime.utcnow()
+    created_at: datetime = field(default_factory=_utcnow)
+    score_sum: int = 0                # skorlu örneklerin toplamı (trigger ile güncel)
+    score_count: int = 0
+    last_score: Optional[int] = None
 
-@dataclass
+    @property
+    def avg_score(self) -> float:
+        return self.score_sum / self.score_count if self.score_count else 0.0
+
+@dataclass(slots=True)
 class Example:
     id: Optional[int]
     word_id: int
@@ -23,9 +37,9 @@ class Example:
     score: Optional[int] = None
     feedback: str = ""
     exercise_id: Optional[int] = None
-    created_at: datetime = datetime.utcnow()
+    created_at: datetime = field(default_factory=_utcnow)
 
-@dataclass
+@dataclass(slots=True)
 class Exercise:
     id: Optional[int]
     word_id: int
@@ -36,4 +50,25 @@ class Exercise:
     user_answer: str = ""
     score: Optional[int] = None
     feedback: str = ""
-    created_at: datetime = datetime.utcnow()
\ No newline at end of file
+    created_at: datetime = field(default_factory=_utcnow)
+
+@dataclass(slots=True, frozen=True)
+class SearchHit:
+    kind: str                  # 'word' | 'example' | 'exercise'
+    ref_id: int                # words/examples/exercises.id
+    word_id: int
+    term_en: str
+    translation_tr: str
+    snippet: str               # eşleşen kısım, [köşeli] vurgulu
+    rank: float = 0.0          # bm25; küçük olan daha alakalı
+
+@dataclass(slots=True)
+class ReviewCard:
+    word_id: int
+    direction: str             # 'TR' | 'EN' (görev yönü)
+    ease: float = 2.5          # SM-2 kolaylık katsayısı (>= 1.3)
+    interval_days: float = 0.0
+    repetitions: int = 0       # art arda başarılı tekrar sayısı
+    lapses: int = 0
+    due_at: datetime = field(default_factory=_utcnow)
+    last_reviewed_at: Optional[datetime] = None
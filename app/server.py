@@ -0,0 +1,438 @@
+"""
+Yerel HTTP/JSON API: aynı kelime veritabanını betiklerden ve başka cihazlardan kullanmak için.
+
+    python -m app.server --port 8765                  # yalnızca bu makine
+    VOCAB_API_TOKEN=gizli python -m app.server --host 0.0.0.0
+
+asyncio üzerinde küçük bir HTTP/1.1 sunucusu (keep-alive); WordService çağrıları
+bağlantı havuzu kadar thread'li bir executor'da çalışır, SQLite bağlantıları
+database.ConnectionPool'dan gelir. VOCAB_API_TOKEN tanımlıysa her istek
+`Authorization: Bearer <token>` ister.
+
+Uç noktalar (liste yanıtları {"items": [...], "next": cursor|null}; limit 1..500, offset >= 0,
+aralık dışı değerler 400):
+    GET  /words?limit&after&group&learned&min_avg&max_avg      POST /words  (201 yeni, 200 mevcut)
+    POST /words/batch            {"words": [{term_en, translation_tr, group_title}]}
+    GET  /words/{id}             PATCH /words/{id}   {translation_tr|notes|group_title|is_learned}
+    GET  /words/{id}/examples?limit&after&min_score&max_score  POST /words/{id}/examples {text}
+    GET  /words/{id}/exercises?limit&after&direction&answered  POST /words/{id}/exercises {direction}
+    GET  /exercises/{id}         POST /exercises/{id}/grade {answer}
+    GET  /search?q&limit&offset  GET /review/due?limit         GET /stats?days&group&direction
+    GET  /usage                  (DeepL/OpenRouter dönem kullanımı ve kalan kota)
+    POST /batch                  {"requests": [{method, path, body}]}  (sırayla, tek HTTP turunda)
+    GET  /sync/status            GET /sync/changes?peer&since        POST /sync/apply  (delta paketi)
+"""
+import argparse
+import asyncio
+import base64
+import hmac
+import json
+import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import fields, is_dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from .core import database, rate_limit
+from .core.repository import UPDATABLE_WORD_FIELDS
+from .services.word_service import WordService
+from .services.sync_service import SyncService
+
+MAX_BODY = 4 * 1024 * 1024
+MAX_PAGE = 500
+MAX_BATCH = 200
+_REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 401: "Unauthorized", 404: "Not Found",
+            405: "Method Not Allowed", 413: "Payload Too Large", 500: "Internal Server Error",
+            503: "Service Unavailable"}
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+# ---- serialization ----
+def to_json(obj: Any) -> Any:
+    if is_dataclass(obj):
+        return {f.name: to_json(getattr(obj, f.name)) for f in fields(obj)}
+    if isinstance(obj, datetime):
+        return obj.isoformat(sep=" ")
+    if isinstance(obj, (list, tuple)):
+        return [to_json(v) for v in obj]
+    if hasattr(obj, "tolist"):  # numpy dizileri
+        return obj.tolist()
+    return obj
+
+
+def encode_cursor(cursor) -> Optional[str]:
+    if cursor is None:
+        return None
+    return base64.urlsafe_b64encode(json.dumps(list(cursor)).encode()).decode().rstrip("=")
+
+
+def decode_cursor(text: Optional[str]):
+    if not text:
+        return None
+    try:
+        ts, row_id = json.loads(base64.urlsafe_b64decode(text + "=" * (-len(text) % 4)))
+        return ts, int(row_id)
+    except Exception:
+        raise HttpError(400, "geçersiz cursor")
+
+
+def _page(items, cursor) -> dict:
+    return {"items": to_json(items), "next": encode_cursor(cursor)}
+
+
+# ---- query helpers ----
+def _q(query: Dict[str, List[str]], name: str, default=None):
+    vals = query.get(name)
+    return vals[-1] if vals else default
+
+
+def _q_int(query, name: str, default: Optional[int] = None, maximum: Optional[int] = None,
+           minimum: Optional[int] = None) -> Optional[int]:
+    raw = _q(query, name)
+    if raw is None:
+        return default
+    try:
+        v = int(raw)
+    except ValueError:
+        raise HttpError(400, f"{name} tamsayı olmalı")
+    if (minimum is not None and v < minimum) or (maximum is not None and v > maximum):
+        low = "" if minimum is None else f"{minimum} <= "
+        high = "" if maximum is None else f" <= {maximum}"
+        raise HttpError(400, f"{low}{name}{high} olmalı")
+    return v
+
+
+def _q_limit(query, default: int) -> int:
+    return _q_int(query, "limit", default, MAX_PAGE, minimum=1)
+
+
+def _q_float(query, name: str) -> Optional[float]:
+    raw = _q(query, name)
+    if raw is None:
+        return None
+    try:
+        return float(raw)
+    except ValueError:
+        raise HttpError(400, f"{name} sayı olmalı")
+
+
+def _q_bool(query, name: str) -> Optional[bool]:
+    raw = _q(query, name)
+    if raw is None:
+        return None
+    return raw.lower() in ("1", "true", "yes", "evet")
+
+
+def _drop_none(**kw) -> dict:
+    return {k: v for k, v in kw.items() if v is not None}
+
+
+def _body_str(body: dict, name: str, required: bool = True) -> Optional[str]:
+    v = body.get(name)
+    if v is None or (isinstance(v, str) and not v.strip()):
+        if required:
+            raise HttpError(400, f"'{name}' gerekli")
+        return None
+    if not isinstance(v, str):
+        raise HttpError(400, f"'{name}' metin olmalı")
+    return v.strip()
+
+
+# ---- API (senkron; executor thread'lerinde çalışır) ----
+class Api:
+    """Rota tablosu ve WordService'e bağlanan işleyiciler; HTTP'den bağımsız, /batch da bunu kullanır."""
+
+    def __init__(self, service: WordService, sync: Optional[SyncService] = None):
+        self.service = service
+        self.sync = sync or SyncService()
+        route = [
+            ("GET", r"/words", self.list_words),
+            ("POST", r"/words", self.add_word),
+            ("POST", r"/words/batch", self.add_words),
+            ("GET", r"/words/(\d+)", self.get_word),
+            ("PATCH", r"/words/(\d+)", self.update_word),
+            ("GET", r"/words/(\d+)/examples", self.list_examples),
+            ("POST", r"/words/(\d+)/examples", self.add_example),
+            ("GET", r"/words/(\d+)/exercises", self.list_exercises),
+            ("POST", r"/words/(\d+)/exercises", self.generate_exercise),
+            ("GET", r"/exercises/(\d+)", self.get_exercise),
+            ("POST", r"/exercises/(\d+)/grade", self.grade_exercise),
+            ("GET", r"/search", self.search),
+            ("GET", r"/review/due", self.due_cards),
+            ("GET", r"/stats", self.stats),
+            ("GET", r"/usage", self.usage),
+            ("GET", r"/sync/status", self.sync_status),
+            ("GET", r"/sync/changes", self.sync_changes),
+            ("POST", r"/sync/apply", self.sync_apply),
+        ]
+        self.routes: List[Tuple[str, "re.Pattern", Callable]] = [
+            (m, re.compile(p + r"/?\Z"), fn) for m, p, fn in route
+        ]
+
+    def dispatch(self, method: str, target: str, body: Any) -> Tuple[int, Any]:
+        parts = urlsplit(target)
+        query = parse_qs(parts.query)
+        allowed = False
+        for m, pattern, fn in self.routes:
+            match = pattern.match(parts.path)
+            if not match:
+                continue
+            if m != method:
+                allowed = True
+                continue
+            args = [int(g) for g in match.groups()]
+            return fn(*args, query=query, body=body if isinstance(body, dict) else {})
+        raise HttpError(405 if allowed else 404, f"{method} {parts.path} yok")
+
+    # words
+    def list_words(self, query, body):
+        items, cursor = self.service.list_words_page(
+            limit=_q_limit(query, 50), after=decode_cursor(_q(query, "after")),
+            **_drop_none(group_title=_q(query, "group"), learned=_q_bool(query, "learned"),
+                         min_avg=_q_float(query, "min_avg"), max_avg=_q_float(query, "max_avg")))
+        return 200, _page(items, cursor)
+
+    def add_word(self, query, body):
+        w, status = self.service.upsert_word(_body_str(body, "term_en"), _body_str(body, "translation_tr"),
+                                             _body_str(body, "group_title", required=False))
+        return (201 if status == "created" else 200), to_json(w)
+
+    def add_words(self, query, body):
+        words = body.get("words")
+        if not isinstance(words, list):
+            raise HttpError(400, "'words' listesi gerekli")
+        rows = [(w.get("term_en"), w.get("translation_tr"), w.get("group_title"))
+                for w in words if isinstance(w, dict)]
+        created, updated, unchanged = self.service.import_words(rows)
+        return 200, {"created": created, "updated": updated, "unchanged": unchanged}
+
+    def _word_or_404(self, word_id: int):
+        w = self.service.repo.get_word(word_id)
+        if w is None:
+            raise HttpError(404, "kelime bulunamadı")
+        return w
+
+    def get_word(self, word_id, query, body):
+        return 200, to_json(self._word_or_404(word_id))
+
+    def update_word(self, word_id, query, body):
+        self._word_or_404(word_id)
+        changes = {k: v for k, v in body.items() if k in UPDATABLE_WORD_FIELDS}
+        if "is_learned" in body:
+            self.service.set_learned(word_id, bool(body["is_learned"]))
+        if changes:
+            self.service.repo.update_fields(word_id, changes)
+        return 200, to_json(self._word_or_404(word_id))
+
+    # examples / exercises
+    def list_examples(self, word_id, query, body):
+        items, cursor = self.service.list_examples_page(
+            word_id, limit=_q_limit(query, 50), after=decode_cursor(_q(query, "after")),
+            **_drop_none(min_score=_q_int(query, "min_score"), max_score=_q_int(query, "max_score")))
+        return 200, _page(items, cursor)
+
+    def add_example(self, word_id, query, body):
+        self._word_or_404(word_id)
+        return 201, {"id": self.service.add_example_manual(word_id, _body_str(body, "text"))}
+
+    def list_exercises(self, word_id, query, body):
+        items, cursor = self.service.list_exercises_page(
+            word_id, limit=_q_limit(query, 50), after=decode_cursor(_q(query, "after")),
+            **_drop_none(direction=_q(query, "direction"), answered=_q_bool(query, "answered"),
+                         min_score=_q_int(query, "min_score"), max_score=_q_int(query, "max_score")))
+        return 200, _page(items, cursor)
+
+    def generate_exercise(self, word_id, query, body):
+        direction = (body.get("direction") or "TR").upper()
+        if direction not in ("TR", "EN"):
+            raise HttpError(400, "direction 'TR' veya 'EN' olmalı")
+        self._word_or_404(word_id)
+        ex_id = (self.service.create_exercise_tr if direction == "TR" else self.service.create_exercise_en)(word_id)
+        return 201, to_json(self.service.get_exercise(ex_id))
+
+    def _exercise_or_404(self, ex_id: int):
+        ex = self.service.get_exercise(ex_id)
+        if ex is None:
+            raise HttpError(404, "görev bulunamadı")
+        return ex
+
+    def get_exercise(self, ex_id, query, body):
+        return 200, to_json(self._exercise_or_404(ex_id))
+
+    def grade_exercise(self, ex_id, query, body):
+        self._exercise_or_404(ex_id)
+        score, feedback = self.service.evaluate_exercise(ex_id, _body_str(body, "answer"))
+        return 200, {"exercise_id": ex_id, "score": score, "feedback": feedback}
+
+    # misc
+    def search(self, query, body):
+        hits = self.service.search(_q(query, "q", ""), limit=_q_limit(query, 20),
+                                   offset=_q_int(query, "offset", 0, minimum=0))
+        return 200, {"items": to_json(hits)}
+
+    def due_cards(self, query, body):
+        return 200, {"items": to_json(self.service.due_cards(limit=_q_limit(query, 20)))}
+
+    def stats(self, query, body):
+        series = self.service.progress(days=_q_int(query, "days", 365, 3660, minimum=1),
+                                       group_title=_q(query, "group"), direction=_q(query, "direction"))
+        lib = self.service.library
+        return 200, {"words": len(lib), "learned_total": lib.learned_count, "due": self.service.count_due(),
+                     "from": series.days[0], "to": series.days[-1], **series.totals,
+                     "score_histogram": to_json(series.histogram)}
+
+    def usage(self, query, body):
+        return 200, {"items": rate_limit.status()}
+
+    # sync
+    def sync_status(self, query, body):
+        return 200, self.sync.status()
+
+    def sync_changes(self, query, body):
+        return 200, self.sync.export_delta(since=_q_int(query, "since", minimum=0), peer=_q(query, "peer"))
+
+    def sync_apply(self, query, body):
+        return 200, self.sync.apply_delta(body)
+
+
+def call(api: Api, method: str, target: str, body: Any) -> Tuple[int, Any]:
+    """Tek isteği işler; hataları JSON yanıta çevirir."""
+    try:
+        return api.dispatch(method, target, body)
+    except HttpError as e:
+        return e.status, {"error": str(e)}
+    except ValueError as e:  # servis doğrulaması; bulunamayanlar işleyicilerde HttpError(404)
+        return 400, {"error": str(e)}
+    except RuntimeError as e:  # eksik API anahtarı, AI hatası
+        return 503, {"error": str(e)}
+    except Exception as e:
+        return 500, {"error": f"{type(e).__name__}: {e}"}
+
+
+def run_batch(api: Api, body: Any) -> Tuple[int, Any]:
+    reqs = body.get("requests") if isinstance(body, dict) else None
+    if not isinstance(reqs, list) or len(reqs) > MAX_BATCH:
+        return 400, {"error": f"'requests' listesi gerekli (en fazla {MAX_BATCH})"}
+    out = []
+    for r in reqs:
+        if not isinstance(r, dict) or not r.get("path"):
+            out.append({"status": 400, "body": {"error": "method/path gerekli"}})
+            continue
+        status, payload = call(api, str(r.get("method", "GET")).upper(), r["path"], r.get("body") or {})
+        out.append({"status": status, "body": payload})
+    return 200, {"responses": out}
+
+
+# ---- HTTP ----
+class Server:
+    def __init__(self, service: WordService, workers: int = 8, token: Optional[str] = None):
+        self.api = Api(service)
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="api")
+        self.token = token
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = lines[0].split(" ", 2)
+                except ValueError:
+                    await self._send(writer, 400, {"error": "bozuk istek satırı"}, False)
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    if ":" in line:
+                        k, v = line.split(":", 1)
+                        headers[k.strip().lower()] = v.strip()
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                try:
+                    length = int(headers.get("content-length") or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await self._send(writer, 400, {"error": "geçersiz Content-Length"}, False)
+                    break
+                if length > MAX_BODY:
+                    await self._send(writer, 413, {"error": "gövde çok büyük"}, False)
+                    break
+                try:
+                    raw = await reader.readexactly(length) if length else b""
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break  # istemci gövdeyi bitirmeden bağlantıyı kapattı
+                status, payload = await self._respond(method.upper(), target, headers, raw)
+                await self._send(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+
+    async def _respond(self, method: str, target: str, headers: dict, raw: bytes) -> Tuple[int, Any]:
+        if self.token and not hmac.compare_digest(headers.get("authorization", "").encode("latin-1"),
+                                                  f"Bearer {self.token}".encode("utf-8")):
+            return 401, {"error": "yetkisiz"}
+        try:
+            body = json.loads(raw) if raw else {}
+        except ValueError:
+            return 400, {"error": "geçersiz JSON"}
+        loop = asyncio.get_running_loop()
+        if method == "POST" and urlsplit(target).path.rstrip("/") == "/batch":
+            return await loop.run_in_executor(self.executor, run_batch, self.api, body)
+        return await loop.run_in_executor(self.executor, call, self.api, method, target, body)
+
+    @staticmethod
+    async def _send(writer: asyncio.StreamWriter, status: int, payload: Any, keep_alive: bool) -> None:
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        head = (f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+                f"Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(data)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + data)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+    async def serve(self, host: str, port: int) -> None:
+        server = await asyncio.start_server(self.handle, host, port)
+        addrs = ", ".join(str(s.getsockname()) for s in server.sockets)
+        print(f"dinleniyor: {addrs}", file=sys.stderr)
+        async with server:
+            await server.serve_forever()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    p = argparse.ArgumentParser(prog="python -m app.server", description="Kelime kütüphanesi HTTP/JSON API")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8765)
+    p.add_argument("--db", help=f"SQLite dosyası (varsayılan: {database.DB_PATH})")
+    p.add_argument("--workers", type=int, default=8, help="executor thread'i = havuzdaki bağlantı sayısı")
+    args = p.parse_args(argv)
+    if args.db:
+        database.DB_PATH = Path(args.db)
+    database.enable_pool(args.workers)
+    server = Server(WordService(), workers=args.workers, token=os.getenv("VOCAB_API_TOKEN") or None)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.executor.shutdown(wait=True)
+        database.disable_pool()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
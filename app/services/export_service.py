@@ -0,0 +1,101 @@
+"""
+Akışlı dışa aktarma (JSONL / CSV / Anki) ve çevrim içi yedek.
+
+Kelimeler ExportRepository'den sayfa sayfa gelir ve doğrudan dosyaya yazılır; 100k
+kelimelik kütüphanede de bellekte yalnızca bir sayfa (kelime + örnekleri) durur.
+
+    with open("words.jsonl", "w", encoding="utf-8") as fh:
+        ExportService().export(fh, "jsonl")
+"""
+import csv
+import html
+import json
+from typing import Callable, Iterator, Optional, TextIO
+
+from ..core import database
+from ..core.repository import ExportRepository, EXPORT_WORD_FIELDS
+
+EXPORT_FORMATS = ("jsonl", "csv", "anki")
+EXPORT_BATCH_SIZE = 500     # sayfa başına kelime (örnekler tek IN sorgusunda)
+PROGRESS_EVERY = 1000       # progress(n) bu kadar kelimede bir çağrılır
+ANKI_DECK = "EN-TR Vocabulary"
+
+
+def _tag(group_title: Optional[str]) -> str:
+    # Anki etiketleri boşluk içeremez
+    return "_".join((group_title or "").split())
+
+
+def _html(text: Optional[str]) -> str:
+    return html.escape(text or "").replace("\t", " ").replace("\n", "<br>")
+
+
+def write_jsonl(records: Iterator[dict], fh: TextIO) -> Iterator[int]:
+    for n, rec in enumerate(records, 1):
+        fh.write(json.dumps(rec, ensure_ascii=False) + "\n")
+        yield n
+
+
+def write_csv(records: Iterator[dict], fh: TextIO) -> Iterator[int]:
+    """Kelime başına bir satır; örnek cümleler `examples` sütununda alt alta."""
+    writer = csv.writer(fh)
+    header = list(EXPORT_WORD_FIELDS)
+    for n, rec in enumerate(records, 1):
+        if n == 1:
+            if "examples" in rec:
+                header.append("examples")
+            writer.writerow(header)
+        row = [rec[f] for f in EXPORT_WORD_FIELDS]
+        if "examples" in rec:
+            row.append("\n".join(e["text"] for e in rec["examples"]))
+        writer.writerow(row)
+        yield n
+
+
+def write_anki(records: Iterator[dict], fh: TextIO, deck: str = ANKI_DECK) -> Iterator[int]:
+    """
+    Anki'nin metin içe aktarma biçimi (Dosya > İçe Aktar): ön yüz EN terim, arka yüz TR
+    karşılık + notlar + örnek cümleler, grup başlığı etiket olur.
+    """
+    fh.write(f"#separator:tab\n#html:true\n#notetype:Basic\n#deck:{deck}\n#tags column:3\n")
+    for n, rec in enumerate(records, 1):
+        back = [f"<b>{_html(rec['translation_tr'])}</b>"]
+        if rec.get("notes"):
+            back.append(_html(rec["notes"]))
+        examples = [f"<i>{_html(e['text'])}</i>" for e in rec.get("examples", ())]
+        if examples:
+            back.append("<br>".join(examples))
+        fh.write(f"{_html(rec['term_en'])}\t{'<br><br>'.join(back)}\t{_tag(rec['group_title'])}\n")
+        yield n
+
+
+_WRITERS = {"jsonl": write_jsonl, "csv": write_csv, "anki": write_anki}
+
+
+class ExportService:
+    def __init__(self, repo: Optional[ExportRepository] = None):
+        self.repo = repo or ExportRepository()
+
+    def records(self, examples: bool = True, **filters) -> Iterator[dict]:
+        return self.repo.iter_words_with_examples(EXPORT_BATCH_SIZE, examples=examples, **filters)
+
+    def export(self, fh: TextIO, fmt: str = "jsonl", examples: bool = True,
+               progress: Optional[Callable[[int], None]] = None, **filters) -> int:
+        """
+        Kütüphaneyi `fh`'ye yazar, yazılan kelime sayısını döner. filters: group_title, learned.
+        UI'da bir worker thread'inden çağrılır; progress(n) o thread'de çalışır.
+        """
+        if fmt not in _WRITERS:
+            raise ValueError(f"bilinmeyen biçim: {fmt} ({', '.join(EXPORT_FORMATS)})")
+        n = 0
+        for n in _WRITERS[fmt](self.records(examples, **filters), fh):
+            if progress and n % PROGRESS_EVERY == 0:
+                progress(n)
+        if progress:
+            progress(n)
+        return n
+
+    @staticmethod
+    def backup(dest, pages: int = database.BACKUP_PAGES,
+               progress: Optional[Callable[[int, int], None]] = None):
+        return database.backup(dest, pages=pages, progress=progress)
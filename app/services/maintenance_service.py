@@ -0,0 +1,210 @@
+"""
+Soğuk arşiv ve veritabanı bakımı.
+
+archive(): öğrenilmiş kelimelerin `days` günden eski örnek ve görevleri sıcak tablolardan
+archive_batches'e taşınır (ardışık kelimeler bir pakette, zlib ile sıkıştırılmış JSON).
+Silme 'archiving' bayrağı açıkken yapılır: kelime puan toplamları, günlük istatistikler
+ve eşitleme günlüğü değişmez; yalnızca arama indeksinden çıkarlar. Satırlar archived_rows'ta
+uid ile dizinlenir: başka kopyadan gelen güncelleme/silme arşivdeki kopyaya uygulanır
+(update_archived), satır sıcak tabloya geri eklenmez.
+
+run_due(): her işi kendi aralığıyla çalıştırır (son çalışma app_flags'te), cron'da
+`python -m app.cli maintain`. Uygulama açılışından bir süre sonra arka planda yalnızca
+PRAGMA işleri çalışır; arşiv orada VOCAB_AUTO_ARCHIVE=1 ile açılır.
+"""
+import json
+import zlib
+from datetime import timedelta
+from typing import Dict, List, Optional, Tuple
+
+from ..core.repository import (
+    ArchiveRepository, MaintenanceRepository, SyncRepository, UnitOfWork,
+    ARCHIVE_EXAMPLE_FIELDS, ARCHIVE_EXERCISE_FIELDS
+)
+from ..core.scheduler import utcnow
+
+ARCHIVE_AFTER_DAYS = 180   # öğrenilmiş kelimede bu kadar eski örnek/görev arşive
+ARCHIVE_BATCH_ROWS = 2000  # paket (ve yazma transaction'ı) başına hedef satır
+ARCHIVING_FLAG = "archiving"
+ZLIB_LEVEL = 9             # arşiv bir kez yazılır, nadiren okunur
+
+# İş -> en az kaç günde bir; "optimize" her çalıştırmada (ucuz, yalnızca gerekeni analiz eder).
+# Sıra önemli: arşiv ve FTS birleştirme sayfa boşaltır, vacuum onları geri verir, ANALYZE son hali görür.
+JOB_INTERVALS = {"archive": 1, "search": 7, "vacuum": 1, "analyze": 7, "optimize": 0}
+JOBS = tuple(JOB_INTERVALS)
+_TS_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def pack_rows(examples: List[tuple], exercises: List[tuple]) -> Tuple[bytes, int]:
+    """(zlib paket, sıkıştırılmamış bayt)"""
+    raw = json.dumps({"examples": [list(r) for r in examples], "exercises": [list(r) for r in exercises]},
+                     ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return zlib.compress(raw, ZLIB_LEVEL), len(raw)
+
+
+def unpack_rows(payload: bytes) -> Dict[str, List[dict]]:
+    data = json.loads(zlib.decompress(payload))
+    return {
+        "examples": [dict(zip(ARCHIVE_EXAMPLE_FIELDS, r)) for r in data["examples"]],
+        "exercises": [dict(zip(ARCHIVE_EXERCISE_FIELDS, r)) for r in data["exercises"]],
+    }
+
+
+def update_archived(archive: ArchiveRepository, entity: str, uid: str, changes: Optional[dict]) -> bool:
+    """
+    Arşivdeki tek örnek/görevi yerinde günceller (changes None: siler); satır sıcak tabloya
+    dönmez. Paket ve özet sütunları yeniden yazılır, kelime puanını archived_rows trigger'ları
+    düzeltir. Satır arşivde değilse False.
+    """
+    found = archive.locate(entity, uid)
+    if found is None:
+        return False
+    batch_id, payload = found
+    data = json.loads(zlib.decompress(payload))
+    kind, fields = ("examples", ARCHIVE_EXAMPLE_FIELDS) if entity == "example" \
+        else ("exercises", ARCHIVE_EXERCISE_FIELDS)
+    rows, row = data[kind], None
+    for i, r in enumerate(rows):
+        if r[fields.index("uid")] != uid:
+            continue
+        if changes is None:
+            del rows[i]
+        else:
+            row = r + [None] * (len(fields) - len(r))  # eski paketlerde sonradan eklenen alanlar yok
+            for f, v in changes.items():
+                if f in fields:
+                    row[fields.index(f)] = v
+            rows[i] = row
+        break
+    packed, raw_bytes = pack_rows(data["examples"], data["exercises"])
+    scores = [s for s in (r[ARCHIVE_EXAMPLE_FIELDS.index("score")] for r in data["examples"]) if s is not None]
+    archive.rewrite_batch(batch_id, len(data["examples"]), len(data["exercises"]), len(scores), sum(scores),
+                          raw_bytes, packed)
+    archive.update_row(entity, uid, fields, row)
+    return True
+
+
+def _group(candidates: List[Tuple[int, int]], limit: int) -> List[List[int]]:
+    """Ardışık kelimeleri toplam satır `limit`'i geçmeyecek gruplara böler (tek kelime büyükse kendi grubu)."""
+    groups, current, n = [], [], 0
+    for word_id, rows in candidates:
+        if current and n + rows > limit:
+            groups.append(current)
+            current, n = [], 0
+        current.append(word_id)
+        n += rows
+    if current:
+        groups.append(current)
+    return groups
+
+
+class MaintenanceService:
+    def __init__(self, archive: Optional[ArchiveRepository] = None,
+                 maintenance: Optional[MaintenanceRepository] = None,
+                 flags: Optional[SyncRepository] = None):
+        self.archive_repo = archive or ArchiveRepository()
+        self.repo = maintenance or MaintenanceRepository()
+        self.flags = flags or SyncRepository()
+        self.uow = UnitOfWork
+
+    # ---- archive ----
+    def archive(self, days: int = ARCHIVE_AFTER_DAYS, dry_run: bool = False) -> Dict[str, int]:
+        cutoff = (utcnow() - timedelta(days=days)).strftime(_TS_FORMAT)
+        stats = {"words": 0, "examples": 0, "exercises": 0, "batches": 0, "raw_bytes": 0, "packed_bytes": 0}
+        after = 0
+        while True:
+            candidates = self.archive_repo.candidates(cutoff, after)
+            if not candidates:
+                return stats
+            after = candidates[-1][0]
+            if dry_run:
+                stats["words"] += len(candidates)
+                stats["examples"] += sum(n for _, n in candidates)  # örnek + görev
+                continue
+            for word_ids in _group(candidates, ARCHIVE_BATCH_ROWS):
+                self._archive_words(word_ids, cutoff, stats)
+
+    def _archive_words(self, word_ids: List[int], cutoff: str, stats: Dict[str, int]) -> None:
+        # Paket başına bir transaction: yazma kilidi kısa kalır, UI yazmaları beklemez
+        with self.uow() as uow:
+            examples, exercises = uow.archive.old_rows(word_ids, cutoff)
+            if not examples and not exercises:
+                return  # bu arada başka bağlantı silmiş
+            payload, raw_bytes = pack_rows(examples, exercises)
+            scores = [r[ARCHIVE_EXAMPLE_FIELDS.index("score")] for r in examples]
+            scores = [s for s in scores if s is not None]
+            stamps = ([r[ARCHIVE_EXAMPLE_FIELDS.index("created_at")] for r in examples]
+                      + [r[ARCHIVE_EXERCISE_FIELDS.index("created_at")] for r in exercises])
+            batch_id = uow.archive.add_batch(
+                word_ids[0], word_ids[-1], len(word_ids), len(examples), len(exercises),
+                len(scores), sum(scores), min(stamps), max(stamps), raw_bytes, payload,
+            )
+            uow.archive.index_rows(batch_id, examples, exercises)
+            uow.sync.set_flag(ARCHIVING_FLAG, "1")  # yalnızca bu transaction'da görünür
+            uow.archive.delete_rows([r[0] for r in examples], [r[0] for r in exercises])
+            uow.sync.set_flag(ARCHIVING_FLAG, None)
+        stats["words"] += len(word_ids)
+        stats["examples"] += len(examples)
+        stats["exercises"] += len(exercises)
+        stats["batches"] += 1
+        stats["raw_bytes"] += raw_bytes
+        stats["packed_bytes"] += len(payload)
+
+    def archived(self, word_id: int) -> Dict[str, List[dict]]:
+        """Kelimenin arşivdeki örnek ve görevleri (eskiden yeniye)."""
+        out: Dict[str, List[dict]] = {"examples": [], "exercises": []}
+        for payload in self.archive_repo.payloads_for_word(word_id):
+            rows = unpack_rows(payload)
+            for kind in out:
+                out[kind].extend(r for r in rows[kind] if r["word_id"] == word_id)
+        return out
+
+    def archived_counts(self, word_id: int) -> Dict[str, int]:
+        return self.archive_repo.counts_for_word(word_id)
+
+    def summary(self) -> dict:
+        return {**self.archive_repo.summary(), **self.repo.page_stats()}
+
+    # ---- maintenance ----
+    def vacuum(self, full: bool = False) -> int:
+        """Boş sayfaları geri verir; geri verilen sayfa sayısı. full: tam VACUUM (eski DB'leri de dönüştürür)."""
+        before = self.repo.page_stats()
+        if full:
+            self.repo.vacuum()
+            return max(0, before["page_count"] - self.repo.page_stats()["page_count"])
+        if before["auto_vacuum"] != 2:
+            return 0  # auto_vacuum=NONE (eski DB): yalnızca `maintain --full-vacuum` ile
+        return self.repo.incremental_vacuum()
+
+    def run(self, jobs=JOBS, days: int = ARCHIVE_AFTER_DAYS, full_vacuum: bool = False) -> Dict[str, object]:
+        results: Dict[str, object] = {}
+        for job in JOBS:  # sabit sıra (JOB_INTERVALS)
+            if job not in jobs:
+                continue
+            if job == "archive":
+                results[job] = self.archive(days)
+            elif job == "vacuum":
+                results[job] = self.vacuum(full_vacuum)
+            elif job == "analyze":
+                self.repo.analyze()
+                results[job] = True
+            elif job == "search":
+                results[job] = self.repo.optimize_search()
+            else:
+                self.repo.optimize()
+                results[job] = True
+            self.flags.set_flag(f"maint:{job}", utcnow().strftime(_TS_FORMAT))
+        return results
+
+    def due_jobs(self) -> List[str]:
+        now = utcnow()
+        due = []
+        for job, every in JOB_INTERVALS.items():
+            last = self.flags.get_flag(f"maint:{job}")
+            if not every or last is None or last <= (now - timedelta(days=every)).strftime(_TS_FORMAT):
+                due.append(job)
+        return due
+
+    def run_due(self, days: int = ARCHIVE_AFTER_DAYS, jobs=JOBS) -> Dict[str, object]:
+        """Vadesi gelen işler; jobs ile sınırlanabilir (arayüz arşivi yalnızca istenirse çalıştırır)."""
+        return self.run([j for j in self.due_jobs() if j in jobs], days)
@@ -0,0 +1,123 @@
+"""
+Geçmiş cevapları toplu yeniden puanlama (model değişince puanlar karşılaştırılabilir olsun).
+
+Puanlı görev cevapları (examples) id sırasıyla sayfa sayfa okunur; her sayfa sınırlı
+sayıda thread'le, ortak OpenRouter limiter'ından BULK öncelikle geçerek AI'a gönderilir, sonuçlar sayfa başına tek
+transaction'da kontrol noktasıyla birlikte yazılır (kelime toplamları ve istatistikler
+trigger'larla güncellenir). Süreç yarıda kalırsa aynı modelle yeniden çalıştırmak son
+kontrol noktasından devam eder. Hata alan cevapların grader_model'i değişmez; bir
+sonraki işte yeniden denenir.
+
+Arşivlenmiş cevaplar (maintenance_service) yeniden puanlanmaz ama puanları kelime
+ortalamalarında kalır; status()["archived"] bunları modele göre sayar.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional
+
+from ..core import rate_limit
+from ..core.ai_client import AIClient
+from ..core.repository import RegradeRepository, UnitOfWork
+
+REGRADE_BATCH_SIZE = 50    # kontrol noktası / yazma transaction'ı başına cevap
+REGRADE_CONCURRENCY = 4    # aynı anda bekleyen AI isteği; hız OpenRouter limiter'ında (BULK öncelik)
+_SKIPPED = object()        # durdurma istendiği için gönderilmedi
+
+
+class RegradeService:
+    def __init__(self, ai: Optional[AIClient] = None, model: Optional[str] = None,
+                 repo: Optional[RegradeRepository] = None):
+        self._ai = ai
+        self._model = model
+        self.repo = repo or RegradeRepository()
+        self.uow = UnitOfWork
+        self.stop_event = threading.Event()  # set(): sayfa bitince dur (kontrol noktası korunur)
+        self.last_error: Optional[str] = None
+
+    @property
+    def ai(self) -> AIClient:
+        if self._ai is None:
+            self._ai = AIClient()
+            if self._model:
+                self._ai.model = self._model
+            # Tek model: fallback'e düşen puan yine karşılaştırılamaz olurdu
+            self._ai.fallback_model = None
+        return self._ai
+
+    @property
+    def model(self) -> str:
+        return self._model or self.ai.model
+
+    def status(self) -> dict:
+        return {
+            "jobs": self.repo.list_jobs(),
+            "by_model": [{"model": m, "count": n, "avg": round(avg, 2)} for m, n, avg in self.repo.scores_by_model()],
+            "archived": [{"model": m, "count": n, "avg": round(avg, 2)}
+                         for m, n, avg in self.repo.archived_scores_by_model()],
+        }
+
+    def archived_other_models(self, model: Optional[str] = None) -> int:
+        """Arşivde `model` dışındaki modellerin verdiği puan sayısı (ortalamalarda kalır, yeniden puanlanmaz)."""
+        model = model or self.model
+        return sum(n for m, n, _avg in self.repo.archived_scores_by_model() if m != model)
+
+    def run(self, batch_size: int = REGRADE_BATCH_SIZE, concurrency: int = REGRADE_CONCURRENCY,
+            restart: bool = False,
+            progress: Optional[Callable[[dict], None]] = None) -> dict:
+        """İşi başlatır ya da (restart değilse) aynı modelin yarım kalan işine devam eder; son iş durumunu döner."""
+        model = self.model
+        job = None if restart else self.repo.open_job(model)
+        if job is None:
+            job = self.repo.create_job(model, self.repo.count_pending(model))
+        after = job["last_example_id"]
+
+        def grade(row: tuple):
+            if self.stop_event.is_set():
+                return _SKIPPED
+            _id, _exercise_id, _word_id, direction, sentence, answer, _score = row
+            try:
+                # Hız ve kota tek yerde: etkileşimli çağrılar önce geçer, stop_event bekleyişi keser
+                with rate_limit.priority(rate_limit.BULK, stop=self.stop_event):
+                    return self.ai.grade(direction, sentence, answer)
+            except rate_limit.Cancelled:
+                return _SKIPPED
+            except rate_limit.BudgetExceeded as e:  # arka plan payı doldu: kalanlar sonraki işe
+                self.last_error = str(e)
+                self.stop_event.set()
+                return _SKIPPED
+            except Exception as e:  # ağ/anahtar/kota: bu cevap sonraki işe kalır
+                self.last_error = str(e)
+                return None
+
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+            while not self.stop_event.is_set():
+                rows = self.repo.pending(model, after, batch_size)
+                if not rows:
+                    self.repo.checkpoint(job["id"], after, 0, 0, 0, status="done")
+                    break
+                results = list(pool.map(grade, rows))  # AI beklerken DB kilidi tutulmaz
+                after = self._write(job["id"], rows, results, after)
+                if progress:
+                    progress(self.repo.get_job(job["id"]))
+        return self.repo.get_job(job["id"])
+
+    def _write(self, job_id: int, rows: List[tuple], results: list, after: int) -> int:
+        done = changed = failed = 0
+        last = after
+        stopped = False
+        with self.uow() as uow:
+            for row, result in zip(rows, results):
+                if result is _SKIPPED:
+                    stopped = True  # kontrol noktası gönderilmemiş ilk cevabın önünde kalır
+                    continue
+                if not stopped:
+                    last = row[0]
+                if result is None:
+                    failed += 1
+                    continue
+                score, feedback, used_model = result
+                uow.regrade.save_grade(row[0], row[1], row[2], row[5], score, feedback, used_model)
+                done += 1
+                changed += score != row[6]
+            uow.regrade.checkpoint(job_id, last, done, changed, failed)
+        return last
@@ -0,0 +1,101 @@
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Deque, Dict, Optional, Set, Tuple
+from ..core import rate_limit
+from ..models import Exercise, ReviewCard
+
+REVIEW_BATCH = 20    # due kuyruğundan tek seferde okunan kart
+REVIEW_PREFETCH = 3  # görevi arka planda hazırlanan sıradaki kart sayısı
+
+_Key = Tuple[int, str]  # (word_id, direction)
+
+
+class ReviewSession:
+    """
+    Tekrar oturumu: vadesi gelen kartları due_at sırasıyla sunar. Sıradaki
+    birkaç kartın görev cümlesi (AI) arka planda hazırlanır; "sonraki kart"
+    çoğu zaman ağ beklemeden döner. Puanlama evaluate_exercise üzerinden
+    yapılır, kartın yeni due_at değeri aynı transaction'da yazılır.
+    """
+
+    def __init__(self, service, batch_size: int = REVIEW_BATCH, prefetch: int = REVIEW_PREFETCH):
+        self.service = service  # WordService
+        self.batch_size = batch_size
+        self.prefetch = prefetch
+        self._queue: Deque[ReviewCard] = deque()
+        self._queued: Set[_Key] = set()   # kuyrukta veya ekranda; tekrar okunmaz
+        self._skipped: Set[_Key] = set()  # bu oturumda atlananlar
+        self._futures: Dict[_Key, Future] = {}
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="review-prefetch")
+        self.current: Optional[Tuple[ReviewCard, Exercise]] = None
+        self.reviewed = 0
+
+    @staticmethod
+    def _key(card: ReviewCard) -> _Key:
+        return card.word_id, card.direction
+
+    def _refill(self) -> None:
+        if len(self._queue) >= self.prefetch:
+            return
+        exclude = self._queued | self._skipped
+        for card in self.service.due_cards(limit=self.batch_size + len(exclude)):
+            key = self._key(card)
+            if key not in exclude:
+                self._queue.append(card)
+                self._queued.add(key)
+                exclude.add(key)
+
+    def _prefetch(self) -> None:
+        for card in list(self._queue)[:self.prefetch]:
+            key = self._key(card)
+            if key not in self._futures:
+                self._futures[key] = self._pool.submit(self._prepare_ahead, card)
+
+    def _prepare_ahead(self, card: ReviewCard) -> int:
+        # Ön hazırlık AI kuyruğunda etkileşimli çağrıların arkasında bekler
+        with rate_limit.priority(rate_limit.PREFETCH):
+            return self.service.exercise_for_card(card)
+
+    def remaining(self) -> int:
+        """Bu oturumda sırada bekleyen (bilinen) kart sayısı."""
+        return len(self._queue)
+
+    def next_card(self) -> Optional[Tuple[ReviewCard, Exercise]]:
+        """Sıradaki kart + görevi; vadesi gelen kart kalmadıysa None. Görev hazır değilse bekler."""
+        self._refill()
+        if not self._queue:
+            self.current = None
+            return None
+        card = self._queue.popleft()
+        key = self._key(card)
+        fut = self._futures.pop(key, None) or self._pool.submit(self.service.exercise_for_card, card)
+        self._prefetch()
+        try:
+            ex = self.service.get_exercise(fut.result())
+        except Exception:
+            self._queued.discard(key)  # sonraki denemede yeniden gelsin
+            raise
+        self.current = (card, ex)
+        self._refill()
+        self._prefetch()
+        return self.current
+
+    def grade(self, answer: str) -> Tuple[int, str]:
+        if self.current is None:
+            raise ValueError("no active card")
+        card, ex = self.current
+        score, feedback = self.service.evaluate_exercise(ex.id, answer)
+        self._queued.discard(self._key(card))  # yeni due_at ile kuyruğa kendiliğinden döner
+        self.current = None
+        self.reviewed += 1
+        return score, feedback
+
+    def skip(self) -> None:
+        if self.current is not None:
+            key = self._key(self.current[0])
+            self._queued.discard(key)
+            self._skipped.add(key)
+            self.current = None
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
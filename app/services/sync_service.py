@@ -0,0 +1,243 @@
+"""
+Kütüphane kopyaları arasında artımlı eşitleme (delta paketleri).
+
+change_log her yazmada trigger'larla dolar (anahtar başına son durum + tombstone).
+export_delta(peer=...) o kopyaya gönderilmemiş değişikliklerin güncel satırlarını,
+apply_delta(paket) bunları tek transaction'da uygular. Birleştirme kuralları simetrik
+seçildi; iki taraf aynı çakışmayı çözünce aynı sonuca varır:
+  - notlar: biri diğerini içeriyorsa uzun olan, değilse ikisi alt alta (sıralı)
+  - öğrenildi: taraflardan biri öğrendiyse öğrenildi, learned_at en eskisi
+  - diğer alanlar / örnek / görev: en son değişen kazanır (eşitlikte büyük kopya id'si);
+    cevaplanmış görev cevapsızına tercih edilir
+Arşivlenmiş (bkz. maintenance_service) örnek/görevlere gelen değişiklik ve silmeler
+arşivdeki kopyaya uygulanır; satır sıcak tabloya geri eklenmez ("archived" sayacı).
+"""
+import gzip
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from ..core.repository import (
+    SyncRepository, UnitOfWork, SYNC_WORD_FIELDS, SYNC_EXERCISE_FIELDS, SYNC_EXAMPLE_FIELDS
+)
+from .maintenance_service import update_archived
+
+BUNDLE_FORMAT = 1
+ORIGIN_FLAG = "sync_origin"  # uygulama sırasında trigger'lar change_log.origin'e yazar
+_ENTITY_ORDER = {"example": 0, "exercise": 1, "word": 2}  # silmede önce çocuklar
+
+
+def merge_notes(a: str, b: str) -> str:
+    a, b = a or "", b or ""
+    if b in a:
+        return a
+    if a in b:
+        return b
+    return "\n\n".join(sorted((a.strip(), b.strip())))
+
+
+def _newer(local_ts: str, remote_ts: str, local_id: str, remote_id: str) -> bool:
+    """Yerel sürüm mü kazanır? Zaman damgası, eşitlikte kopya id'si (iki tarafta da aynı karar)."""
+    return (local_ts or "", local_id) > (remote_ts or "", remote_id)
+
+
+def merge_word(local: dict, remote: dict, local_wins: bool) -> dict:
+    merged = dict(local if local_wins else remote)
+    merged["notes"] = merge_notes(local.get("notes"), remote.get("notes"))
+    if local.get("is_learned") or remote.get("is_learned"):
+        stamps = [t for t in (local.get("learned_at"), remote.get("learned_at")) if t]
+        merged["is_learned"], merged["learned_at"] = 1, min(stamps) if stamps else None
+    else:
+        merged["is_learned"], merged["learned_at"] = 0, None
+    created = [t for t in (local.get("created_at"), remote.get("created_at")) if t]
+    merged["created_at"] = min(created) if created else None
+    return merged
+
+
+def write_bundle(bundle: dict, path: str) -> int:
+    """Paketi yazar (.gz uzantısında gzip); yazılan bayt sayısını döner."""
+    data = json.dumps(bundle, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    if str(path).endswith(".gz"):
+        data = gzip.compress(data)
+    Path(path).write_bytes(data)
+    return len(data)
+
+
+def read_bundle(path: str) -> dict:
+    data = Path(path).read_bytes()
+    if data[:2] == b"\x1f\x8b":
+        data = gzip.decompress(data)
+    return json.loads(data)
+
+
+class SyncService:
+    def __init__(self, repo: Optional[SyncRepository] = None):
+        self.repo = repo or SyncRepository()
+        self.uow = UnitOfWork
+
+    def replica_id(self) -> str:
+        return self.repo.replica_id()
+
+    def status(self) -> dict:
+        return {"replica": self.repo.replica_id(), "seq": self.repo.max_seq()}
+
+    # ---- export ----
+    def export_delta(self, since: Optional[int] = None, peer: Optional[str] = None) -> dict:
+        """
+        seq > since değişikliklerin paketi. peer verilirse since varsayılanı o kopyaya son
+        gönderilen seq'tir, o kopyadan gelmiş değişiklikler atlanır ve gönderim kaydedilir.
+        """
+        with self.uow() as uow:
+            sync = uow.sync
+            sent_seq, received_seq = sync.get_peer(peer) if peer else (0, 0)
+            if since is None:
+                since = sent_seq
+            until = sync.max_seq()
+            latest: Dict[str, List[Tuple[str, str]]] = {"word": [], "exercise": [], "example": []}
+            deleted = []
+            for _seq, entity, key, op, changed_at in sync.changes_since(since, exclude_origin=peer):
+                if op == "delete":
+                    deleted.append({"entity": entity, "key": key, "changed_at": changed_at})
+                else:
+                    latest[entity].append((key, changed_at))
+            bundle = {
+                "format": BUNDLE_FORMAT,
+                "replica": sync.replica_id(),
+                "since": since,
+                "until": until,
+                "ack": received_seq,  # alıcının günlüğünden buraya kadarını uyguladık
+                "words": self._items(latest["word"], sync.word_rows),
+                "exercises": self._items(latest["exercise"], sync.exercise_rows),
+                "examples": self._items(latest["example"], sync.example_rows),
+                "deleted": sorted(deleted, key=lambda d: _ENTITY_ORDER[d["entity"]]),
+            }
+            if peer:
+                sync.save_peer(peer, sent_seq=until)
+        return bundle
+
+    @staticmethod
+    def _items(keys: List[Tuple[str, str]], fetch) -> List[dict]:
+        rows = fetch([k for k, _ in keys])
+        # Satırı artık olmayan (ör. kelimesi silinmiş yetim örnek) anahtarlar atlanır
+        return [{"key": k, "changed_at": ts, **rows[k]} for k, ts in keys if k in rows]
+
+    # ---- apply ----
+    def apply_delta(self, bundle: dict) -> Dict[str, int]:
+        if bundle.get("format") != BUNDLE_FORMAT:
+            raise ValueError(f"desteklenmeyen paket formatı: {bundle.get('format')}")
+        origin = bundle["replica"]
+        stats = {"applied": 0, "merged": 0, "kept_local": 0, "deleted": 0, "missing": 0, "archived": 0}
+        with self.uow() as uow:
+            sync = uow.sync
+            local_id = sync.replica_id()
+            if origin == local_id:
+                raise ValueError("paket bu kopyanın kendisinden")
+            ctx = (sync, origin, local_id, int(bundle.get("ack") or 0), stats, uow.archive)
+            sync.set_flag(ORIGIN_FLAG, origin)  # transaction içinde; başka bağlantılar görmez
+            for item in bundle.get("words", []):
+                self._apply_word(ctx, item)
+            for item in bundle.get("exercises", []):
+                self._apply_exercise(ctx, item)
+            for item in bundle.get("examples", []):
+                self._apply_example(ctx, item)
+            for item in bundle.get("deleted", []):
+                self._apply_delete(ctx, item)
+            sync.set_flag(ORIGIN_FLAG, None)
+            sync.save_peer(origin, received_seq=int(bundle["until"]))
+        return stats
+
+    @staticmethod
+    def _pending(ctx, entity: str, key: str) -> Optional[tuple]:
+        """Karşı tarafın henüz görmediği yerel değişiklik (çakışma): (seq, op, origin, changed_at)."""
+        sync, origin, _local_id, ack, *_ = ctx
+        entry = sync.log_entry(entity, key)
+        if entry is not None and entry[0] > ack and entry[2] != origin:
+            return entry
+        return None
+
+    def _apply_word(self, ctx, item: dict) -> None:
+        sync, origin, local_id, _ack, stats, *_ = ctx
+        key = item["key"]
+        remote = {f: item.get(f) for f in SYNC_WORD_FIELDS}
+        pending = self._pending(ctx, "word", key)
+        if pending is None:
+            sync.upsert_word(key, remote)
+            stats["applied"] += 1
+            return
+        local_wins = _newer(pending[3], item.get("changed_at"), local_id, origin)
+        if pending[1] == "delete":
+            if local_wins:
+                stats["kept_local"] += 1
+            else:
+                sync.upsert_word(key, remote)
+                stats["applied"] += 1
+            return
+        local = sync.word_rows([key]).get(key)
+        merged = merge_word(local, remote, local_wins) if local else remote
+        if merged == local:
+            stats["kept_local"] += 1
+            return
+        sync.upsert_word(key, merged)
+        if merged != remote:
+            sync.mark_local("word", key)  # birleşik sonuç kaynağa da gitsin
+        stats["merged"] += 1
+
+    @staticmethod
+    def _apply_archived(ctx, entity: str, item: dict, fields) -> bool:
+        """Arşivdeki satır yerelde düzenlenemez: gelen sürüm arşiv kopyasına yazılır."""
+        stats, archive = ctx[4], ctx[5]
+        changes = {f: item.get(f) for f in fields if f != "created_at"}
+        if not update_archived(archive, entity, item["key"], changes):
+            return False
+        stats["archived"] += 1
+        return True
+
+    def _apply_exercise(self, ctx, item: dict) -> None:
+        sync, origin, local_id, _ack, stats, *_ = ctx
+        if self._apply_archived(ctx, "exercise", item, SYNC_EXERCISE_FIELDS):
+            return
+        word_id = sync.id_by_key("word", item.get("word"))
+        if word_id is None:
+            stats["missing"] += 1
+            return
+        pending = self._pending(ctx, "exercise", item["key"])
+        if pending is not None:
+            local = sync.exercise_rows([item["key"]]).get(item["key"])
+            local_answered = bool(local and local.get("score") is not None)
+            remote_answered = item.get("score") is not None
+            if local_answered != remote_answered:
+                keep_local = local_answered
+            else:
+                keep_local = _newer(pending[3], item.get("changed_at"), local_id, origin)
+            if keep_local:
+                stats["kept_local"] += 1
+                return
+        sync.upsert_exercise(item["key"], word_id, {f: item.get(f) for f in SYNC_EXERCISE_FIELDS})
+        stats["applied"] += 1
+
+    def _apply_example(self, ctx, item: dict) -> None:
+        sync, origin, local_id, _ack, stats, *_ = ctx
+        if self._apply_archived(ctx, "example", item, SYNC_EXAMPLE_FIELDS):
+            return
+        word_id = sync.id_by_key("word", item.get("word"))
+        if word_id is None:
+            stats["missing"] += 1
+            return
+        pending = self._pending(ctx, "example", item["key"])
+        if pending is not None and _newer(pending[3], item.get("changed_at"), local_id, origin):
+            stats["kept_local"] += 1
+            return
+        exercise_id = sync.id_by_key("exercise", item.get("exercise"))
+        sync.upsert_example(item["key"], word_id, exercise_id, {f: item.get(f) for f in SYNC_EXAMPLE_FIELDS})
+        stats["applied"] += 1
+
+    def _apply_delete(self, ctx, item: dict) -> None:
+        sync, origin, local_id, _ack, stats, archive = ctx
+        pending = self._pending(ctx, item["entity"], item["key"])
+        if pending is not None and pending[1] == "upsert" and \
+                _newer(pending[3], item.get("changed_at"), local_id, origin):
+            stats["kept_local"] += 1
+            return
+        if sync.delete_by_key(item["entity"], item["key"]) or (
+                item["entity"] != "word" and update_archived(archive, item["entity"], item["key"], None)):
+            stats["deleted"] += 1
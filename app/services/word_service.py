@@ -1,57 +1,213 @@
-from typing import Optional, List, Tuple
-from ..core.repository import WordRepository, ExampleRepository, ExerciseRepository
-from ..models import Word, Exercise
+import threading
+from typing import Iterable, Iterator, Optional, List, Tuple
+from ..core.repository import (
+    WordRepository, ExampleRepository, ExerciseRepository, SearchRepository, ScheduleRepository, StatsRepository,
+    UnitOfWork, Cursor, DEFAULT_PAGE_SIZE
+)
+from ..models import Word, Example, Exercise, SearchHit, ReviewCard
 from ..core.ai_client import AIClient
+from ..core.translator import Translator
+from ..core.term_index import TermIndex
+from ..core.library_index import LibraryIndex
+from ..core import analytics, events, scheduler
 
 AUTO_LEARN_MIN_AVG = 7.0  # ortalama > 7 ise otomatik öğrenildi
+IMPORT_BATCH_SIZE = 500    # toplu içe aktarmada transaction başına satır
 
 class WordService:
-    def __init__(self, repo: Optional[WordRepository] = None,
-                 exrepo: Optional[ExampleRepository] = None,
-                 exerrepo: Optional[ExerciseRepository] = None,
-                 ai: Optional[AIClient] = None):
-        self.repo = repo or WordRepository()
-        self.exrepo = exrepo or ExampleRepository()
-        self.exerrepo = exerrepo or ExerciseRepository()
-        self.ai = ai or AIClient()
+    def __init__(self, ai: Optional[AIClient] = None, translator: Optional[Translator] = None):
+        # Okumalar bu repository'lerden, yazmalar self.uow() üzerinden; ikisi de aynı DB_PATH'e gider
+        self.repo = WordRepository()
+        self.exrepo = ExampleRepository()
+        self.exerrepo = ExerciseRepository()
+        self._ai = ai
+        self._translator = translator
+        self.searchrepo = SearchRepository()
+        self.schedrepo = ScheduleRepository()
+        self.statsrepo = StatsRepository()
+        self.uow = UnitOfWork  # çok adımlı yazmalar için tek transaction
+        self._term_index: Optional[TermIndex] = None
+        self._library: Optional[LibraryIndex] = None
+        self._unsubscribe = None
+        self._missed: Optional[list] = None  # indeks kurulurken gelen olaylar
+        self._index_lock = threading.RLock()  # sunucu modunda indeks bir kez kurulsun
+
+    # ---- external clients (ilk kullanımda kurulur; anahtar yalnızca gerekince aranır) ----
+    # Setter'lar: eskiden düz öznitelikti; benchmark ve testler kurulmuş servise sahte istemci atar
+    @property
+    def ai(self) -> AIClient:
+        if self._ai is None:
+            self._ai = AIClient()
+        return self._ai
+
+    @ai.setter
+    def ai(self, client: AIClient) -> None:
+        self._ai = client
+
+    @property
+    def translator(self) -> Translator:
+        if self._translator is None:
+            self._translator = Translator(source="en", target="tr")
+        return self._translator
+
+    @translator.setter
+    def translator(self, translator: Translator) -> None:
+        self._translator = translator
+
+    def translate(self, text: str) -> str:
+        return self.translator.translate(text)
 
     # ---- words ----
     def add_or_get(self, term_en: str, translation_tr: str, group_title: Optional[str] = None) -> Word:
-        existing = self.repo.find_by_term(term_en)
-        if existing:
-            if translation_tr and translation_tr != existing.translation_tr:
-                self.repo.update_translation(existing.id, translation_tr)
-            if group_title and group_title != (existing.group_title or None):
-                self.repo.update_group(existing.id, group_title)
-            return self.repo.get_word(existing.id)
-        _id = self.repo.add_word(term_en, translation_tr, group_title)
-        return self.repo.get_word(_id)
+        return self.upsert_word(term_en, translation_tr, group_title)[0]
+
+    def upsert_word(self, term_en: str, translation_tr: str,
+                    group_title: Optional[str] = None) -> Tuple[Word, str]:
+        """add_or_get gibi; yanında "created"|"updated"|"unchanged" durumunu da döndürür."""
+        with self.uow() as uow:
+            return self._upsert_word(uow.words, term_en, translation_tr, group_title)
+
+    @staticmethod
+    def _upsert_word(words: WordRepository, term_en: str, translation_tr: str,
+                     group_title: Optional[str]) -> Tuple[Word, str]:
+        """Yoksa ekler; varsa boş olmayan çeviri/grup değişikliklerini yazar. ("created"|"updated"|"unchanged")."""
+        existing = words.find_by_term(term_en)
+        if not existing:
+            return words.create_word(term_en, translation_tr, group_title), "created"
+        changes = {}
+        if translation_tr and translation_tr != existing.translation_tr:
+            changes["translation_tr"] = translation_tr
+        if group_title and group_title != (existing.group_title or None):
+            changes["group_title"] = group_title
+        if not changes:
+            return existing, "unchanged"
+        return words.update_fields(existing.id, changes), "updated"
+
+    def import_words(self, rows: Iterable[Tuple[str, str, Optional[str]]],
+                     batch_size: int = IMPORT_BATCH_SIZE) -> Tuple[int, int, int]:
+        """
+        (term_en, translation_tr, group_title) satırlarını add_or_get kurallarıyla ekler;
+        her batch_size satır tek transaction. Dönüş: (eklenen, güncellenen, değişmeyen).
+        """
+        counts = {"created": 0, "updated": 0, "unchanged": 0}
+        batch: list = []
+
+        def flush():
+            with self.uow() as uow:
+                for row in batch:
+                    counts[self._upsert_word(uow.words, *row)[1]] += 1
+            batch.clear()
+
+        for term_en, translation_tr, group_title in rows:
+            term_en = (term_en or "").strip()
+            if not term_en:
+                continue
+            batch.append((term_en, (translation_tr or "").strip(), (group_title or "").strip() or None))
+            if len(batch) >= batch_size:
+                flush()
+        if batch:
+            flush()
+        return counts["created"], counts["updated"], counts["unchanged"]
+
+    def find_word(self, term_en: str) -> Optional[Word]:
+        return self.repo.find_by_term(term_en)
+
+    # ---- in-memory read models ----
+    @property
+    def library(self) -> LibraryIndex:
+        """Tek toplu sorguyla kurulan, değişiklik olaylarıyla güncel tutulan kütüphane indeksi."""
+        if self._library is None:
+            with self._index_lock:
+                if self._library is None:
+                    # Önce abone ol; toplu sorgu sürerken commit edilen değişiklikler sonra uygulanır
+                    self._follow_changes()
+                    self._missed = []
+                    library = LibraryIndex(self.repo.all_words())
+                    self._library = library
+                    missed, self._missed = self._missed, None  # yeniden okuma idempotent; sıra önemsiz
+                    self.apply_changes(missed)
+        return self._library
+
+    @property
+    def term_index(self) -> TermIndex:
+        if self._term_index is None:
+            with self._index_lock:
+                if self._term_index is None:
+                    self._term_index = TermIndex((w.id, w.term_en) for w in self.library.words())
+        return self._term_index
+
+    def _follow_changes(self) -> None:
+        if self._unsubscribe is None:
+            self._unsubscribe = events.subscribe(self.apply_changes, weak=True)
+
+    def apply_changes(self, changes) -> None:
+        """
+        Bir commit'in olaylarını bellek içi indekslere uygular (yazan thread'de çalışır).
+        Değişen kelimeler tek sorguyla yeniden okunur; satırı olmayanlar indeksten çıkar.
+        """
+        if self._missed is not None:
+            self._missed.extend(changes)
+            return
+        if self._library is None and self._term_index is None:
+            return
+        ids = list(dict.fromkeys(e.word_id for e in changes))
+        deleted = {e.word_id for e in changes if e.kind == events.WORD_DELETED}
+        live = [i for i in ids if i not in deleted]
+        rows = self.repo.get_words(live) if live else {}
+        for word_id in ids:
+            w = rows.get(word_id)
+            if self._library is not None:
+                if w is None:
+                    self._library.remove(word_id)
+                else:
+                    self._library.upsert(w)
+            if self._term_index is not None:
+                if w is None:
+                    self._term_index.remove(word_id)
+                else:
+                    self._term_index.add(w.id, w.term_en)
+
+    def suggest_terms(self, text: str, limit: int = 8) -> List[Tuple[int, str, float]]:
+        """Yazarken "zaten var / bunu mu demek istediniz" önerileri: [(word_id, term_en, benzerlik)]."""
+        return self.term_index.suggest(text, limit=limit)
+
+    def search(self, text: str, limit: int = 20, offset: int = 0) -> List[SearchHit]:
+        return self.searchrepo.search(text, limit=limit, offset=offset)
 
     def set_learned(self, word_id: int, learned: bool) -> None:
         self.repo.set_learned(word_id, learned)
 
     def list_group_titles(self) -> List[str]:
-        return self.repo.list_group_titles()
+        return self.library.group_titles()
 
     def list_words(self, include_learned: bool = True) -> List[Word]:
         return self.repo.list_words(include_learned=include_learned)
 
+    def list_words_page(self, limit: int = DEFAULT_PAGE_SIZE, after: Optional[Cursor] = None,
+                        **filters) -> Tuple[List[Word], Optional[Cursor]]:
+        return self.repo.list_words_page(limit=limit, after=after, **filters)
+
+    def iter_words(self, **filters) -> Iterator[Word]:
+        return self.repo.iter_words(**filters)
+
     # ---- examples ----
     def add_example_manual(self, word_id: int, text: str) -> int:
         # Skorsuz örnek; ortalamayı etkilemez
         return self.exrepo.add_example(word_id, text, origin="MANUAL")
 
-    def list_examples(self, word_id: int):
-        return self.exrepo.list_examples(word_id)
+    def list_examples(self, word_id: int, limit: Optional[int] = None, offset: int = 0):
+        return self.exrepo.list_examples(word_id, limit=limit, offset=offset)
+
+    def list_examples_page(self, word_id: int, limit: int = DEFAULT_PAGE_SIZE, after: Optional[Cursor] = None,
+                           **filters) -> Tuple[List[Example], Optional[Cursor]]:
+        return self.exrepo.list_examples_page(word_id, limit=limit, after=after, **filters)
 
     def get_avg_score(self, word_id: int) -> float:
         return self.exrepo.avg_score(word_id)
 
-    def _auto_mark_learned_by_avg(self, word_id: int):
-        avg = self.get_avg_score(word_id)
-        w = self.repo.get_word(word_id)
-        if w and not w.is_learned and avg > AUTO_LEARN_MIN_AVG:
-            self.repo.set_learned(word_id, True)
+    def _auto_mark_learned_by_avg(self, word_id: int, words: Optional[WordRepository] = None) -> bool:
+        # Eşik kontrolü SQL'de, words üzerindeki skor toplamlarıyla yapılır
+        return (words or self.repo).mark_learned_if_avg_above(word_id, AUTO_LEARN_MIN_AVG)
 
     # ---- exercises (AI) ----
     def create_exercise_tr(self, word_id: int) -> int:
@@ -68,26 +224,64 @@ class WordService:
         sentence = self.ai.generate_en_sentence(w.term_en, w.translation_tr)
         return self.exerrepo.add_exercise(w.id, "EN", w.term_en, w.translation_tr, sentence)
 
-    def list_exercises(self, word_id: int) -> List[Exercise]:
-        return self.exerrepo.list_exercises(word_id)
+    def list_exercises(self, word_id: int, limit: Optional[int] = None, offset: int = 0) -> List[Exercise]:
+        return self.exerrepo.list_exercises(word_id, limit=limit, offset=offset)
+
+    def list_exercises_page(self, word_id: int, limit: int = DEFAULT_PAGE_SIZE, after: Optional[Cursor] = None,
+                            **filters) -> Tuple[List[Exercise], Optional[Cursor]]:
+        return self.exerrepo.list_exercises_page(word_id, limit=limit, after=after, **filters)
+
+    def get_exercise(self, ex_id: int) -> Optional[Exercise]:
+        return self.exerrepo.get_exercise(ex_id)
+
+    # ---- spaced repetition ----
+    def exercise_for_card(self, card: ReviewCard) -> int:
+        """Kart için cevaplanmamış görev varsa onu, yoksa AI ile yenisini döner (görev id)."""
+        open_ex, _ = self.exerrepo.list_exercises_page(card.word_id, limit=1, direction=card.direction,
+                                                       answered=False)
+        if open_ex:
+            return open_ex[0].id
+        if card.direction == "TR":
+            return self.create_exercise_tr(card.word_id)
+        return self.create_exercise_en(card.word_id)
+
+    def due_cards(self, limit: int = 20) -> List[ReviewCard]:
+        return self.schedrepo.due_cards(limit=limit)
+
+    def count_due(self) -> int:
+        return self.schedrepo.count_due()
+
+    # ---- analytics ----
+    def progress(self, days: int = 365, group_title: Optional[str] = None,
+                 direction: Optional[str] = None) -> analytics.ProgressSeries:
+        return analytics.progress_series(self.statsrepo, days=days, group_title=group_title, direction=direction)
+
+    def word_average_histogram(self) -> List[int]:
+        return analytics.word_average_histogram(self.statsrepo)
 
     def evaluate_exercise(self, ex_id: int, user_answer: str) -> Tuple[int, str]:
         ex = self.exerrepo.get_exercise(ex_id)
         if not ex:
             raise ValueError("exercise not found")
-        score, feedback = self.ai.score_translation(ex.direction, ex.sentence, user_answer)
-        # egzersizi güncelle
-        self.exerrepo.update_answer_and_score(ex_id, user_answer, score, feedback)
-        # skorlu örnek olarak kaydet
-        self.exrepo.add_example(
-            word_id=ex.word_id,
-            text=user_answer,
-            origin="AI",
-            direction=ex.direction,
-            score=score,
-            feedback=feedback,
-            exercise_id=ex.id,
-        )
-        # ortalama → otomatik öğrenildi
-        self._auto_mark_learned_by_avg(ex.word_id)
+        # AI çağrısı transaction dışında; yazma kilidi ağ beklerken tutulmaz
+        score, feedback, model = self.ai.grade(ex.direction, ex.sentence, user_answer)
+        with self.uow() as uow:
+            # egzersizi güncelle
+            uow.exercises.update_answer_and_score(ex_id, user_answer, score, feedback, model)
+            # skorlu örnek olarak kaydet (trigger words skor toplamlarını günceller)
+            uow.examples.add_example(
+                word_id=ex.word_id,
+                text=user_answer,
+                origin="AI",
+                direction=ex.direction,
+                score=score,
+                feedback=feedback,
+                exercise_id=ex.id,
+                grader_model=model,
+            )
+            # ortalama → otomatik öğrenildi
+            self._auto_mark_learned_by_avg(ex.word_id, uow.words)
+            # SM-2: kelime + yön kartının bir sonraki tekrar zamanı
+            card = uow.schedule.get_card(ex.word_id, ex.direction) or ReviewCard(ex.word_id, ex.direction)
+            uow.schedule.save_card(scheduler.review(card, score))
         return score, feedback
\ No newline at end of file
@@ -0,0 +1,188 @@
+from typing import Callable, List, Optional, Tuple
+from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex, QRect, QSize
+from PySide6.QtGui import QColor, QFontMetrics, QPen
+from PySide6.QtWidgets import QStyledItemDelegate, QStyle
+
+# Satırın kendisi (Example / Exercise) ve sol çizgi rengi için özel roller
+RowRole = Qt.UserRole + 1
+BorderColorRole = Qt.UserRole + 2
+
+PAGE_SIZE = 100
+
+
+class _PagedListModel(QAbstractListModel):
+    """
+    Satırları sayfa sayfa çeken liste modeli (created_at DESC, id DESC sırasıyla).
+    Görünüm aşağı kaydırıldıkça fetchMore ile yeni sayfa gelir; yeni satırlar
+    listeyi temizlemeden başa eklenir, güncellenen satırlar yerinde değişir.
+    """
+
+    def __init__(self, fetch_page: Callable[[int, Optional[tuple]], Tuple[list, Optional[tuple]]], parent=None):
+        super().__init__(parent)
+        self._fetch_page = fetch_page  # (limit, after) -> (rows, next_cursor)  [keyset]
+        self._rows: List = []
+        self._cursor = None
+        self._exhausted = False
+
+    # ---- row presentation (alt sınıflar) ----
+    def row_text(self, row) -> str:
+        raise NotImplementedError
+
+    def row_color(self, row) -> str:
+        return "#2e2e2e"
+
+    def row_tooltip(self, row) -> Optional[str]:
+        return None
+
+    # ---- Qt model API ----
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or not (0 <= index.row() < len(self._rows)):
+            return None
+        row = self._rows[index.row()]
+        if role == Qt.DisplayRole:
+            return self.row_text(row)
+        if role == Qt.UserRole:
+            return row.id
+        if role == RowRole:
+            return row
+        if role == BorderColorRole:
+            return self.row_color(row)
+        if role == Qt.ToolTipRole:
+            return self.row_tooltip(row)
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        return not parent.isValid() and not self._exhausted
+
+    def fetchMore(self, parent=QModelIndex()) -> None:
+        if parent.isValid() or self._exhausted:
+            return
+        batch, self._cursor = self._fetch_page(PAGE_SIZE, self._cursor)
+        if self._cursor is None:
+            self._exhausted = True
+        if not batch:
+            return
+        start = len(self._rows)
+        self.beginInsertRows(QModelIndex(), start, start + len(batch) - 1)
+        self._rows.extend(batch)
+        self.endInsertRows()
+
+    # ---- incremental updates ----
+    def reload(self) -> None:
+        self.beginResetModel()
+        self._rows = []
+        self._cursor = None
+        self._exhausted = False
+        self.endResetModel()
+        self.fetchMore()
+
+    def prepend_new(self) -> None:
+        """İlk sayfayı çekip henüz listede olmayan (daha yeni) satırları başa ekler."""
+        known = {r.id for r in self._rows}
+        fresh = []
+        for row in self._fetch_page(PAGE_SIZE, None)[0]:
+            if row.id in known:
+                break
+            fresh.append(row)
+        if not fresh:
+            return
+        self.beginInsertRows(QModelIndex(), 0, len(fresh) - 1)
+        self._rows[0:0] = fresh
+        self.endInsertRows()
+
+    def update_row(self, row) -> None:
+        for i, cur in enumerate(self._rows):
+            if cur.id == row.id:
+                self._rows[i] = row
+                idx = self.index(i)
+                self.dataChanged.emit(idx, idx)
+                return
+
+
+class ExampleListModel(_PagedListModel):
+    def row_text(self, ex) -> str:
+        # Sadece skor (varsa başta) + kullanıcı cümlesi
+        if ex.origin == "AI" and ex.score is not None:
+            return f"{ex.score}/10  •  {ex.text}"
+        return ex.text
+
+    def row_color(self, ex) -> str:
+        if ex.origin == "AI" and ex.score is not None:
+            return "#3b82f6"  # mavi sol çizgi
+        return "#444444"  # skorsuz gri
+
+    def row_tooltip(self, ex) -> Optional[str]:
+        return ex.feedback or None
+
+
+class ExerciseListModel(_PagedListModel):
+    def row_text(self, ex) -> str:
+        tag = "[TR]" if ex.direction == "TR" else "[EN]"
+        score_head = f"{ex.score}/10  •  " if ex.score is not None else ""
+        return f"{tag}  {score_head}{ex.sentence}"
+
+    def row_color(self, ex) -> str:
+        return "#94a3b8"  # nötr sol çizgi
+
+
+class CompactRowDelegate(QStyledItemDelegate):
+    """
+    Eski QLabel tabanlı satırların görünümünü (ince sol çizgi + alt çizgi +
+    12px font) widget oluşturmadan doğrudan boyar.
+    """
+
+    PAD_H = 6
+    PAD_V = 1
+    BORDER = 2
+
+    def __init__(self, view, parent=None):
+        super().__init__(parent or view)
+        self._view = view
+        self._heights = {}  # (text, width) -> height
+        self._heights_width = -1
+
+    def _font(self, option):
+        font = option.font
+        font.setPixelSize(12)
+        return font
+
+    def _text_width(self) -> int:
+        return max(40, self._view.viewport().width() - self.BORDER - 2 * self.PAD_H)
+
+    def paint(self, painter, option, index):
+        painter.save()
+        rect = option.rect
+        if option.state & QStyle.State_Selected:
+            painter.fillRect(rect, option.palette.highlight())
+            pen_color = option.palette.highlightedText().color()
+        else:
+            pen_color = option.palette.text().color()
+
+        color = QColor(index.data(BorderColorRole) or "#2e2e2e")
+        painter.fillRect(QRect(rect.left(), rect.top(), self.BORDER, rect.height()), color)
+        painter.setPen(QPen(QColor("#2a2a2a"), 1))
+        painter.drawLine(rect.left(), rect.bottom(), rect.right(), rect.bottom())
+
+        painter.setFont(self._font(option))
+        painter.setPen(pen_color)
+        text_rect = rect.adjusted(self.BORDER + self.PAD_H, self.PAD_V, -self.PAD_H, -self.PAD_V - 1)
+        painter.drawText(text_rect, Qt.AlignLeft | Qt.AlignVCenter | Qt.TextWordWrap, index.data(Qt.DisplayRole) or "")
+        painter.restore()
+
+    def sizeHint(self, option, index):
+        text = index.data(Qt.DisplayRole) or ""
+        width = self._text_width()
+        if width != self._heights_width:
+            self._heights.clear()
+            self._heights_width = width
+        key = (text, width)
+        h = self._heights.get(key)
+        if h is None:
+            fm = QFontMetrics(self._font(option))
+            br = fm.boundingRect(QRect(0, 0, width, 1_000_000), Qt.TextWordWrap, text)
+            h = br.height() + 2 * self.PAD_V + 1
+            self._heights[key] = h
+        return QSize(width + self.BORDER + 2 * self.PAD_H, h)
@@ -1,27 +1,46 @@
+import os
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton,
-    QTreeWidget, QTreeWidgetItem, QTabWidget, QLabel, QSplitter, QComboBox, QCheckBox
+    QTreeWidget, QTreeWidgetItem, QTabWidget, QLabel, QSplitter, QComboBox, QCheckBox,
+    QCompleter, QListWidget, QListWidgetItem, QFileDialog
 )
-from PySide6.QtCore import Qt, QThread, Signal
+from PySide6.QtCore import Qt, QEvent, QThread, Signal, QTimer, QStringListModel
 from PySide6.QtGui import QColor, QFont
-from ..core.translator import Translator
-from ..core.repository import WordRepository
+from ..core import events
+from ..core.library_index import NO_GROUP, date_key
+from ..core.write_buffer import WriteBehindBuffer
 from ..services.word_service import WordService
+from ..services.export_service import ExportService
+from ..services.maintenance_service import MaintenanceService, JOBS as MAINTENANCE_JOBS
 from .word_page import WordPage
-from datetime import datetime
+from .tab_manager import TabManager
+from .review_page import ReviewPage
+from .stats_page import StatsPage
+
+NOTES_FLUSH_IDLE_MS = 1500  # son tuştan bu kadar sonra notlar diske yazılır
+SUGGEST_DEBOUNCE_MS = 120   # terim yazarken öneri gecikmesi
+SEARCH_DEBOUNCE_MS = 150
+SEARCH_PAGE_SIZE = 50
+LOADING_TEXT = "Kütüphane yükleniyor…"
+MAINTENANCE_DELAY_MS = 60_000  # açılıştan sonra vadesi gelen bakım işleri (arka planda)
+# Arşiv satırları açık sayfalardan ve listelerden kaldırır; arayüzde yalnızca açıkça istenirse
+# (VOCAB_AUTO_ARCHIVE=1), yoksa `python -m app.cli maintain` ile
+AUTO_ARCHIVE = os.getenv("VOCAB_AUTO_ARCHIVE", "") == "1"
+_KIND_LABELS = {"word": "Kelime", "example": "Örnek", "exercise": "Görev"}
 
 class TranslateWorker(QThread):
     finished = Signal(str)
     failed = Signal(str)
 
-    def __init__(self, translator: Translator, term: str):
+    def __init__(self, service: WordService, term: str):
         super().__init__()
-        self.translator = translator
+        self.service = service
         self.term = term
 
     def run(self):
         try:
-            out = self.translator.translate(self.term)
+            # İlk çeviride DeepL istemcisi burada (UI thread'i dışında) kurulur
+            out = self.service.translate(self.term)
             if out:
                 self.finished.emit(out)
             else:
@@ -29,16 +48,73 @@ class TranslateWorker(QThread):
         except Exception as e:
             self.failed.emit(str(e))
 
+class ExportWorker(QThread):
+    """Dışa aktarma / yedek UI thread'i dışında; kendi bağlantısıyla okur, pencere donmaz."""
+    progress = Signal(str)
+    finished = Signal(str)
+    failed = Signal(str)
+
+    def __init__(self, path: str, fmt: str):
+        super().__init__()
+        self.path = path
+        self.fmt = fmt  # "backup" veya EXPORT_FORMATS
+
+    def run(self):
+        try:
+            if self.fmt == "backup":
+                ExportService.backup(self.path, progress=lambda left, total: self.progress.emit(
+                    f"Yedekleniyor… %{(total - left) * 100 // max(total, 1)}"))
+                self.finished.emit(f"Yedek alındı: {self.path}")
+                return
+            with open(self.path, "w", encoding="utf-8", newline="") as fh:
+                n = ExportService().export(fh, self.fmt,
+                                           progress=lambda n: self.progress.emit(f"Dışa aktarılıyor… {n} kelime"))
+            self.finished.emit(f"{n} kelime dışa aktarıldı: {self.path}")
+        except Exception as e:
+            self.failed.emit(str(e))
+
+class MaintenanceWorker(QThread):
+    """ANALYZE/vacuum (+ istenirse arşiv); arşiv paket başına kısa transaction'larla yazar, UI yazmaları beklemez."""
+    archived = Signal(int)  # arşive taşınan örnek + görev
+    failed = Signal(str)
+
+    def __init__(self, jobs):
+        super().__init__()
+        self.jobs = jobs
+
+    def run(self):
+        try:
+            results = MaintenanceService().run_due(jobs=self.jobs)
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        moved = results.get("archive") or {}
+        if moved.get("examples") or moved.get("exercises"):
+            self.archived.emit(moved["examples"] + moved["exercises"])
+
+
 class MainWindow(QMainWindow):
+    # Repository değişiklik olayı geldi (herhangi bir thread'den); UI thread'inde işlenir
+    libraryChanged = Signal()
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("EN→TR Vocabulary")
         self.resize(1200, 760)
 
-        self.repo = WordRepository()
-        self.service = WordService(self.repo)
-        self.translator = Translator(source="en", target="tr")
+        # Çeviri/AI istemcileri ilk kullanımda kurulur; eksik anahtar açılışı engellemez
+        self.service = WordService()
+        self.repo = self.service.repo
         self._worker: TranslateWorker | None = None
+        self._export_worker: ExportWorker | None = None
+        self._maintenance: MaintenanceWorker | None = None
+
+        # Notlar her tuşta değil, boşta kalınca / sekme kapanınca / çıkışta toplu yazılır
+        self.writes = WriteBehindBuffer(self.repo)
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(NOTES_FLUSH_IDLE_MS)
+        self._flush_timer.timeout.connect(self.flush_pending_writes)
 
         splitter = QSplitter(self)
         splitter.setOrientation(Qt.Horizontal)
@@ -55,6 +131,16 @@ class MainWindow(QMainWindow):
         self.btnTranslate.clicked.connect(self.on_translate)
         row1.addWidget(self.txtTerm)
         row1.addWidget(self.btnTranslate)
+        # Yazarken "zaten var / bunu mu demek istediniz" önerileri (bulanık terim indeksi)
+        self._suggestModel = QStringListModel(self)
+        self._completer = QCompleter(self._suggestModel, self)
+        self._completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        self.txtTerm.setCompleter(self._completer)
+        self._suggest_timer = QTimer(self)
+        self._suggest_timer.setSingleShot(True)
+        self._suggest_timer.setInterval(SUGGEST_DEBOUNCE_MS)
+        self._suggest_timer.timeout.connect(self._update_suggestions)
+        self.txtTerm.textEdited.connect(lambda _: self._suggest_timer.start())
         left_layout.addLayout(row1)
 
         # Row 2: Editable translation + Add
@@ -77,6 +163,18 @@ class MainWindow(QMainWindow):
         row3.addWidget(QLabel("Group:"))
         row3.addWidget(self.cmbGroup, 1)
         row3.addWidget(self.chkShowLearned)
+        self.btnReview = QPushButton("Review")
+        self.btnReview.clicked.connect(self._open_review)
+        row3.addWidget(self.btnReview)
+        self.btnStats = QPushButton("Stats")
+        self.btnStats.clicked.connect(self._open_stats)
+        row3.addWidget(self.btnStats)
+        self.btnExport = QPushButton("Export…")
+        self.btnExport.clicked.connect(self._export)
+        row3.addWidget(self.btnExport)
+        self.btnBackup = QPushButton("Backup…")
+        self.btnBackup.clicked.connect(self._backup)
+        row3.addWidget(self.btnBackup)
         left_layout.addLayout(row3)
 
         # Info label
@@ -84,6 +182,26 @@ class MainWindow(QMainWindow):
         self.lblResult.setWordWrap(True)
         left_layout.addWidget(self.lblResult)
 
+        # Full-text search (FTS5); boşken kütüphane ağacı görünür
+        self.txtSearch = QLineEdit(self)
+        self.txtSearch.setPlaceholderText("Ara: kelime, not, örnek veya görev cümlesi…")
+        self.txtSearch.setClearButtonEnabled(True)
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self._search_timer.timeout.connect(self._run_search)
+        self.txtSearch.textChanged.connect(lambda _: self._search_timer.start())
+        left_layout.addWidget(self.txtSearch)
+
+        self.searchResults = QListWidget(self)
+        self.searchResults.setWordWrap(True)
+        self.searchResults.itemDoubleClicked.connect(self._search_item_double_clicked)
+        self.searchResults.verticalScrollBar().valueChanged.connect(self._on_search_scrolled)
+        self.searchResults.hide()
+        self._search_text = ""
+        self._search_exhausted = True
+        left_layout.addWidget(self.searchResults, 1)
+
         # Tree library: Group -> Date -> Words
         self.tree = QTreeWidget(self)
         self.tree.setHeaderHidden(True)
@@ -96,7 +214,7 @@ class MainWindow(QMainWindow):
         right_layout = QVBoxLayout(right)
         self.tabs = QTabWidget(self)
         self.tabs.setTabsClosable(True)
-        self.tabs.tabCloseRequested.connect(self.tabs.removeTab)
+        self.tabManager = TabManager(self.tabs, self._create_page, on_release=self._flush_word)
         right_layout.addWidget(self.tabs)
 
         splitter.addWidget(left)
@@ -109,8 +227,50 @@ class MainWindow(QMainWindow):
         root_layout.addWidget(splitter)
         self.setCentralWidget(container)
 
+        # Kütüphane bellek içi indeksten çizilir; değişiklik olaylarında birleştirilmiş tek yenileme
+        self._library_timer = QTimer(self)
+        self._library_timer.setSingleShot(True)
+        self._library_timer.setInterval(0)
+        self._library_timer.timeout.connect(self._refresh_library)
+        self.libraryChanged.connect(self._library_timer.start)
+
+        # Kütüphane ilk boyamadan sonra yüklenir; pencerenin ilk çizimi yalnızca Qt'yi bekler
+        self._library_version = None
+        self._unsubscribe = None
+        self.lblResult.setText(LOADING_TEXT)
+        self.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if obj is self and event.type() == QEvent.Paint:
+            self.removeEventFilter(self)
+            QTimer.singleShot(0, self._initial_load)  # boyama bittikten sonra
+        return super().eventFilter(obj, event)
+
+    def _initial_load(self):
         self._refresh_groups()
         self.load_library()
+        self._update_due_count()
+        if self.lblResult.text() == LOADING_TEXT:
+            self.lblResult.setText("")
+        # Servisin indeksi kurulurken abone oldu; bu abonelik ondan sonra gelir,
+        # böylece yenileme her zaman güncellenmiş indeksi görür
+        self._unsubscribe = events.subscribe(self._on_words_changed, weak=True)
+        QTimer.singleShot(MAINTENANCE_DELAY_MS, self._start_maintenance)
+
+    def _start_maintenance(self):
+        jobs = [j for j in MAINTENANCE_JOBS if j != "archive" or AUTO_ARCHIVE]
+        self._maintenance = MaintenanceWorker(jobs)
+        self._maintenance.archived.connect(self._on_archived)
+        self._maintenance.failed.connect(lambda err: self.lblResult.setText(f"Bakım yapılamadı: {err}"))
+        self._maintenance.start()
+
+    def _on_archived(self, moved: int):
+        # Açık sayfalar arşive taşınan satırları göstermeye devam etmesin
+        for page in self.tabManager.live_pages():
+            if isinstance(page, WordPage):
+                page.refresh_examples()
+                page.refresh_exercises()
+        self.lblResult.setText(f"{moved} eski örnek/görev arşive taşındı.")
 
     # ---- helpers ----
     def _set_busy(self, busy: bool):
@@ -122,50 +282,104 @@ class MainWindow(QMainWindow):
     def _start_worker(self, term: str, on_done):
         if self._worker and self._worker.isRunning():
             return
-        self._worker = TranslateWorker(self.translator, term)
+        self._worker = TranslateWorker(self.service, term)
         self._worker.finished.connect(lambda res: (self._set_busy(False), on_done(res)))
         self._worker.failed.connect(lambda err: (self._set_busy(False), self._on_translate_failed(err)))
         self._set_busy(True)
         self._worker.start()
 
+    def _on_words_changed(self, changes):
+        # Yazan thread'de çağrılır; sinyal UI thread'ine kuyruklanır
+        self.libraryChanged.emit()
+
+    def _refresh_library(self):
+        self._update_due_count()
+        if self.service.library.version == self._library_version:
+            return  # yalnızca notlar vb. değişti; ağaç aynı
+        self._refresh_groups()
+        self.load_library()
+
+    def _update_due_count(self):
+        n = self.service.count_due()
+        self.btnReview.setText(f"Review ({n})" if n else "Review")
+
+    def _open_review(self):
+        for i in range(self.tabs.count()):
+            if isinstance(self.tabs.widget(i), ReviewPage):
+                self.tabs.setCurrentIndex(i)
+                return
+        idx = self.tabs.addTab(ReviewPage(self.service), "Tekrar")
+        self.tabs.setCurrentIndex(idx)
+
+    def _open_stats(self):
+        for i in range(self.tabs.count()):
+            page = self.tabs.widget(i)
+            if isinstance(page, StatsPage):
+                page.refresh()
+                self.tabs.setCurrentIndex(i)
+                return
+        idx = self.tabs.addTab(StatsPage(self.service), "İlerleme")
+        self.tabs.setCurrentIndex(idx)
+
+    def _export(self):
+        path, selected = QFileDialog.getSaveFileName(
+            self, "Export library", "vocabulary.jsonl",
+            "JSON Lines (*.jsonl);;CSV (*.csv);;Anki text (*.txt)")
+        if path:
+            fmt = "csv" if selected.startswith("CSV") else "anki" if selected.startswith("Anki") else "jsonl"
+            self._start_export(path, fmt)
+
+    def _backup(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Backup database", "vocab-backup.sqlite3",
+                                              "SQLite (*.sqlite3 *.db)")
+        if path:
+            self._start_export(path, "backup")
+
+    def _start_export(self, path: str, fmt: str):
+        if self._export_worker and self._export_worker.isRunning():
+            return
+        self._export_worker = ExportWorker(path, fmt)
+        self._export_worker.progress.connect(self.lblResult.setText)
+        self._export_worker.finished.connect(self.lblResult.setText)
+        self._export_worker.failed.connect(lambda err: self.lblResult.setText(f"Dışa aktarılamadı: {err}"))
+        self._export_worker.finished.connect(lambda _: self._set_export_busy(False))
+        self._export_worker.failed.connect(lambda _: self._set_export_busy(False))
+        self._set_export_busy(True)
+        self._export_worker.start()
+
+    def _set_export_busy(self, busy: bool):
+        self.btnExport.setEnabled(not busy)
+        self.btnBackup.setEnabled(not busy)
+
     def _refresh_groups(self):
+        current = self.cmbGroup.currentText()
         self.cmbGroup.clear()
         titles = self.service.list_group_titles()
         if titles:
             self.cmbGroup.addItems(titles)
+        self.cmbGroup.setCurrentText(current)
 
     def _group_key(self, w) -> str:
         return w.group_title or "(General)"
 
-    def _date_key(self, w) -> str:
-        # YYYY-MM-DD
-        try:
-            d = datetime.fromisoformat(str(w.created_at))
-            return d.strftime("%Y-%m-%d")
-        except Exception:
-            return str(w.created_at)[:10]
-
     def load_library(self):
         self.tree.clear()
-        words = self.service.list_words(include_learned=self.chkShowLearned.isChecked())
-        # group -> date -> [words]
-        gmap = {}
-        for w in words:
-            g = self._group_key(w)
-            d = self._date_key(w)
-            gmap.setdefault(g, {}).setdefault(d, []).append(w)
-        for g, dates in sorted(gmap.items(), key=lambda x: x[0].lower()):
-            g_item = QTreeWidgetItem([g])
+        # group -> date -> words; gruplama/sıralama/filtre bellek içi indekste
+        library = self.service.library
+        self._library_version = library.version
+        tree = library.tree(show_learned=self.chkShowLearned.isChecked())
+        for g, dates in tree:
+            g_item = QTreeWidgetItem([g if g != NO_GROUP else "(General)"])
             g_font = QFont()
             g_font.setBold(True)
             g_item.setFont(0, g_font)
             self.tree.addTopLevelItem(g_item)
-            for d, lst in sorted(dates.items(), key=lambda x: x[0], reverse=True):
+            for d, lst in dates:
                 d_item = QTreeWidgetItem([d])
                 d_color = QColor("#64748b")  # slate-500
                 d_item.setForeground(0, d_color)
                 g_item.addChild(d_item)
-                for w in sorted(lst, key=lambda w: w.term_en.lower()):
+                for w in lst:
                     label = f"{w.term_en} → {w.translation_tr}"
                     w_item = QTreeWidgetItem([label])
                     if w.is_learned:
@@ -173,11 +387,54 @@ class MainWindow(QMainWindow):
                         w_font = QFont()
                         w_font.setBold(True)
                         w_item.setFont(0, w_font)
-                    w_item.setToolTip(0, f"Group: {self._group_key(w)} Date: {self._date_key(w)}")
+                    avg = f"{w.avg_score:.2f}/10" if w.score_count else "-"
+                    w_item.setToolTip(0, f"Group: {self._group_key(w)} Date: {date_key(w)} Avg: {avg}")
                     w_item.setData(0, Qt.UserRole, w.id)
                     d_item.addChild(w_item)
             g_item.setExpanded(True)
 
+    def _update_suggestions(self):
+        text = (self.txtTerm.text() or "").strip()
+        hits = self.service.suggest_terms(text) if text else []
+        self._suggestModel.setStringList([term for _, term, _ in hits])
+        if hits and hits[0][2] >= 1.0:
+            w = self.service.library.get(hits[0][0])
+            if w:
+                self.lblResult.setText(f"Zaten kütüphanede: <b>{w.term_en}</b> → {w.translation_tr}")
+        if hits and self.txtTerm.hasFocus():
+            self._completer.complete()
+
+    # ---- search ----
+    def _run_search(self):
+        text = (self.txtSearch.text() or "").strip()
+        self._search_text = text
+        self.searchResults.clear()
+        self.searchResults.setVisible(bool(text))
+        self.tree.setVisible(not text)
+        self._search_exhausted = not text
+        if text:
+            self._load_search_page()
+
+    def _load_search_page(self):
+        if self._search_exhausted:
+            return
+        hits = self.service.search(self._search_text, limit=SEARCH_PAGE_SIZE, offset=self.searchResults.count())
+        if len(hits) < SEARCH_PAGE_SIZE:
+            self._search_exhausted = True
+        for h in hits:
+            item = QListWidgetItem(f"{h.term_en} → {h.translation_tr}\n{_KIND_LABELS.get(h.kind, h.kind)}: {h.snippet}")
+            item.setData(Qt.UserRole, h.word_id)
+            self.searchResults.addItem(item)
+
+    def _on_search_scrolled(self, value: int):
+        if value >= self.searchResults.verticalScrollBar().maximum():
+            self._load_search_page()
+
+    def _search_item_double_clicked(self, item: QListWidgetItem):
+        word_id = item.data(Qt.UserRole)
+        if word_id:
+            self.tabManager.open(int(word_id))
+
     def on_translate(self):
         term = (self.txtTerm.text() or "").strip()
         if not term:
@@ -202,11 +459,8 @@ class MainWindow(QMainWindow):
             return self.on_translate()
         group_title = (self.cmbGroup.currentText() or None)
         w = self.service.add_or_get(term, translation, group_title)
-        # Yeni grup girilmişse listeye ekle
-        if group_title and group_title not in [self.cmbGroup.itemText(i) for i in range(self.cmbGroup.count())]:
-            self.cmbGroup.addItem(group_title)
+        # Ağaç ve grup listesi değişiklik olayıyla yenilenir
         self.lblResult.setText(f"Added to library: <b>{w.term_en}</b> → {w.translation_tr}")
-        self.load_library()
 
     def _tree_item_double_clicked(self, item: QTreeWidgetItem, column: int):
         word_id = item.data(0, Qt.UserRole)
@@ -214,24 +468,45 @@ class MainWindow(QMainWindow):
             # Grup veya tarih düğümü
             item.setExpanded(not item.isExpanded())
             return
-        w = self.repo.get_word(int(word_id))
+        # Zaten açıksa (ya da bellekten çıkarılmışsa) TabManager o sekmeye geçer
+        self.tabManager.open(int(word_id))
+
+    def _create_page(self, word_id: int):
+        w = self.repo.get_word(word_id)
         if not w:
-            return
-        # Zaten açık mı kontrol et
-        for i in range(self.tabs.count()):
-            page = self.tabs.widget(i)
-            if getattr(page, "word", None) and page.word.id == w.id:
-                self.tabs.setCurrentIndex(i)
-                return
+            return None
         page = WordPage(w, examples_provider=self.service)
         page.notesChanged.connect(self._on_notes_changed)
         page.markLearned.connect(self._on_mark_learned)
-        idx = self.tabs.addTab(page, w.term_en)
-        self.tabs.setCurrentIndex(idx)
+        return page
 
     def _on_notes_changed(self, word_id: int, notes: str):
-        self.repo.update_notes(word_id, notes)
+        self.writes.put_notes(word_id, notes)
+        self._flush_timer.start()  # debounce: her tuşta yeniden başlar
+
+    def flush_pending_writes(self):
+        self._flush_timer.stop()
+        try:
+            self.writes.flush()
+        except Exception as e:
+            self.lblResult.setText(f"Notlar kaydedilemedi: {e}")
+
+    def _flush_word(self, word_id: int):
+        # TabManager sayfa kapatırken/çıkarırken çağırır (Qt slot'u): hata dışarı kaçmamalı
+        try:
+            self.writes.flush(word_id)
+        except Exception as e:
+            self.lblResult.setText(f"Notlar kaydedilemedi: {e}")
+
+    def closeEvent(self, event):
+        self._flush_timer.stop()
+        try:
+            self.writes.close()
+        except Exception as e:
+            self.lblResult.setText(f"Notlar kaydedilemedi: {e}")
+        if self._maintenance and self._maintenance.isRunning():
+            self._maintenance.wait()  # yarıda kalan paket rollback olurdu; bitmesini bekle
+        super().closeEvent(event)
 
     def _on_mark_learned(self, word_id: int, learned: bool):
-        self.service.set_learned(word_id, learned)
-        self.load_library()
\ No newline at end of file
+        self.service.set_learned(word_id, learned)
\ No newline at end of file
@@ -0,0 +1,130 @@
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QTextEdit, QPushButton, QMessageBox
+)
+from PySide6.QtCore import Signal, QThread
+from ..services.review_session import ReviewSession
+
+
+class _SessionWorker(QThread):
+    """ReviewSession çağrısını (görev bekleme / AI puanlama) UI thread'i dışında çalıştırır."""
+    finished = Signal(object)
+    failed = Signal(str)
+
+    def __init__(self, fn, *args):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+
+    def run(self):
+        try:
+            self.finished.emit(self.fn(*self.args))
+        except Exception as e:
+            self.failed.emit(str(e))
+
+
+class ReviewPage(QWidget):
+    """Aralıklı tekrar sekmesi: vadesi gelen kartlar sırayla, görevleri önceden hazırlanmış."""
+
+    def __init__(self, service, parent=None):
+        super().__init__(parent)
+        self.service = service  # WordService
+        self.session = ReviewSession(service)
+        self._worker = None
+        session = self.session
+        self.destroyed.connect(lambda *_: session.close())
+
+        root = QVBoxLayout(self)
+        self.lblHeader = QLabel("")
+        root.addWidget(self.lblHeader)
+        self.lblProgress = QLabel("")
+        self.lblProgress.setObjectName("badgeMuted")
+        root.addWidget(self.lblProgress)
+
+        self.lblSentence = QLabel("")
+        self.lblSentence.setWordWrap(True)
+        root.addWidget(self.lblSentence)
+
+        self.answerInput = QTextEdit(self)
+        self.answerInput.setPlaceholderText("Çevirini yaz ve değerlendir…")
+        self.answerInput.setMaximumHeight(110)
+        root.addWidget(self.answerInput)
+
+        row = QHBoxLayout()
+        self.btnScore = QPushButton("Değerlendir (AI)")
+        self.btnScore.clicked.connect(self._grade)
+        self.btnSkip = QPushButton("Atla")
+        self.btnSkip.clicked.connect(self._skip)
+        self.btnNext = QPushButton("Sonraki")
+        self.btnNext.clicked.connect(self._next)
+        row.addWidget(self.btnScore)
+        row.addWidget(self.btnSkip)
+        row.addWidget(self.btnNext)
+        row.addStretch(1)
+        root.addLayout(row)
+
+        self.lblScore = QLabel("")
+        self.lblScore.setWordWrap(True)
+        root.addWidget(self.lblScore)
+        root.addStretch(1)
+
+        self._next()
+
+    # ---- lifecycle (TabManager) ----
+    def is_busy(self) -> bool:
+        return self._worker is not None and self._worker.isRunning()
+
+    # ---- helpers ----
+    def _run(self, on_done, fn, *args):
+        self._set_busy(True)
+        self._worker = _SessionWorker(fn, *args)
+        self._worker.finished.connect(lambda res: (self._set_busy(False), on_done(res)))
+        self._worker.failed.connect(lambda err: (self._set_busy(False), QMessageBox.warning(self, "Tekrar", err)))
+        self._worker.start()
+
+    def _set_busy(self, busy: bool):
+        has_card = self.session.current is not None
+        self.btnScore.setEnabled(not busy and has_card)
+        self.btnSkip.setEnabled(not busy and has_card)
+        self.btnNext.setEnabled(not busy)
+        self.answerInput.setEnabled(not busy and has_card)
+
+    def _update_progress(self):
+        self.lblProgress.setText(f"Tekrar edilen: {self.session.reviewed}  •  Sırada: {self.session.remaining()}")
+
+    # ---- actions ----
+    def _next(self):
+        self.lblScore.setText("")
+        self.lblSentence.setText("Yükleniyor…")
+        self._run(self._show_card, self.session.next_card)
+
+    def _show_card(self, current):
+        self._update_progress()
+        self.answerInput.clear()
+        if current is None:
+            self.lblHeader.setText("<h2 style='margin:4px 0'>Tekrar</h2>")
+            self.lblSentence.setText("Şu an vadesi gelen kart yok. 🎉")
+            self._set_busy(False)
+            return
+        card, ex = current
+        self.lblHeader.setText(f"<h2 style='margin:4px 0'>{ex.source_en} → {ex.source_tr}</h2>")
+        tag = "[TR]" if ex.direction == "TR" else "[EN]"
+        self.lblSentence.setText(f"{tag}  {ex.sentence}")
+        self._set_busy(False)
+        self.answerInput.setFocus()
+
+    def _grade(self):
+        ans = (self.answerInput.toPlainText() or "").strip()
+        if not ans:
+            QMessageBox.information(self, "Tekrar", "Lütfen çevirinizi yazın.")
+            return
+        self._run(self._on_graded, self.session.grade, ans)
+
+    def _on_graded(self, result):
+        score, feedback = result
+        self.lblScore.setText(f"Skor: {score}/10 — {feedback}")
+        self._update_progress()
+        self._set_busy(False)
+
+    def _skip(self):
+        self.session.skip()
+        self._next()
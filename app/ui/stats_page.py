@@ -0,0 +1,154 @@
+from typing import Optional, Sequence
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QPushButton
+from PySide6.QtGui import QPainter, QColor, QPen
+from PySide6.QtCore import Qt, QRectF, QPointF
+
+SERIES_COLORS = {"added": "#4c8bf5", "learned": "#2e9d5b", "graded": "#e0962b"}
+
+
+def _scaled(values: Sequence, height: float) -> list:
+    peak = max((float(v) for v in values), default=0.0)
+    if peak <= 0:
+        return [0.0] * len(values)
+    return [float(v) / peak * height for v in values]
+
+
+class DailyChart(QWidget):
+    """Gün başına çubuk grafik (bir seri); 365 çubuk tek drawLines çağrısıyla çizilir."""
+
+    def __init__(self, title: str, color: str, parent=None):
+        super().__init__(parent)
+        self.title = title
+        self.color = QColor(color)
+        self.values: Sequence = []
+        self.setMinimumHeight(90)
+
+    def set_values(self, values: Sequence) -> None:
+        self.values = values
+        self.update()
+
+    def paintEvent(self, _):
+        p = QPainter(self)
+        w, h = self.width(), self.height()
+        p.setPen(self.palette().text().color())
+        p.drawText(QRectF(4, 0, w - 8, 16), Qt.AlignLeft, f"{self.title} (toplam {int(sum(self.values))})")
+        n = len(self.values)
+        if not n:
+            return
+        top, bottom = 18.0, h - 2.0
+        step = (w - 8) / n
+        pen = QPen(self.color)
+        pen.setWidthF(max(1.0, step * 0.8))
+        pen.setCapStyle(Qt.FlatCap)
+        p.setPen(pen)
+        lines = [QPointF(4 + (i + 0.5) * step, bottom) for i in range(n)]
+        pairs = []
+        for i, v in enumerate(_scaled(self.values, bottom - top)):
+            if v > 0:
+                pairs.append(lines[i])
+                pairs.append(QPointF(lines[i].x(), bottom - v))
+        if pairs:
+            p.drawLines(pairs)
+
+
+class HistogramChart(QWidget):
+    """0..10 puan histogramı."""
+
+    def __init__(self, title: str, parent=None):
+        super().__init__(parent)
+        self.title = title
+        self.values: Sequence = []
+        self.setMinimumHeight(120)
+
+    def set_values(self, values: Sequence) -> None:
+        self.values = values
+        self.update()
+
+    def paintEvent(self, _):
+        p = QPainter(self)
+        w, h = self.width(), self.height()
+        text = self.palette().text().color()
+        p.setPen(text)
+        p.drawText(QRectF(4, 0, w - 8, 16), Qt.AlignLeft, self.title)
+        n = len(self.values)
+        if not n:
+            return
+        top, bottom = 18.0, h - 16.0
+        step = (w - 8) / n
+        color = QColor(SERIES_COLORS["graded"])
+        for i, v in enumerate(_scaled(self.values, bottom - top)):
+            x = 4 + i * step
+            p.fillRect(QRectF(x + 2, bottom - v, step - 4, v), color)
+            p.drawText(QRectF(x, bottom, step, 16), Qt.AlignHCenter, str(i))
+
+
+class StatsPage(QWidget):
+    """İlerleme sekmesi: son bir yılın günlük serileri ve puan dağılımları (günlük toplam tablolarından)."""
+
+    def __init__(self, service, parent=None):
+        super().__init__(parent)
+        self.service = service  # WordService
+
+        root = QVBoxLayout(self)
+        root.addWidget(QLabel("<h2 style='margin:4px 0'>İlerleme</h2>"))
+
+        row = QHBoxLayout()
+        self.cmbGroup = QComboBox(self)
+        self.cmbDirection = QComboBox(self)
+        self.cmbDirection.addItem("Tümü", None)
+        self.cmbDirection.addItem("TR → EN", "TR")
+        self.cmbDirection.addItem("EN → TR", "EN")
+        self.btnRefresh = QPushButton("Yenile")
+        self.btnRefresh.clicked.connect(self.refresh)
+        row.addWidget(QLabel("Grup:"))
+        row.addWidget(self.cmbGroup, 1)
+        row.addWidget(QLabel("Yön:"))
+        row.addWidget(self.cmbDirection)
+        row.addWidget(self.btnRefresh)
+        root.addLayout(row)
+
+        self.lblTotals = QLabel("")
+        self.lblTotals.setObjectName("badgeMuted")
+        root.addWidget(self.lblTotals)
+
+        self.charts = {
+            "added": DailyChart("Eklenen", SERIES_COLORS["added"]),
+            "learned": DailyChart("Öğrenilen", SERIES_COLORS["learned"]),
+            "graded": DailyChart("Puanlanan", SERIES_COLORS["graded"]),
+        }
+        for chart in self.charts.values():
+            root.addWidget(chart, 1)
+        hist_row = QHBoxLayout()
+        self.histScores = HistogramChart("Puan dağılımı (örnekler)")
+        self.histWords = HistogramChart("Kelime ortalaması dağılımı")
+        hist_row.addWidget(self.histScores)
+        hist_row.addWidget(self.histWords)
+        root.addLayout(hist_row, 1)
+
+        self._fill_groups()
+        self.cmbGroup.currentIndexChanged.connect(lambda _: self.refresh())
+        self.cmbDirection.currentIndexChanged.connect(lambda _: self.refresh())
+        self.refresh()
+
+    def _fill_groups(self):
+        self.cmbGroup.blockSignals(True)
+        self.cmbGroup.clear()
+        self.cmbGroup.addItem("Tüm gruplar", None)
+        self.cmbGroup.addItem("(Grupsuz)", "")
+        for title in self.service.list_group_titles():
+            self.cmbGroup.addItem(title, title)
+        self.cmbGroup.blockSignals(False)
+
+    def refresh(self):
+        group: Optional[str] = self.cmbGroup.currentData()
+        direction: Optional[str] = self.cmbDirection.currentData()
+        series = self.service.progress(days=365, group_title=group, direction=direction)
+        for name, chart in self.charts.items():
+            chart.set_values(getattr(series, name))
+        self.histScores.set_values(series.histogram)
+        self.histWords.set_values(self.service.word_average_histogram())
+        t = series.totals
+        self.lblTotals.setText(
+            f"{series.days[0]} – {series.days[-1]}  •  Eklenen: {t['added']}  •  "
+            f"Öğrenilen: {t['learned']}  •  Puanlanan: {t['graded']}"
+        )
@@ -0,0 +1,156 @@
+from collections import OrderedDict
+from typing import Callable, Optional
+from PySide6.QtCore import QObject, Qt, QTimer
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QTabWidget
+
+MAX_LIVE_PAGES = 5  # tam yüklü tutulan en fazla WordPage sayısı
+
+
+class _PagePlaceholder(QWidget):
+    """Bellekten çıkarılmış sekmenin hafif yer tutucusu; sayfa durumu burada saklanır."""
+
+    def __init__(self, word_id: int, state: dict, parent=None):
+        super().__init__(parent)
+        self.word_id = word_id
+        self.state = state
+        lay = QVBoxLayout(self)
+        lbl = QLabel("Yükleniyor…")
+        lbl.setAlignment(Qt.AlignCenter)
+        lay.addWidget(lbl)
+
+
+class TabManager(QObject):
+    """
+    Kelime sekmelerinin yaşam döngüsü: en son kullanılan `max_live` sayfa tam
+    yüklü tutulur, diğerleri kaydırma konumu ve taslak cevabı saklayan yer
+    tutuculara dönüşür ve sekme tekrar açıldığında yeniden kurulur.
+    """
+
+    def __init__(self, tabs: QTabWidget, page_factory: Callable[[int], Optional[QWidget]],
+                 max_live: int = MAX_LIVE_PAGES,
+                 on_release: Optional[Callable[[int], None]] = None, parent=None):
+        super().__init__(parent or tabs)
+        self.tabs = tabs
+        self.page_factory = page_factory  # word_id -> WordPage | None
+        self.on_release = on_release  # sayfa kapanınca/çıkarılınca (ör. bekleyen yazmaları flush et)
+        self.max_live = max(1, max_live)
+        self._lru: "OrderedDict[int, None]" = OrderedDict()  # canlı sayfalar, eskiden yeniye
+        self._swapping = False
+        tabs.currentChanged.connect(self._on_current_changed)
+        tabs.tabCloseRequested.connect(self.close_tab)
+
+    # ---- queries ----
+    @staticmethod
+    def _word_id_of(widget) -> Optional[int]:
+        if isinstance(widget, _PagePlaceholder):
+            return widget.word_id
+        word = getattr(widget, "word", None)
+        return word.id if word else None
+
+    def index_of(self, word_id: int) -> int:
+        for i in range(self.tabs.count()):
+            if self._word_id_of(self.tabs.widget(i)) == word_id:
+                return i
+        return -1
+
+    def live_pages(self):
+        for i in range(self.tabs.count()):
+            w = self.tabs.widget(i)
+            if not isinstance(w, _PagePlaceholder):
+                yield w
+
+    # ---- lifecycle ----
+    def open(self, word_id: int) -> Optional[QWidget]:
+        i = self.index_of(word_id)
+        if i >= 0:
+            self.tabs.setCurrentIndex(i)  # yer tutucuysa _on_current_changed yeniden kurar
+            return self.tabs.widget(i)
+        page = self.page_factory(word_id)
+        if page is None:
+            return None
+        self._touch(word_id)
+        idx = self.tabs.addTab(page, page.word.term_en)
+        self.tabs.setCurrentIndex(idx)
+        self._evict_excess()
+        return page
+
+    def close_tab(self, index: int):
+        w = self.tabs.widget(index)
+        if w is None:
+            return
+        word_id = self._word_id_of(w)
+        self._lru.pop(word_id, None)
+        self.tabs.removeTab(index)
+        self._release(word_id)
+        self._dispose(w)
+
+    def _on_current_changed(self, index: int):
+        if self._swapping or index < 0:
+            return
+        w = self.tabs.widget(index)
+        if isinstance(w, _PagePlaceholder):
+            page = self.page_factory(w.word_id)
+            if page is None:
+                self.close_tab(index)
+                return
+            page.restore_state(w.state)
+            self._replace(index, page)
+            w.deleteLater()
+        word_id = self._word_id_of(self.tabs.widget(index))
+        if word_id is not None:
+            self._touch(word_id)
+        self._evict_excess()
+
+    def _touch(self, word_id: int):
+        self._lru.pop(word_id, None)
+        self._lru[word_id] = None
+
+    def _evict_excess(self):
+        if len(self._lru) <= self.max_live:
+            return
+        current = self._word_id_of(self.tabs.currentWidget())
+        for word_id in list(self._lru):
+            if len(self._lru) <= self.max_live:
+                break
+            if word_id == current:
+                continue
+            i = self.index_of(word_id)
+            if i < 0:
+                self._lru.pop(word_id, None)
+                continue
+            self.evict(i)
+
+    def evict(self, index: int) -> bool:
+        page = self.tabs.widget(index)
+        if page is None or isinstance(page, _PagePlaceholder):
+            return False
+        if page.is_busy():
+            return False  # AI isteği sürerken sayfayı bellekten atma
+        ph = _PagePlaceholder(page.word.id, page.capture_state())
+        self._lru.pop(page.word.id, None)
+        self._replace(index, ph)
+        self._release(page.word.id)
+        self._dispose(page)
+        return True
+
+    def _release(self, word_id: Optional[int]):
+        if word_id is not None and self.on_release:
+            self.on_release(word_id)
+
+    def _replace(self, index: int, widget: QWidget):
+        title = self.tabs.tabText(index)
+        current = self.tabs.currentIndex()
+        self._swapping = True
+        try:
+            self.tabs.removeTab(index)
+            self.tabs.insertTab(index, widget, title)
+            self.tabs.setCurrentIndex(current)
+        finally:
+            self._swapping = False
+
+    def _dispose(self, widget: QWidget):
+        if getattr(widget, "is_busy", None) and widget.is_busy():
+            # Worker thread'leri bitene kadar silmeyi ertele
+            QTimer.singleShot(500, lambda: self._dispose(widget))
+            return
+        widget.deleteLater()
@@ -1,9 +1,11 @@
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QTextEdit, QHBoxLayout, QLineEdit, QPushButton,
-    QListWidget, QListWidgetItem, QMessageBox, QSplitter
+    QListView, QMessageBox, QSplitter, QDialog, QListWidget, QDialogButtonBox
 )
-from PySide6.QtCore import Signal, Qt, QThread
-from PySide6.QtGui import QGuiApplication
+from PySide6.QtCore import Signal, Qt, QThread, QTimer
+from PySide6.QtGui import QGuiApplication, QKeySequence, QShortcut
+from ..services.maintenance_service import MaintenanceService
+from .list_models import ExampleListModel, ExerciseListModel, CompactRowDelegate, RowRole
 
 
 class _AiGenWorker(QThread):
@@ -45,6 +47,28 @@ class _AiScoreWorker(QThread):
             self.failed.emit(str(e))
 
 
+class _ArchiveDialog(QDialog):
+    """Kelimenin arşivdeki (eski) örnek ve görevleri; salt okunur."""
+
+    def __init__(self, word, rows: dict, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(f"Arşiv — {word.term_en}")
+        self.resize(640, 420)
+        lay = QVBoxLayout(self)
+        lst = QListWidget(self)
+        lst.setWordWrap(True)
+        for r in rows["examples"]:
+            score = f"  [{r['score']}/10]" if r.get("score") is not None else ""
+            lst.addItem(f"{(r.get('created_at') or '')[:10]}  {r['text']}{score}")
+        for r in rows["exercises"]:
+            answer = f" → {r['user_answer']}" if r.get("user_answer") else ""
+            lst.addItem(f"{(r.get('created_at') or '')[:10]}  Görev ({r.get('direction')}): {r['sentence']}{answer}")
+        lay.addWidget(lst)
+        buttons = QDialogButtonBox(QDialogButtonBox.Close, parent=self)
+        buttons.rejected.connect(self.reject)
+        lay.addWidget(buttons)
+
+
 class WordPage(QWidget):
     notesChanged = Signal(int, str)  # word_id, notes
     markLearned = Signal(int, bool)  # word_id, learned
@@ -91,15 +115,23 @@ class WordPage(QWidget):
         self.txtNotes.setMaximumHeight(90)  # daha küçük alan
         l.addWidget(self.txtNotes)
 
+        row_avg = QHBoxLayout()
         self.lblAvg = QLabel("Ortalama: -")
-        l.addWidget(self.lblAvg)
+        # Arşivlenen eski örnekler listede yok ama ortalamada sayılır; buradan görülür
+        self.btnArchive = QPushButton("Arşiv")
+        self.btnArchive.setFlat(True)
+        self.btnArchive.clicked.connect(self._show_archive)
+        self.btnArchive.hide()
+        row_avg.addWidget(self.lblAvg)
+        row_avg.addStretch(1)
+        row_avg.addWidget(self.btnArchive)
+        l.addLayout(row_avg)
 
         l.addWidget(QLabel("Örnek Cümleler"))
-        self.examplesList = QListWidget(self)
-        self.examplesList.setSpacing(0)
-        self.examplesList.setStyleSheet(
-            "QListWidget::item{ margin:0px; }"
+        self.examplesModel = ExampleListModel(
+            lambda limit, after: self.service.list_examples_page(self.word.id, limit=limit, after=after), self
         )
+        self.examplesList = self._make_list_view(self.examplesModel)
         l.addWidget(self.examplesList, 1)
 
         row_manual = QHBoxLayout()
@@ -129,10 +161,11 @@ class WordPage(QWidget):
         row_ai.addWidget(self.btnGenEN)
         r.addLayout(row_ai)
 
-        self.exList = QListWidget(self)
-        self.exList.setSpacing(0)
-        self.exList.setStyleSheet("QListWidget::item{ margin:0px; }")
-        self.exList.itemSelectionChanged.connect(self._on_exercise_selected)
+        self.exModel = ExerciseListModel(
+            lambda limit, after: self.service.list_exercises_page(self.word.id, limit=limit, after=after), self
+        )
+        self.exList = self._make_list_view(self.exModel)
+        self.exList.selectionModel().selectionChanged.connect(self._on_exercise_selected)
         r.addWidget(self.exList, 1)
 
         self.answerInput = QTextEdit(self)
@@ -156,6 +189,44 @@ class WordPage(QWidget):
         self.exampleInput.setEnabled(True)
         self.btnAddExample.setEnabled(True)
 
+    # ---------- lifecycle (TabManager) ----------
+    def is_busy(self) -> bool:
+        return any(w is not None and w.isRunning() for w in (self._gen_worker, self._score_worker))
+
+    def capture_state(self) -> dict:
+        """Sekme bellekten çıkarılırken korunacak görünüm durumu + taslaklar."""
+        return {
+            "examples_rows": self.examplesModel.rowCount(),
+            "examples_scroll": self.examplesList.verticalScrollBar().value(),
+            "exercises_rows": self.exModel.rowCount(),
+            "exercises_scroll": self.exList.verticalScrollBar().value(),
+            "selected_exercise_id": self._selected_exercise_id,
+            "answer_draft": self.answerInput.toPlainText(),
+            "example_draft": self.exampleInput.text(),
+        }
+
+    def restore_state(self, state: dict):
+        for model, rows in ((self.examplesModel, state.get("examples_rows", 0)),
+                            (self.exModel, state.get("exercises_rows", 0))):
+            while model.rowCount() < rows and model.canFetchMore():
+                model.fetchMore()
+        sel_id = state.get("selected_exercise_id")
+        if sel_id is not None:
+            for i in range(self.exModel.rowCount()):
+                idx = self.exModel.index(i)
+                if idx.data(Qt.UserRole) == sel_id:
+                    self.exList.setCurrentIndex(idx)
+                    break
+        self.answerInput.setPlainText(state.get("answer_draft", ""))
+        self.exampleInput.setText(state.get("example_draft", ""))
+        # Kaydırma, satır yerleşimi bittikten sonra uygulanmalı
+        ex_scroll = state.get("examples_scroll", 0)
+        task_scroll = state.get("exercises_scroll", 0)
+        QTimer.singleShot(0, lambda: (
+            self.examplesList.verticalScrollBar().setValue(ex_scroll),
+            self.exList.verticalScrollBar().setValue(task_scroll),
+        ))
+
     # ---------- helpers ----------
     def _apply_learned_badge(self):
         if self.word.is_learned:
@@ -177,85 +248,67 @@ class WordPage(QWidget):
         self.btnToggleLearned.setText("Öğrenildi olarak işaretle" if not self.word.is_learned else "Öğrenilmediye geri al")
         self._apply_learned_badge()
 
-    # ---- compact row builders ----
-    def _compact_label(self, text: str, left_color: str = "#2e2e2e") -> QLabel:
-        lbl = QLabel(text)
-        lbl.setWordWrap(True)
-        lbl.setTextInteractionFlags(Qt.TextSelectableByMouse)
-        # Çok ince satır + alt çizgi + sol çizgi + ufak font
-        lbl.setStyleSheet(
-            f"font-size:12px; padding: 1px 6px; border-left: 2px solid {left_color}; border-bottom: 1px solid #2a2a2a;"
-        )
-        return lbl
-
-    def _make_example_item(self, ex) -> QWidget:
-        # Sadece skor (varsa başta) + kullanıcı cümlesi
-        if getattr(ex, "origin", "MANUAL") == "AI" and getattr(ex, "score", None) is not None:
-            head = f"{ex.score}/10  •  "
-            color = "#3b82f6"  # mavi sol çizgi
-        else:
-            head = ""
-            color = "#444444"  # skorsuz gri
-        w = QWidget(self)
-        h = QHBoxLayout(w)
-        h.setContentsMargins(0, 0, 0, 0)
-        h.setSpacing(0)
-        lbl = self._compact_label(f"{head}{ex.text}", left_color=color)
-        h.addWidget(lbl)
-        return w
+    # ---- compact lists (model + delegate, satır başına widget yok) ----
+    def _make_list_view(self, model) -> QListView:
+        view = QListView(self)
+        view.setModel(model)
+        view.setItemDelegate(CompactRowDelegate(view))
+        view.setSpacing(0)
+        view.setWordWrap(True)
+        view.setUniformItemSizes(False)
+        view.setResizeMode(QListView.Adjust)
+        view.setLayoutMode(QListView.Batched)
+        view.setBatchSize(50)
+        view.setVerticalScrollMode(QListView.ScrollPerPixel)
+        copy = QShortcut(QKeySequence.Copy, view)
+        copy.setContext(Qt.WidgetShortcut)
+        copy.activated.connect(lambda: self._copy_selected(view))
+        return view
+
+    def _copy_selected(self, view: QListView):
+        idx = view.currentIndex()
+        if idx.isValid():
+            QGuiApplication.clipboard().setText(idx.data(Qt.DisplayRole) or "")
+
+    def _refresh_avg(self, avg: float = None):
+        if avg is None:
+            avg = self.service.get_avg_score(self.word.id)
+        text = f"Ortalama: {avg:.2f}/10" if avg > 0 else "Ortalama: -"
+        if avg > 0 and not self.btnArchive.isHidden():
+            text += " (arşiv dahil)"
+        self.lblAvg.setText(text)
+
+    def _refresh_archive(self):
+        counts = MaintenanceService().archived_counts(self.word.id)
+        n = counts["example"] + counts["exercise"]
+        self.btnArchive.setText(f"Arşiv ({n})")
+        self.btnArchive.setVisible(n > 0)
+
+    def _show_archive(self):
+        _ArchiveDialog(self.word, MaintenanceService().archived(self.word.id), self).exec()
 
     def refresh_examples(self):
-        self.examplesList.clear()
-        examples = self.service.list_examples(self.word.id)
-        for ex in examples:
-            widget = self._make_example_item(ex)
-            item = QListWidgetItem(self.examplesList)
-            item.setSizeHint(widget.sizeHint())
-            self.examplesList.addItem(item)
-            self.examplesList.setItemWidget(item, widget)
-        avg = self.service.get_avg_score(self.word.id)
-        self.lblAvg.setText(f"Ortalama: {avg:.2f}/10" if avg > 0 else "Ortalama: -")
-
-    def _make_exercise_item(self, ex) -> QWidget:
-        tag = "[TR]" if ex.direction == "TR" else "[EN]"
-        score_head = f"{ex.score}/10  •  " if ex.score is not None else ""
-        text = f"{tag}  {score_head}{ex.sentence}"
-        w = QWidget(self)
-        h = QHBoxLayout(w)
-        h.setContentsMargins(0, 0, 0, 0)
-        h.setSpacing(0)
-        lbl = self._compact_label(text, left_color="#94a3b8")  # nötr sol çizgi
-        h.addWidget(lbl)
-        return w
+        self.examplesModel.reload()
+        self._refresh_archive()
+        self._refresh_avg()
 
     # ---- exercises ----
     def refresh_exercises(self):
-        self.exList.clear()
-        for ex in self.service.list_exercises(self.word.id):
-            widget = self._make_exercise_item(ex)
-            item = QListWidgetItem(self.exList)
-            item.setSizeHint(widget.sizeHint())
-            item.setData(Qt.UserRole, ex.id)  # seçim için id
-            self.exList.addItem(item)
-            self.exList.setItemWidget(item, widget)
-
-    def _on_exercise_selected(self):
-        items = self.exList.selectedItems()
-        if not items:
+        self.exModel.reload()
+
+    def _on_exercise_selected(self, *_):
+        rows = self.exList.selectionModel().selectedRows()
+        if not rows:
             self._selected_exercise_id = None
             self.answerInput.clear()
             self.lblScore.setText("")
             self.exampleInput.setEnabled(True)
             self.btnAddExample.setEnabled(True)
             return
-        it = items[0]
-        self._selected_exercise_id = it.data(Qt.UserRole)
-        ex_id = int(self._selected_exercise_id)
-        for ex in self.service.list_exercises(self.word.id):
-            if ex.id == ex_id:
-                self.answerInput.setText(ex.user_answer or "")
-                self.lblScore.setText(f"Skor: {ex.score}/10 — {ex.feedback}" if ex.score is not None else "")
-                break
+        ex = rows[0].data(RowRole)
+        self._selected_exercise_id = ex.id
+        self.answerInput.setText(ex.user_answer or "")
+        self.lblScore.setText(f"Skor: {ex.score}/10 — {ex.feedback}" if ex.score is not None else "")
         self.exampleInput.setEnabled(False)
         self.btnAddExample.setEnabled(False)
 
@@ -269,7 +322,7 @@ class WordPage(QWidget):
     def _start_gen(self, direction: str):
         self._set_busy(True)
         self._gen_worker = _AiGenWorker(self.service, self.word.id, direction)
-        self._gen_worker.finished.connect(lambda exid: (self._set_busy(False), self.refresh_exercises()))
+        self._gen_worker.finished.connect(lambda exid: (self._set_busy(False), self.exModel.prepend_new()))
         self._gen_worker.failed.connect(lambda err: (self._set_busy(False), QMessageBox.warning(self, "AI", f"Görev oluşturulamadı: {err}")))
         self._gen_worker.start()
 
@@ -290,10 +343,14 @@ class WordPage(QWidget):
     def _on_scored(self, score: int, feedback: str):
         self._set_busy(False)
         self.lblScore.setText(f"Skor: {score}/10 — {feedback}")
-        self.refresh_exercises()
-        self.refresh_examples()
+        # Listeleri temizlemeden: puanlanan görevi yerinde güncelle, yeni örneği başa ekle
+        ex = self.service.get_exercise(self._score_worker.exercise_id)
+        if ex:
+            self.exModel.update_row(ex)
+        self.examplesModel.prepend_new()
         w = self.service.repo.get_word(self.word.id)
         if w:
+            self._refresh_avg(w.avg_score)
             self.word.is_learned = w.is_learned
             self.lblLearned.setText("Öğrenildi: Evet" if w.is_learned else "Öğrenildi: Hayır")
             self.btnToggleLearned.setText("Öğrenildi olarak işaretle" if not w.is_learned else "Öğrenilmediye geri al")
@@ -308,4 +365,4 @@ class WordPage(QWidget):
             return
         self.service.add_example_manual(self.word.id, text)
         self.exampleInput.clear()
-        self.refresh_examples()
+        self.examplesModel.prepend_new()
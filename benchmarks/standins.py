@@ -0,0 +1,433 @@
+"""
+Ağsız geliştirme/yük testi için yerel sağlayıcı taklitleri: OpenAI uyumlu chat-completions
+(OpenRouter yerine) ve DeepL v2 translate/usage, tek portta.
+
+    python -m benchmarks.standins --port 8787 --latency lognormal:120,0.6 --error-rate 0.05 --rate-429 0.05
+    OPENROUTER_BASE_URL=http://127.0.0.1:8787/v1 DEEPL_SERVER_URL=http://127.0.0.1:8787 \\
+        OPENROUTER_API_KEY=x DEEPL_API_KEY=x:fx python -m app.main
+
+Yanıtlar istek içeriğinden deterministik üretilir (aynı prompt → aynı cümle/puan); hata
+seçimi `--seed` ile tekrarlanabilir. Uç noktalar:
+    POST /v1/chat/completions (ve /api/v1/...)   POST /v2/translate   GET|POST /v2/usage
+    GET  /_stats   (istek/hata sayıları, en yüksek eşzamanlılık)   POST /_config  {"chat": {...}, "deepl": {...}}
+
+Programdan (benchmark'lar):
+    with StandIn(chat=Faults(latency="uniform:20,80", empty_rate=0.1)) as s:
+        os.environ.update(s.env())
+        ...
+        s.stats()
+
+Gecikme: "fixed:MS", "uniform:A,B", "normal:ORT,SAPMA", "lognormal:MEDYAN,SIGMA" (ms).
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass, field, fields
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 429: "Too Many Requests",
+            456: "Quota Exceeded", 500: "Internal Server Error", 503: "Service Unavailable"}
+DEEPL_QUOTA = 500_000  # DeepL Free
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """Gecikme tanımı → rng alıp saniye döndüren fonksiyon."""
+    kind, _, args = (spec or "fixed:0").partition(":")
+    vals = [float(v) for v in args.split(",") if v.strip()] or [0.0]
+    if kind == "fixed":
+        return lambda rng: vals[0] / 1000
+    if kind == "uniform":
+        return lambda rng: rng.uniform(vals[0], vals[1]) / 1000
+    if kind == "normal":
+        return lambda rng: max(0.0, rng.gauss(vals[0], vals[1])) / 1000
+    if kind == "lognormal":
+        return lambda rng: rng.lognormvariate(math.log(max(vals[0], 1e-3)), vals[1]) / 1000
+    raise ValueError(f"bilinmeyen gecikme dağılımı: {spec}")
+
+
+@dataclass
+class Faults:
+    """Bir sağlayıcıya uygulanan gecikme ve hata oranları (0-1)."""
+    latency: str = "fixed:0"
+    error_rate: float = 0.0      # 500/503
+    rate_429: float = 0.0        # rastgele 429 (Retry-After ile)
+    retry_after: float = 1.0     # 429 yanıtındaki Retry-After (sn)
+    max_rps: float = 0.0         # sunucu tarafı hız sınırı; aşan istek 429 (0: yok)
+    empty_rate: float = 0.0      # chat: boş içerik
+    malformed_rate: float = 0.0  # chat: puanlama JSON'u yarım/bozuk
+    fail_models: Tuple[str, ...] = ()  # chat: bu modeller her zaman 503 (fallback yolu)
+    quota: int = DEEPL_QUOTA     # deepl: dönem karakter limiti, aşınca 456 (0: yok)
+    _latency_fn: Callable = field(default=None, init=False, repr=False, compare=False)
+    _tokens: float = field(default=0.0, init=False, repr=False, compare=False)
+    _stamp: float = field(default=0.0, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.fail_models = tuple(self.fail_models)
+        self._latency_fn = parse_latency(self.latency)
+        self._tokens, self._stamp = max(1.0, self.max_rps), time.monotonic()
+
+    def delay(self, rng: random.Random) -> float:
+        return self._latency_fn(rng)
+
+    def over_rate(self) -> bool:
+        if self.max_rps <= 0:
+            return False
+        now = time.monotonic()
+        self._tokens = min(max(1.0, self.max_rps), self._tokens + (now - self._stamp) * self.max_rps)
+        self._stamp = now
+        if self._tokens < 1:
+            return True
+        self._tokens -= 1
+        return False
+
+    def public(self) -> dict:
+        return {k: v for k, v in asdict(self).items() if not k.startswith("_")}
+
+    def update(self, values: dict) -> "Faults":
+        known = {f.name for f in fields(self) if not f.name.startswith("_")}
+        return Faults(**{**self.public(), **{k: v for k, v in values.items() if k in known}})
+
+
+def _digest(*parts: str) -> int:
+    return int.from_bytes(hashlib.blake2b("\x1f".join(parts).encode("utf-8"), digest_size=8).digest(), "big")
+
+
+_TR_PROMPT = re.compile(r"İngilizce kelime: '(.+?)'\. Türkçe karşılığı: '(.+?)'")
+_EN_PROMPT = re.compile(r"Target English word: '(.+?)'\. Its Turkish meaning: '(.+?)'")
+_GRADE_PROMPT = re.compile(r"User translation \((\w+)\): (.*)")
+_TR_TEMPLATES = (
+    "Yıllar süren tartışmalara rağmen kurul, {w} kavramının gündelik hayattaki karşılığını hâlâ netleştirememişti.",
+    "Eleştirmenlerin {w} üzerine yazdıkları, okurun beklediği açıklığı sunmaktan çok yeni soruların kapısını araladı.",
+    "Herkesin kolayca görmezden geldiği {w}, aslında projenin neden beklenenden uzun sürdüğünü açıklıyordu.",
+)
+_EN_TEMPLATES = (
+    "Although the committee had debated it for years, the notion of {w} still lacked a clear everyday meaning.",
+    "What critics wrote about {w} raised more questions than it answered, despite the readers' expectations.",
+    "The {w} that everyone conveniently ignored actually explained why the project had taken so much longer.",
+)
+
+
+def chat_content(messages: list) -> str:
+    """Uygulamanın prompt'larına deterministik cevap (puanlama JSON'u veya tek cümle)."""
+    text = "\n".join(str(m.get("content", "")) for m in messages if isinstance(m, dict))
+    h = _digest(text)
+    m = _GRADE_PROMPT.search(text)
+    if m:
+        lang, answer = m.group(1), m.group(2).strip()
+        score = (_digest(answer) % 8) + 3
+        better = f"{answer} (natural)" if lang == "English" else f"{answer} (doğal)"
+        return json.dumps({"score": score, "feedback": "Anlam büyük ölçüde korunmuş, ifade biraz zorlama.",
+                           "better": better}, ensure_ascii=False)
+    m = _TR_PROMPT.search(text)
+    if m:
+        return _TR_TEMPLATES[h % len(_TR_TEMPLATES)].format(w=m.group(2))
+    m = _EN_PROMPT.search(text)
+    if m:
+        return _EN_TEMPLATES[h % len(_EN_TEMPLATES)].format(w=m.group(1))
+    return "ok"
+
+
+def translate_text(text: str) -> str:
+    return f"{text} (tr)"
+
+
+class StandIn:
+    def __init__(self, chat: Optional[Faults] = None, deepl: Optional[Faults] = None, seed: int = 0):
+        self.faults: Dict[str, Faults] = {"chat": chat or Faults(), "deepl": deepl or Faults()}
+        self.rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._counts: Dict[str, int] = {}
+        self.chars = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._server = None
+        self._writers: set = set()
+        self.url: Optional[str] = None
+
+    # ---- stats / config ----
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._counts[key] = self._counts.get(key, 0) + 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"counts": dict(sorted(self._counts.items())), "deepl_chars": self.chars,
+                    "in_flight": self.in_flight, "peak_in_flight": self.peak_in_flight,
+                    "faults": {k: f.public() for k, f in self.faults.items()}}
+
+    def configure(self, **providers: dict) -> None:
+        """configure(chat={"error_rate": 0.2}) — çalışırken hata oranlarını değiştirir."""
+        with self._lock:
+            for name, values in providers.items():
+                if name in self.faults and isinstance(values, dict):
+                    self.faults[name] = self.faults[name].update(values)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts.clear()
+            self.chars = 0
+            self.peak_in_flight = self.in_flight
+
+    def env(self) -> Dict[str, str]:
+        """Uygulamayı bu sunucuya yönlendiren ortam değişkenleri."""
+        return {"OPENROUTER_BASE_URL": f"{self.url}/v1", "DEEPL_SERVER_URL": self.url,
+                "OPENROUTER_API_KEY": "standin", "DEEPL_API_KEY": "standin:fx"}
+
+    # ---- endpoints ----
+    def _pick(self, provider: str) -> Tuple[Faults, float, float]:
+        """(hata ayarı, bu isteğin hata zarı 0-1, gecikme sn)"""
+        with self._lock:
+            return self.faults[provider], self.rng.random(), self.faults[provider].delay(self.rng)
+
+    def _common_fault(self, provider: str, f: Faults, u: float) -> Optional[Tuple[int, Any, dict]]:
+        if u < f.error_rate:
+            self._count(f"{provider}.error")
+            return (503 if u < f.error_rate / 2 else 500), {"message": "stand-in: injected error"}, {}
+        with self._lock:
+            limited = f.over_rate()
+        if limited or u < f.error_rate + f.rate_429:
+            self._count(f"{provider}.429")
+            return 429, {"message": "stand-in: too many requests"}, {"Retry-After": f"{f.retry_after:g}"}
+        return None
+
+    def chat(self, body: dict, f: Faults, u: float) -> Tuple[int, Any, dict]:
+        model = str(body.get("model") or "standin")
+        self._count("chat.requests")
+        if model in f.fail_models:
+            self._count("chat.model_down")
+            return 503, {"error": {"message": f"stand-in: {model} unavailable"}}, {}
+        fault = self._common_fault("chat", f, u)
+        if fault:
+            status, payload, headers = fault
+            return status, {"error": payload}, headers
+        content = chat_content(body.get("messages") or [])
+        v = (u - f.error_rate - f.rate_429) / max(1e-9, 1 - f.error_rate - f.rate_429)  # kalan aralıkta yeniden ölçekle
+        if v < f.empty_rate:
+            self._count("chat.empty")
+            content = ""
+        elif v < f.empty_rate + f.malformed_rate:
+            self._count("chat.malformed")
+            content = content[:max(1, len(content) // 2)] if content.startswith("{") else "{" + content
+        self._count("chat.ok")
+        words = sum(len(str(m.get("content", "")).split()) for m in body.get("messages") or [] if isinstance(m, dict))
+        return 200, {
+            "id": f"standin-{_digest(content, model):x}", "object": "chat.completion", "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}],
+            "usage": {"prompt_tokens": words, "completion_tokens": len(content.split()),
+                      "total_tokens": words + len(content.split())},
+        }, {}
+
+    def deepl_translate(self, body: dict, f: Faults, u: float) -> Tuple[int, Any, dict]:
+        self._count("deepl.requests")
+        texts = body.get("text") or []
+        texts = [texts] if isinstance(texts, str) else [str(t) for t in texts]
+        if not texts or not body.get("target_lang"):
+            return 400, {"message": "text ve target_lang gerekli"}, {}
+        fault = self._common_fault("deepl", f, u)
+        if fault:
+            return fault
+        n = sum(len(t) for t in texts)
+        with self._lock:
+            if f.quota and self.chars + n > f.quota:
+                self._counts["deepl.quota"] = self._counts.get("deepl.quota", 0) + 1
+                return 456, {"message": "Quota exceeded"}, {}
+            self.chars += n
+        self._count("deepl.ok")
+        source = str(body.get("source_lang") or "EN").upper()
+        return 200, {"translations": [{"detected_source_language": source, "text": translate_text(t),
+                                       "billed_characters": len(t)} for t in texts]}, {}
+
+    def deepl_usage(self, body: dict) -> Tuple[int, Any, dict]:
+        self._count("deepl.usage")
+        f = self.faults["deepl"]
+        return 200, {"character_count": self.chars, "character_limit": f.quota or 10 ** 12}, {}
+
+    def _config(self, body: dict) -> Tuple[int, Any, dict]:
+        self.configure(**body)
+        return 200, self.stats()["faults"], {}
+
+    def _reset(self, body: dict) -> Tuple[int, Any, dict]:
+        self.reset()
+        return 200, {}, {}
+
+    def route(self, method: str, path: str) -> Tuple[Optional[str], Optional[Callable]]:
+        """(sağlayıcı — gecikme/hata ayarı için, işleyici) ya da (None, None)."""
+        path = path.rstrip("/")
+        if method == "POST" and path in ("/v1/chat/completions", "/api/v1/chat/completions"):
+            return "chat", self.chat
+        if method == "POST" and path == "/v2/translate":
+            return "deepl", self.deepl_translate
+        if path == "/v2/usage":
+            return None, self.deepl_usage
+        if method == "GET" and path == "/_stats":
+            return None, lambda body: (200, self.stats(), {})
+        if method == "POST" and path == "/_config":
+            return None, self._config
+        if method == "POST" and path == "/_reset":
+            return None, self._reset
+        return None, None
+
+    # ---- HTTP ----
+    @staticmethod
+    def _body(headers: dict, raw: bytes, query: str) -> dict:
+        ctype = headers.get("content-type", "")
+        if "json" in ctype:
+            return json.loads(raw) if raw else {}
+        # DeepL SDK'nın eski sürümleri form gönderir; text birden çok kez gelebilir
+        form = parse_qs(raw.decode("utf-8") if raw else query)
+        return {k: (v if k == "text" else v[0]) for k, v in form.items()}
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._writers.add(writer)
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = lines[0].split(" ", 2)
+                except ValueError:
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    if ":" in line:
+                        k, v = line.split(":", 1)
+                        headers[k.strip().lower()] = v.strip()
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                length = int(headers.get("content-length") or 0)
+                raw = await reader.readexactly(length) if length else b""
+                status, payload, extra = await self._respond(method.upper(), target, headers, raw)
+                await self._send(writer, status, payload, extra, keep_alive)
+                if not keep_alive:
+                    break
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    async def _respond(self, method: str, target: str, headers: dict, raw: bytes) -> Tuple[int, Any, dict]:
+        parts = urlsplit(target)
+        try:
+            body = self._body(headers, raw, parts.query)
+        except ValueError:
+            return 400, {"error": {"message": "geçersiz JSON"}}, {}
+        provider, handler = self.route(method, parts.path)
+        if handler is None:
+            return 404, {"error": {"message": f"{method} {parts.path} yok"}}, {}
+        body = body if isinstance(body, dict) else {}
+        with self._lock:
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            if provider is None:
+                return handler(body)
+            f, u, delay = self._pick(provider)
+            if delay > 0:
+                await asyncio.sleep(delay)  # yalnızca bu bağlantı bekler; diğer istekler sürer
+            return handler(body, f, u)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    @staticmethod
+    async def _send(writer: asyncio.StreamWriter, status: int, payload: Any, extra: dict, keep_alive: bool) -> None:
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        head = (f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+                f"Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(data)}\r\n"
+                + "".join(f"{k}: {v}\r\n" for k, v in extra.items())
+                + f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + data)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+    async def serve(self, host: str, port: int) -> None:
+        server = await asyncio.start_server(self.handle, host, port)
+        addrs = ", ".join(str(s.getsockname()) for s in server.sockets)
+        print(f"dinleniyor: {addrs}", file=sys.stderr)
+        async with server:
+            await server.serve_forever()
+
+    # ---- arka plan thread'inde (benchmark'lar) ----
+    def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        ready = threading.Event()
+
+        def run() -> None:
+            self._loop = asyncio.new_event_loop()
+            self._server = self._loop.run_until_complete(asyncio.start_server(self.handle, host, port))
+            bound = self._server.sockets[0].getsockname()
+            self.url = f"http://{bound[0]}:{bound[1]}"
+            ready.set()
+            self._loop.run_forever()
+            self._server.close()
+            for writer in list(self._writers):  # açık keep-alive bağlantıları: okuma EOF ile biter
+                writer.close()
+            self._loop.run_until_complete(asyncio.gather(*asyncio.all_tasks(self._loop), return_exceptions=True))
+            self._loop.close()
+
+        self._thread = threading.Thread(target=run, name="standin", daemon=True)
+        self._thread.start()
+        ready.wait(10)
+        return self.url
+
+    def stop(self) -> None:
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(10)
+            self._loop = None
+
+    def __enter__(self) -> "StandIn":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main(argv=None) -> int:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8787)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--latency", default="fixed:0", help="her iki sağlayıcı için (ms)")
+    p.add_argument("--error-rate", type=float, default=0.0)
+    p.add_argument("--rate-429", type=float, default=0.0)
+    p.add_argument("--retry-after", type=float, default=1.0)
+    p.add_argument("--max-rps", type=float, default=0.0, help="sağlayıcı başına; aşan istek 429")
+    p.add_argument("--empty-rate", type=float, default=0.0, help="chat: boş içerik")
+    p.add_argument("--malformed-rate", type=float, default=0.0, help="chat: bozuk puanlama JSON'u")
+    p.add_argument("--fail-model", action="append", default=[], help="chat: bu model hep 503 (tekrarlanabilir)")
+    p.add_argument("--deepl-quota", type=int, default=DEEPL_QUOTA, help="karakter; aşınca 456 (0: yok)")
+    args = p.parse_args(argv)
+
+    common = dict(latency=args.latency, error_rate=args.error_rate, rate_429=args.rate_429,
+                  retry_after=args.retry_after, max_rps=args.max_rps)
+    standin = StandIn(
+        chat=Faults(**common, empty_rate=args.empty_rate, malformed_rate=args.malformed_rate,
+                    fail_models=tuple(args.fail_model), quota=0),
+        deepl=Faults(**common, quota=args.deepl_quota),
+        seed=args.seed,
+    )
+    try:
+        asyncio.run(standin.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
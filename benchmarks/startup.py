@@ -0,0 +1,150 @@
+"""
+Açılış süresi ölçümü: import maliyeti ve ilk pencereye kadar geçen süre.
+
+Her ölçüm taze bir Python sürecinde yapılır (soğuk import). İki senaryo:
+  qt    — yalnızca QApplication + boş QMainWindow, ilk boyamaya kadar (alt sınır)
+  app   — MainWindow, ilk boyama ve ertelenmiş kütüphane yüklemesinin bitişi
+
+    python -m benchmarks.startup --words 5000 --repeat 5
+    python -m benchmarks.startup --json
+
+Ek olarak `python -X importtime` ile app.ui.main_window import ağacında ağır
+modüllerin (openai, deepl, numpy) yüklenip yüklenmediği raporlanır.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+HEAVY_MODULES = ("openai", "deepl", "numpy", "PySide6.QtWidgets")
+
+
+def _child(scenario: str, db: str) -> dict:
+    t0 = time.perf_counter()
+    marks = {}
+    from PySide6.QtCore import QEvent, QObject, QTimer
+    from PySide6.QtWidgets import QApplication, QMainWindow
+    app = QApplication([])
+    marks["qt_import_ms"] = (time.perf_counter() - t0) * 1000
+
+    if scenario == "qt":
+        win = QMainWindow()
+    else:
+        from app.core import database
+        database.DB_PATH = Path(db)
+        from app.ui.main_window import MainWindow
+        marks["app_import_ms"] = (time.perf_counter() - t0) * 1000
+        win = MainWindow()
+        load = win._initial_load
+
+        def _timed_load():
+            load()
+            marks["library_loaded_ms"] = (time.perf_counter() - t0) * 1000
+            QTimer.singleShot(0, app.quit)
+        win._initial_load = _timed_load
+    marks["constructed_ms"] = (time.perf_counter() - t0) * 1000
+
+    class _FirstPaint(QObject):
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Paint and "first_paint_ms" not in marks:
+                marks["first_paint_ms"] = (time.perf_counter() - t0) * 1000
+                if scenario == "qt":
+                    QTimer.singleShot(0, app.quit)
+            return False
+
+    spy = _FirstPaint()
+    app.installEventFilter(spy)
+    win.show()
+    QTimer.singleShot(10000, app.quit)  # emniyet
+    app.exec()
+    marks["heavy_loaded"] = sorted(m for m in HEAVY_MODULES[:-1] if m in sys.modules)
+    return marks
+
+
+def _run_child(scenario: str, db: str) -> dict:
+    env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen"))
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.startup", "--child", scenario, "--db", db],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def _import_times() -> dict:
+    """-X importtime çıktısından ağır modüllerin kümülatif import süresi (ms); yüklenmediyse yok."""
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.ui.main_window"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in out.stderr.splitlines():
+        parts = [p.strip() for p in line.split("|")]
+        if len(parts) == 3 and parts[2] in HEAVY_MODULES + ("app.ui.main_window",):
+            times[parts[2]] = int(parts[1]) / 1000
+    return times
+
+
+def _seed(db: str, words: int) -> None:
+    from app.core import database
+    database.DB_PATH = Path(db)
+    from app.services.word_service import WordService
+    groups = [f"Book {i}" for i in range(20)] + [None]
+    WordService().import_words((f"term{i}", f"karşılık{i}", groups[i % len(groups)]) for i in range(words))
+
+
+def main(argv=None) -> int:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--words", type=int, default=2000, help="sentetik kütüphane boyutu")
+    p.add_argument("--repeat", type=int, default=5)
+    p.add_argument("--json", action="store_true")
+    p.add_argument("--child", choices=("qt", "app"), help=argparse.SUPPRESS)
+    p.add_argument("--db", help=argparse.SUPPRESS)
+    args = p.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(_child(args.child, args.db)))
+        return 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = str(Path(tmp) / "bench.sqlite3")
+        _seed(db, args.words)
+        runs = {s: [_run_child(s, db) for _ in range(args.repeat)] for s in ("qt", "app")}
+
+    def med(scenario, key):
+        vals = [r[key] for r in runs[scenario] if key in r]
+        return round(statistics.median(vals), 1) if vals else None
+
+    result = {
+        "words": args.words,
+        "repeat": args.repeat,
+        "qt_first_paint_ms": med("qt", "first_paint_ms"),
+        "app_import_ms": med("app", "app_import_ms"),
+        "app_constructed_ms": med("app", "constructed_ms"),
+        "app_first_paint_ms": med("app", "first_paint_ms"),
+        "app_library_loaded_ms": med("app", "library_loaded_ms"),
+        "heavy_loaded_at_startup": runs["app"][0]["heavy_loaded"],
+        "import_ms": _import_times(),
+    }
+    if args.json:
+        print(json.dumps(result))
+        return 0
+    print(f"kütüphane: {args.words} kelime, {args.repeat} tekrar (medyan, ms)")
+    print(f"  yalnızca Qt, ilk boyama      : {result['qt_first_paint_ms']}")
+    print(f"  app import bitti              : {result['app_import_ms']}")
+    print(f"  MainWindow kuruldu            : {result['app_constructed_ms']}")
+    print(f"  app ilk boyama                : {result['app_first_paint_ms']}")
+    print(f"  kütüphane yüklendi (ertelenen): {result['app_library_loaded_ms']}")
+    print(f"  açılışta yüklenen ağır modüller: {', '.join(result['heavy_loaded_at_startup']) or '-'}")
+    for mod, ms in sorted(result["import_ms"].items()):
+        print(f"  import {mod:<22}: {ms:.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
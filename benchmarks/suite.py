@@ -0,0 +1,680 @@
+"""
+Benchmark paketi: sentetik kütüphanelerde repository, WordService, arayüz ve açılış ölçümleri.
+
+Her boyut için önbellekteki sentetik kütüphanenin (bkz. benchmarks.synth) geçici bir
+kopyası üzerinde çalışır; önbellek hiç değişmez. Sırayla:
+  startup  — benchmarks.startup alt süreçleri (soğuk import, ilk boyama, kütüphane yükü)
+  read     — tüm repository okuma metotları
+  write    — tüm repository yazma metotları
+  service  — WordService işlemleri uçtan uca (AI ve çeviri sahte: ağ yok, anında cevap)
+  ui       — offscreen Qt: MainWindow.load_library, arama listesi, WordPage açılışı
+  maint    — bakım PRAGMA'ları ve VACUUM (en son; dosyayı yeniden yazar)
+
+Her ölçümde ilk çağrı ayrı tutulur (first_ms: soğuk önbellek, tembel indeks kurulumu),
+sonra süre bütçesi dolana kadar tekrarlanır: median/p95/min ve tekrar sayısı.
+
+    python -m benchmarks.suite --sizes 1k,100k --out bench.json
+    python -m benchmarks.suite --sizes 1k --baseline benchmarks/baseline.json --fail-on-regression
+    python -m benchmarks.suite --sizes 1k --save-baseline benchmarks/baseline.json
+    python -m benchmarks.suite --sizes 1k --backends standin   # gerçek istemciler, yerel taklit sunucu
+
+Karşılaştırma median_ms üzerindendir: oran > 1 + threshold ve fark > noise-ms ise gerileme.
+Baseline aynı makinede alınmalıdır; başka donanımda sayılar karşılaştırılamaz.
+"""
+import argparse
+import gc
+import inspect
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from . import synth
+
+ROOT = synth.ROOT
+GROUPS = ("startup", "read", "write", "service", "ui", "maint")
+BUDGET_S = 0.5          # ölçüm başına tekrar süresi (ilk çağrı hariç)
+MIN_RUNS = 3
+MAX_RUNS = 200
+SAMPLE = 500            # örnek kelime / görev / cevap sayısı
+STARTUP_RUNS = 3
+THRESHOLD = 0.25        # %25 yavaşlama gerileme sayılır
+NOISE_MS = 0.5          # bundan küçük mutlak farklar yok sayılır
+PREFIX = "zzbench"      # yazma ölçümlerinin eklediği terimler
+
+
+# ---- sahte dış servisler ----
+class FakeAI:
+    """AIClient yerine: ağsız, deterministik cümle ve puan (ölçülen yalnızca uygulama kodu)."""
+    model = "bench/fake"
+    fallback_model = None
+
+    def generate_tr_sentence(self, term_en: str, tr_word: str) -> str:
+        return f"Toplantıdan sonra {tr_word} konusunu yeniden konuştuk."
+
+    def generate_en_sentence(self, term_en: str, tr_word: str) -> str:
+        return f"After the meeting we talked about the {term_en} again."
+
+    def grade(self, direction: str, original_sentence: str, user_translation: str) -> Tuple[int, str, str]:
+        return len(user_translation) % 11, "Anlam korunmuş.", self.model
+
+
+class FakeTranslator:
+    def translate(self, text: str) -> str:
+        from .standins import translate_text
+        return translate_text(text)
+
+
+# ---- ölçüm ----
+@dataclass
+class Case:
+    name: str                              # "Sınıf.metot" veya "Sınıf.metot[varyant]"
+    fn: Callable[["Fixture", int], object]  # (fixture, tekrar no)
+    max_runs: int = MAX_RUNS
+
+
+def _stats(samples: List[float], first: float) -> dict:
+    ordered = sorted(samples) or [first]
+    return {
+        "first_ms": round(first, 3),
+        "median_ms": round(statistics.median(ordered), 3),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+        "min_ms": round(ordered[0], 3),
+        "n": len(samples),
+    }
+
+
+def measure(case: Case, fixture: "Fixture", budget: float = BUDGET_S, min_runs: int = MIN_RUNS,
+            max_runs: int = MAX_RUNS) -> dict:
+    """İlk çağrı + bütçe dolana kadar tekrar (ilk çağrı bütçeyi tek başına aştıysa tek tekrar)."""
+    gc.collect()
+    t0 = time.perf_counter()
+    case.fn(fixture, 0)
+    first = (time.perf_counter() - t0) * 1000
+    limit = min(max_runs, case.max_runs)
+    want = 1 if first / 1000 > budget else min_runs
+    samples: List[float] = []
+    spent = 0.0
+    while len(samples) < limit and (len(samples) < want or spent < budget):
+        t0 = time.perf_counter()
+        case.fn(fixture, len(samples) + 1)
+        dt = time.perf_counter() - t0
+        spent += dt
+        samples.append(dt * 1000)
+    return _stats(samples, first)
+
+
+def _drain(it) -> int:
+    n = 0
+    for _ in it:
+        n += 1
+    return n
+
+
+# ---- ölçülen DB'den örnek anahtarlar ----
+class Fixture:
+    """Ölçümlerin kullandığı tohumlu örnekler; tekrar no ile dönüşümlü seçilir."""
+
+    def __init__(self, seed: int = 0):
+        from app.core import database
+        rng = random.Random(seed)
+        conn = database.get_conn()
+        try:
+            q = lambda sql, params=(): conn.execute(sql, params).fetchall()
+            self.max_word = q("SELECT COALESCE(MAX(id), 0) FROM words")[0][0]
+            ids = sorted({rng.randint(1, self.max_word) for _ in range(SAMPLE)})
+            marks = ",".join("?" * len(ids))
+            rows = q(f"SELECT id, term_en, term_norm FROM words WHERE id IN ({marks})", ids)
+            self.word_ids = [r[0] for r in rows]
+            self.terms = [r[1] for r in rows]
+            self.term_norms = [r[2] for r in rows]
+            self.exercises = [tuple(r) for r in q(
+                f"SELECT id, word_id, uid FROM exercises WHERE word_id IN ({marks}) ORDER BY id", ids)]
+            self.examples = [tuple(r) for r in q(
+                f"SELECT id, word_id, uid FROM examples WHERE word_id IN ({marks}) AND exercise_id IS NULL "
+                f"ORDER BY id", ids)]
+            # Puanlanmış cevaplar: (example_id, exercise_id, word_id, cevap)
+            self.answers = [tuple(r) for r in q(
+                f"SELECT id, exercise_id, word_id, text FROM examples WHERE word_id IN ({marks}) "
+                f"AND exercise_id IS NOT NULL AND score IS NOT NULL ORDER BY id", ids)]
+            half = q("SELECT created_at, id FROM words ORDER BY created_at DESC, id DESC LIMIT 1 OFFSET ?",
+                     (self.max_word // 2,))
+            self.cursor = tuple(half[0]) if half else None
+            self.max_seq = q("SELECT COALESCE(MAX(seq), 0) FROM change_log")[0][0]
+        finally:
+            conn.close()
+        self.group = "Book 7"
+        self.cutoff = "2025-01-01 00:00:00"
+        self.since_day = "2025-06-01"
+        self.model = "bench/regrade"
+        self.job_id: Optional[int] = None
+        self._deleted = 0
+
+    def word(self, i: int) -> int:
+        return self.word_ids[i % len(self.word_ids)]
+
+    def term(self, i: int) -> str:
+        return self.terms[i % len(self.terms)]
+
+    def exercise(self, i: int) -> tuple:
+        return self.exercises[i % len(self.exercises)]
+
+    def example(self, i: int) -> tuple:
+        return self.examples[i % len(self.examples)]
+
+    def answer(self, i: int) -> tuple:
+        return self.answers[i % len(self.answers)]
+
+    def take_examples(self, n: int) -> List[int]:
+        """Silme ölçümleri için her çağrıda farklı örnek id'leri."""
+        ids = [e[0] for e in self.examples[self._deleted:self._deleted + n]]
+        self._deleted += n
+        return ids
+
+
+# ---- repository ölçümleri ----
+def read_cases() -> List[Case]:
+    from app.core import repository as r
+    from app.core.rate_limit import DEEPL
+    words, examples, exercises = r.WordRepository(), r.ExampleRepository(), r.ExerciseRepository()
+    schedule, stats, export = r.ScheduleRepository(), r.StatsRepository(), r.ExportRepository()
+    sync, archive, maint = r.SyncRepository(), r.ArchiveRepository(), r.MaintenanceRepository()
+    regrade, usage, search = r.RegradeRepository(), r.UsageRepository(), r.SearchRepository()
+    return [
+        Case("WordRepository.get_word", lambda f, i: words.get_word(f.word(i))),
+        Case("WordRepository.get_words[100]",
+             lambda f, i: words.get_words([f.word(i + k) for k in range(100)])),
+        Case("WordRepository.find_by_term", lambda f, i: words.find_by_term(f.term(i))),
+        Case("WordRepository.all_words", lambda f, i: words.all_words(), max_runs=20),
+        Case("WordRepository.list_terms", lambda f, i: words.list_terms(), max_runs=20),
+        Case("WordRepository.list_group_titles", lambda f, i: words.list_group_titles()),
+        Case("WordRepository.list_words[unlearned]", lambda f, i: words.list_words(include_learned=False),
+             max_runs=20),
+        Case("WordRepository.list_words_page[first]", lambda f, i: words.list_words_page()),
+        Case("WordRepository.list_words_page[middle]", lambda f, i: words.list_words_page(after=f.cursor)),
+        Case("WordRepository.list_words_page[group+learned]",
+             lambda f, i: words.list_words_page(group_title=f.group, learned=True)),
+        Case("WordRepository.list_words_page[min_avg]", lambda f, i: words.list_words_page(min_avg=7.0)),
+        Case("WordRepository.iter_words", lambda f, i: _drain(words.iter_words()), max_runs=20),
+        Case("ExampleRepository.list_examples", lambda f, i: examples.list_examples(f.word(i))),
+        Case("ExampleRepository.list_examples_page", lambda f, i: examples.list_examples_page(f.word(i))),
+        Case("ExampleRepository.list_examples_page[min_score]",
+             lambda f, i: examples.list_examples_page(f.word(i), min_score=5)),
+        Case("ExampleRepository.iter_examples", lambda f, i: _drain(examples.iter_examples(f.word(i)))),
+        Case("ExampleRepository.avg_score", lambda f, i: examples.avg_score(f.word(i))),
+        Case("ExerciseRepository.list_exercises", lambda f, i: exercises.list_exercises(f.word(i))),
+        Case("ExerciseRepository.list_exercises_page[open]",
+             lambda f, i: exercises.list_exercises_page(f.word(i), answered=False)),
+        Case("ExerciseRepository.iter_exercises", lambda f, i: _drain(exercises.iter_exercises(f.word(i)))),
+        Case("ExerciseRepository.get_exercise", lambda f, i: exercises.get_exercise(f.exercise(i)[0])),
+        Case("ScheduleRepository.get_card", lambda f, i: schedule.get_card(f.word(i), "TR")),
+        Case("ScheduleRepository.due_cards", lambda f, i: schedule.due_cards()),
+        Case("ScheduleRepository.count_due", lambda f, i: schedule.count_due()),
+        Case("StatsRepository.daily_counts", lambda f, i: stats.daily_counts(f.since_day)),
+        Case("StatsRepository.daily_scores", lambda f, i: stats.daily_scores(f.since_day)),
+        Case("StatsRepository.daily_scores[group+direction]",
+             lambda f, i: stats.daily_scores(f.since_day, group_title=f.group, direction="TR")),
+        Case("StatsRepository.word_score_columns", lambda f, i: stats.word_score_columns(), max_runs=20),
+        Case("ExportRepository.iter_words_with_examples",
+             lambda f, i: _drain(export.iter_words_with_examples()), max_runs=5),
+        Case("ExportRepository.iter_words_with_examples[group,no examples]",
+             lambda f, i: _drain(export.iter_words_with_examples(group_title=f.group, examples=False)),
+             max_runs=20),
+        Case("SyncRepository.get_flag", lambda f, i: sync.get_flag("replica_id")),
+        Case("SyncRepository.replica_id", lambda f, i: sync.replica_id()),
+        Case("SyncRepository.max_seq", lambda f, i: sync.max_seq()),
+        Case("SyncRepository.changes_since[last 1000]", lambda f, i: sync.changes_since(max(0, f.max_seq - 1000))),
+        Case("SyncRepository.log_entry", lambda f, i: sync.log_entry("word", f.term_norms[i % len(f.term_norms)])),
+        Case("SyncRepository.get_peer", lambda f, i: sync.get_peer("bench-peer")),
+        Case("SyncRepository.word_rows[500]", lambda f, i: sync.word_rows(f.term_norms)),
+        Case("SyncRepository.exercise_rows[500]", lambda f, i: sync.exercise_rows([x[2] for x in f.exercises])),
+        Case("SyncRepository.example_rows[500]", lambda f, i: sync.example_rows([e[2] for e in f.examples])),
+        Case("SyncRepository.id_by_key", lambda f, i: sync.id_by_key("exercise", f.exercise(i)[2])),
+        Case("ArchiveRepository.candidates", lambda f, i: archive.candidates(f.cutoff)),
+        Case("ArchiveRepository.old_rows[500 words]", lambda f, i: archive.old_rows(f.word_ids, f.cutoff)),
+        Case("ArchiveRepository.payloads_for_word", lambda f, i: archive.payloads_for_word(f.word(i))),
+        Case("ArchiveRepository.summary", lambda f, i: archive.summary()),
+        Case("ArchiveRepository.counts_for_word", lambda f, i: archive.counts_for_word(f.word(i))),
+        Case("ArchiveRepository.locate[miss]", lambda f, i: archive.locate("example", f.example(i)[2])),
+        Case("MaintenanceRepository.page_stats", lambda f, i: maint.page_stats()),
+        Case("RegradeRepository.count_pending", lambda f, i: regrade.count_pending(f.model), max_runs=20),
+        Case("RegradeRepository.pending", lambda f, i: regrade.pending(f.model, 0, 50)),
+        Case("RegradeRepository.open_job", lambda f, i: regrade.open_job(f.model)),
+        Case("RegradeRepository.list_jobs", lambda f, i: regrade.list_jobs()),
+        Case("RegradeRepository.scores_by_model", lambda f, i: regrade.scores_by_model(), max_runs=20),
+        Case("RegradeRepository.archived_scores_by_model", lambda f, i: regrade.archived_scores_by_model()),
+        Case("UsageRepository.get", lambda f, i: usage.get(DEEPL, "2026-01")),
+        Case("UsageRepository.history", lambda f, i: usage.history(DEEPL)),
+        Case("SearchRepository.search[term]", lambda f, i: search.search(f.term(i))),
+        Case("SearchRepository.search[prefix]", lambda f, i: search.search(f.term(i)[:4])),
+        Case("SearchRepository.search[common word]", lambda f, i: search.search("evidence")),
+        Case("SearchRepository.search[page 5]", lambda f, i: search.search("evidence", offset=80)),
+    ]
+
+
+def write_cases() -> List[Case]:
+    from app.core import repository as r
+    from app.core.rate_limit import DEEPL
+    from app.models import ReviewCard
+    words, examples, exercises = r.WordRepository(), r.ExampleRepository(), r.ExerciseRepository()
+    schedule, sync, archive = r.ScheduleRepository(), r.SyncRepository(), r.ArchiveRepository()
+    regrade, usage = r.RegradeRepository(), r.UsageRepository()
+    note = {"notes": "benchmark notu"}
+
+    def create_job(f: Fixture, i: int) -> None:
+        f.job_id = regrade.create_job(f.model, 0)["id"]
+
+    def get_job(f: Fixture, i: int):
+        return regrade.get_job(f.job_id)
+
+    def archived_row(f: Fixture, i: int, score: int) -> tuple:
+        # ARCHIVE_EXAMPLE_FIELDS sırasıyla
+        return (0, f.word(i), f"{PREFIX}-ar-{i}", "archived", "AI", "EN", score, "", None, f.cutoff, f.model)
+
+    def upsert_example(f: Fixture, i: int) -> int:
+        ex = f.exercise(i)
+        return sync.upsert_example(f"{PREFIX}-ex-{i}", ex[1], ex[0],
+                                   {"text": "synced answer", "origin": "AI", "direction": "EN", "score": 6})
+
+    return [
+        Case("WordRepository.add_word", lambda f, i: words.add_word(f"{PREFIX}a{i}", "yeni", f.group)),
+        Case("WordRepository.create_word", lambda f, i: words.create_word(f"{PREFIX}c{i}", "yeni")),
+        Case("WordRepository.update_fields", lambda f, i: words.update_fields(f.word(i), note)),
+        Case("WordRepository.update_notes", lambda f, i: words.update_notes(f.word(i), f"not {i}")),
+        Case("WordRepository.apply_word_updates[100]",
+             lambda f, i: words.apply_word_updates({w: note for w in f.word_ids[:100]})),
+        Case("WordRepository.update_translation", lambda f, i: words.update_translation(f.word(i), f"çeviri {i}")),
+        Case("WordRepository.update_group", lambda f, i: words.update_group(f.word(i), f.group)),
+        Case("WordRepository.set_learned", lambda f, i: words.set_learned(f.word(i), i % 2 == 0)),
+        Case("WordRepository.mark_learned_if_avg_above",
+             lambda f, i: words.mark_learned_if_avg_above(f.word(i), 7.0)),
+        Case("ExampleRepository.add_example",
+             lambda f, i: examples.add_example(f.word(i), f"bench sentence {i}", origin="AI", direction="EN",
+                                               score=i % 11)),
+        Case("ExerciseRepository.add_exercise",
+             lambda f, i: exercises.add_exercise(f.word(i), "TR", "term", "terim", f"bench cümle {i}")),
+        Case("ExerciseRepository.update_answer_and_score",
+             lambda f, i: exercises.update_answer_and_score(f.exercise(i)[0], "answer", i % 11, "ok", "bench")),
+        Case("ScheduleRepository.save_card",
+             lambda f, i: schedule.save_card(ReviewCard(f.word(i), "TR", interval_days=1.0, repetitions=1))),
+        Case("SyncRepository.set_flag", lambda f, i: sync.set_flag("bench", str(i))),
+        Case("SyncRepository.mark_local", lambda f, i: sync.mark_local("word", f.term_norms[i % len(f.term_norms)])),
+        Case("SyncRepository.save_peer", lambda f, i: sync.save_peer("bench-peer", sent_seq=i)),
+        Case("SyncRepository.upsert_word[new]",
+             lambda f, i: sync.upsert_word(f"{PREFIX}s{i}", {"term_en": f"{PREFIX}s{i}", "translation_tr": "x",
+                                                             "created_at": "2025-01-01 00:00:00"})),
+        Case("SyncRepository.upsert_word[existing]",
+             lambda f, i: sync.upsert_word(f.term_norms[i % len(f.term_norms)],
+                                           {"term_en": f.term(i), "translation_tr": f"güncel {i}"})),
+        Case("SyncRepository.upsert_exercise",
+             lambda f, i: sync.upsert_exercise(f"{PREFIX}-x-{i}", f.word(i),
+                                               {"direction": "TR", "sentence": "synced", "source_en": "a",
+                                                "source_tr": "b"})),
+        Case("SyncRepository.upsert_example", upsert_example),
+        Case("SyncRepository.delete_by_key[example]",
+             lambda f, i: sync.delete_by_key("example", f.example(i)[2]), max_runs=SAMPLE // 4),
+        Case("ArchiveRepository.add_batch",
+             lambda f, i: archive.add_batch(i, i, 1, 2, 1, 1, 7, f.cutoff, f.cutoff, 4096, b"\0" * 1024)),
+        Case("ArchiveRepository.delete_rows[10]", lambda f, i: archive.delete_rows(f.take_examples(10), []),
+             max_runs=SAMPLE // 40),
+        Case("ArchiveRepository.index_rows", lambda f, i: archive.index_rows(1, [archived_row(f, i, 5)], [])),
+        Case("ArchiveRepository.update_row",
+             lambda f, i: archive.update_row("example", f"{PREFIX}-ar-{i}", r.ARCHIVE_EXAMPLE_FIELDS,
+                                             archived_row(f, i, 6))),
+        Case("ArchiveRepository.rewrite_batch",
+             lambda f, i: archive.rewrite_batch(1, 2, 1, 1, 7, 4096, b"\0" * 1024)),
+        Case("RegradeRepository.create_job", create_job),
+        Case("RegradeRepository.get_job", get_job),
+        Case("RegradeRepository.checkpoint", lambda f, i: regrade.checkpoint(f.job_id, f.answer(i)[0], 1, 0, 0)),
+        Case("RegradeRepository.save_grade",
+             lambda f, i: regrade.save_grade(*f.answer(i), i % 11, "yeniden", f.model)),
+        Case("UsageRepository.add", lambda f, i: usage.add(DEEPL, "2026-01", 10, 1)),
+        Case("UsageRepository.set_units", lambda f, i: usage.set_units(DEEPL, "2026-01", i, 500_000)),
+    ]
+
+
+def maint_cases() -> List[Case]:
+    from app.core.repository import MaintenanceRepository
+    maint = MaintenanceRepository()
+    return [
+        Case("MaintenanceRepository.checkpoint", lambda f, i: maint.checkpoint(), max_runs=5),
+        Case("MaintenanceRepository.analyze", lambda f, i: maint.analyze(), max_runs=5),
+        Case("MaintenanceRepository.optimize", lambda f, i: maint.optimize(), max_runs=5),
+        Case("MaintenanceRepository.optimize_search", lambda f, i: maint.optimize_search(), max_runs=2),
+        Case("MaintenanceRepository.incremental_vacuum", lambda f, i: maint.incremental_vacuum(), max_runs=2),
+        Case("MaintenanceRepository.vacuum", lambda f, i: maint.vacuum(), max_runs=1),
+    ]
+
+
+# ---- WordService ----
+def service_cases(make_service: Callable[[], object]) -> List[Case]:
+    from app.core import events
+    from app.models import ReviewCard
+    svc = make_service()
+    imported = [0]
+
+    def import_words(f: Fixture, i: int):
+        # Yarısı yeni, yarısı var olan kelime (add_or_get kuralları, 500'lük transaction'lar)
+        base = imported[0]
+        imported[0] += 500
+        rows = [(f"{PREFIX}i{base + k}", "toplu", f.group) for k in range(500)]
+        rows += [(f.term(k), f"toplu {i}", None) for k in range(500)]
+        return svc.import_words(rows)
+
+    def evaluate(f: Fixture, i: int):
+        return svc.evaluate_exercise(f.exercise(i)[0], f"my answer {i}")
+
+    return [
+        Case("WordService.library[build]", lambda f, i: make_service().library, max_runs=10),
+        Case("WordService.term_index[build]", lambda f, i: make_service().term_index, max_runs=10),
+        Case("WordService.translate", lambda f, i: svc.translate(f.term(i))),
+        Case("WordService.find_word", lambda f, i: svc.find_word(f.term(i))),
+        Case("WordService.suggest_terms", lambda f, i: svc.suggest_terms(f.term(i)[:-1])),
+        Case("WordService.search", lambda f, i: svc.search(f.term(i))),
+        Case("WordService.list_group_titles", lambda f, i: svc.list_group_titles()),
+        Case("WordService.list_words", lambda f, i: svc.list_words(), max_runs=10),
+        Case("WordService.list_words_page", lambda f, i: svc.list_words_page(group_title=f.group)),
+        Case("WordService.iter_words", lambda f, i: _drain(svc.iter_words(learned=True)), max_runs=10),
+        Case("WordService.list_examples", lambda f, i: svc.list_examples(f.word(i))),
+        Case("WordService.list_examples_page", lambda f, i: svc.list_examples_page(f.word(i))),
+        Case("WordService.get_avg_score", lambda f, i: svc.get_avg_score(f.word(i))),
+        Case("WordService.list_exercises", lambda f, i: svc.list_exercises(f.word(i))),
+        Case("WordService.list_exercises_page", lambda f, i: svc.list_exercises_page(f.word(i))),
+        Case("WordService.get_exercise", lambda f, i: svc.get_exercise(f.exercise(i)[0])),
+        Case("WordService.due_cards", lambda f, i: svc.due_cards()),
+        Case("WordService.count_due", lambda f, i: svc.count_due()),
+        Case("WordService.progress", lambda f, i: svc.progress(), max_runs=20),
+        Case("WordService.progress[group+direction]",
+             lambda f, i: svc.progress(group_title=f.group, direction="EN"), max_runs=20),
+        Case("WordService.word_average_histogram", lambda f, i: svc.word_average_histogram(), max_runs=20),
+        # Yazmalar: kütüphane/terim indeksi kurulu, değişiklik olaylarıyla güncellenir
+        Case("WordService.add_or_get[new]", lambda f, i: svc.add_or_get(f"{PREFIX}n{i}", "yeni", f.group)),
+        Case("WordService.add_or_get[existing]", lambda f, i: svc.add_or_get(f.term(i), f"çeviri {i}")),
+        Case("WordService.upsert_word", lambda f, i: svc.upsert_word(f.term(i), f"çeviri {i}")),
+        Case("WordService.import_words[1000]", import_words, max_runs=10),
+        Case("WordService.set_learned", lambda f, i: svc.set_learned(f.word(i), i % 2 == 1)),
+        Case("WordService.add_example_manual", lambda f, i: svc.add_example_manual(f.word(i), f"manual {i}")),
+        Case("WordService.create_exercise_tr", lambda f, i: svc.create_exercise_tr(f.word(i))),
+        Case("WordService.create_exercise_en", lambda f, i: svc.create_exercise_en(f.word(i))),
+        Case("WordService.exercise_for_card", lambda f, i: svc.exercise_for_card(ReviewCard(f.word(i), "EN"))),
+        Case("WordService.evaluate_exercise", evaluate),
+        Case("WordService.apply_changes",
+             lambda f, i: svc.apply_changes([events.WordChanged(f.word(i), events.WORD_UPDATED)])),
+    ]
+
+
+def fake_service():
+    from app.services.word_service import WordService
+    return WordService(ai=FakeAI(), translator=FakeTranslator())
+
+
+def real_service():
+    from app.services.word_service import WordService
+    return WordService()  # istemciler ortam değişkenlerinden (taklit sunucuya yönlendirilmiş)
+
+
+# ---- arayüz (offscreen Qt) ----
+def ui_cases(make_service: Callable[[], object]) -> List[Case]:
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+    from app.ui.main_window import MainWindow
+    win = MainWindow()
+    win.removeEventFilter(win)  # ilk boyamadaki _initial_load (ve arka plan bakımı) ölçümleri karıştırmasın
+    win.service = make_service()
+    win.show()
+    app.processEvents()
+
+    def construct(f: Fixture, i: int):
+        w = MainWindow()
+        w.close()  # atexit'teki not tamponu kaydı da kalkar
+        w.deleteLater()
+        app.processEvents()
+
+    def load_library(f: Fixture, i: int):
+        win.load_library()
+        app.processEvents()
+
+    def search(f: Fixture, i: int):
+        win.txtSearch.blockSignals(True)  # debounce zamanlayıcısı yerine doğrudan
+        win.txtSearch.setText("evidence" if i % 2 else f.term(i))
+        win.txtSearch.blockSignals(False)
+        win._run_search()
+        app.processEvents()
+
+    def open_page(f: Fixture, i: int):
+        # Uygulamadaki yol: sekme açılır, ilk sayfa fetch + yerleşim + offscreen boyama, sonra kapanır
+        win.tabManager.open(f.word(i))
+        app.processEvents()
+        win.tabManager.close_tab(win.tabManager.index_of(f.word(i)))
+        app.processEvents()
+
+    return [
+        Case("MainWindow.__init__", construct, max_runs=10),
+        Case("MainWindow.load_library", load_library, max_runs=20),
+        Case("MainWindow.load_library[hide learned]",
+             lambda f, i: (win.chkShowLearned.setChecked(i % 2 == 1), app.processEvents()), max_runs=20),
+        Case("MainWindow._run_search", search),
+        Case("WordPage.__init__[open tab+paint]", open_page),
+    ]
+
+
+# ---- açılış (alt süreç) ----
+def startup_results(db: Path, runs: int) -> Dict[str, dict]:
+    from . import startup
+    out: Dict[str, dict] = {}
+    for scenario, keys in (("qt", ("first_paint_ms",)),
+                           ("app", ("app_import_ms", "first_paint_ms", "library_loaded_ms"))):
+        marks = [startup._run_child(scenario, str(db)) for _ in range(max(1, runs))]
+        for key in keys:
+            values = [m[key] for m in marks if key in m]
+            if values:
+                out[f"startup.{scenario}.{key[:-3]}"] = _stats(values, values[0])
+    return out
+
+
+# ---- kapsam ----
+def _public_methods(cls) -> List[str]:
+    return [f"{cls.__name__}.{name}" for name, member in inspect.getmembers(cls, inspect.isfunction)
+            if not name.startswith("_") and member.__qualname__.startswith(cls.__name__ + ".")]
+
+
+def unmeasured(measured: List[str]) -> List[str]:
+    """Ölçümü olmayan public repository / WordService metotları (yeni metot eklenince burada görünür)."""
+    from app.core import repository
+    from app.services.word_service import WordService
+    classes = [cls for _, cls in inspect.getmembers(repository, inspect.isclass)
+               if cls.__module__ == repository.__name__ and cls.__name__.endswith("Repository")
+               and not cls.__name__.startswith("_")]
+    names = {n.split("[", 1)[0] for n in measured}
+    public = [m for cls in classes + [WordService] for m in _public_methods(cls)]
+    return sorted(m for m in public if m not in names)
+
+
+# ---- çalıştırma ----
+def run_size(label: str, args, log) -> Tuple[Dict[str, dict], Dict[str, str]]:
+    from app.core import database
+    words = synth.parse_size(label)
+    generated = []
+
+    def progress(done: int, total: int) -> None:
+        generated.append(done)
+        log(f"\r  üretiliyor {done}/{total}", end="")
+
+    src = synth.cached(words, args.examples, args.exercises, args.seed, Path(args.cache_dir), progress=progress)
+    if generated:
+        log("")
+    results: Dict[str, dict] = {}
+    errors: Dict[str, str] = {}
+    with tempfile.TemporaryDirectory(prefix="vocab-bench-", ignore_cleanup_errors=True) as tmp:
+        db = synth.copy_to(src, Path(tmp))
+        database.disable_pool()
+        database.DB_PATH = db
+        groups = [g for g in GROUPS if g in args.groups]
+        if "startup" in groups:
+            try:
+                results.update(startup_results(db, args.startup_runs))
+            except Exception as e:
+                errors["startup"] = f"{type(e).__name__}: {e}"
+        fixture = Fixture(args.seed)
+        make_service = fake_service if args.backends == "fake" else real_service
+        builders = {"read": read_cases, "write": write_cases, "maint": maint_cases,
+                    "service": lambda: service_cases(make_service), "ui": lambda: ui_cases(make_service)}
+        for group in groups:
+            if group == "startup":
+                continue
+            try:
+                cases = builders[group]()
+            except Exception as e:  # ör. PySide6 yok
+                errors[group] = f"{type(e).__name__}: {e}"
+                continue
+            for case in cases:
+                if args.only and not any(s in case.name for s in args.only):
+                    continue
+                try:
+                    results[case.name] = measure(case, fixture, args.budget, args.min_runs, args.max_runs)
+                except Exception as e:
+                    errors[case.name] = f"{type(e).__name__}: {e}"
+                    continue
+                s = results[case.name]
+                log(f"  {case.name:<58} ilk {s['first_ms']:>9.2f}  medyan {s['median_ms']:>9.2f}  "
+                    f"p95 {s['p95_ms']:>9.2f} ms  (n={s['n']})")
+            del cases
+            gc.collect()
+    return results, errors
+
+
+def compare(current: dict, baseline: dict, threshold: float = THRESHOLD, noise_ms: float = NOISE_MS) -> dict:
+    """Boyut + ölçüm başına median oranı; eşik ve gürültü tabanına göre regression/improvement/ok."""
+    rows = []
+    for size, cases in current.get("results", {}).items():
+        base_cases = baseline.get("results", {}).get(size, {})
+        for name, cur in cases.items():
+            base = base_cases.get(name)
+            if not base or not base.get("median_ms"):
+                continue
+            ratio = cur["median_ms"] / base["median_ms"]
+            diff = cur["median_ms"] - base["median_ms"]
+            status = "ok"
+            if abs(diff) > noise_ms:
+                if ratio > 1 + threshold:
+                    status = "regression"
+                elif ratio < 1 / (1 + threshold):
+                    status = "improvement"
+            rows.append({"size": size, "case": name, "baseline_ms": base["median_ms"],
+                         "median_ms": cur["median_ms"], "ratio": round(ratio, 3), "status": status})
+    return {
+        "threshold": threshold, "noise_ms": noise_ms, "baseline_meta": baseline.get("meta", {}),
+        "regressions": [r for r in rows if r["status"] == "regression"],
+        "improvements": [r for r in rows if r["status"] == "improvement"],
+        "compared": len(rows),
+    }
+
+
+def _meta(args) -> dict:
+    from app.core import database
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "python": platform.python_version(), "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(), "machine": platform.machine(), "cpus": os.cpu_count(),
+        "commit": commit, "started_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "sizes": args.sizes, "examples": args.examples, "exercises": args.exercises, "seed": args.seed,
+        "backends": args.backends, "budget_s": args.budget, "fts": database.FTS_AVAILABLE,
+        "generator": synth.GENERATOR_VERSION,
+    }
+
+
+def main(argv=None) -> int:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--sizes", default="1k", help=f"virgülle: {', '.join(synth.SIZES)} veya kelime sayısı")
+    p.add_argument("--examples", type=int, default=2)
+    p.add_argument("--exercises", type=int, default=1)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--cache-dir", default=str(synth.DEFAULT_CACHE))
+    p.add_argument("--groups", default=",".join(GROUPS), help="virgülle: " + ", ".join(GROUPS))
+    p.add_argument("--only", default="", help="yalnızca adında bu parçalardan biri geçen ölçümler (virgülle)")
+    p.add_argument("--backends", choices=("fake", "standin"), default="fake",
+                   help="fake: süreç içi sahte AI/çeviri; standin: gerçek istemciler + yerel taklit sunucu")
+    p.add_argument("--budget", type=float, default=BUDGET_S, help="ölçüm başına tekrar süresi (sn)")
+    p.add_argument("--min-runs", type=int, default=MIN_RUNS)
+    p.add_argument("--max-runs", type=int, default=MAX_RUNS)
+    p.add_argument("--startup-runs", type=int, default=STARTUP_RUNS)
+    p.add_argument("--out", help="sonuç JSON dosyası")
+    p.add_argument("--baseline", help="karşılaştırılacak önceki sonuç JSON'u")
+    p.add_argument("--threshold", type=float, default=THRESHOLD)
+    p.add_argument("--noise-ms", type=float, default=NOISE_MS)
+    p.add_argument("--fail-on-regression", action="store_true", help="gerileme varsa çıkış kodu 1")
+    p.add_argument("--save-baseline", help="sonuçları baseline olarak bu dosyaya yaz")
+    args = p.parse_args(argv)
+    args.sizes = [s.strip().lower() for s in args.sizes.split(",") if s.strip()]
+    args.groups = {g.strip() for g in args.groups.split(",") if g.strip()}
+    args.only = [s for s in args.only.split(",") if s]
+
+    def log(msg: str, end: str = "\n") -> None:
+        print(msg, end=end, file=sys.stderr, flush=True)
+
+    standin = None
+    if args.backends == "standin":
+        from .standins import StandIn
+        standin = StandIn()
+        standin.start()
+        # Hız sınırı ölçümü bozmasın; kota ve 429 davranışı standins ile ayrıca denenir
+        os.environ.update(standin.env(), DEEPL_RATE="0", OPENROUTER_RPM="0")
+
+    report = {"meta": _meta(args), "results": {}, "errors": {}}
+    try:
+        for label in args.sizes:
+            log(f"[{label}]")
+            results, errors = run_size(label, args, log)
+            report["results"][label] = results
+            if errors:
+                report["errors"][label] = errors
+                for name, err in errors.items():
+                    log(f"  HATA {name}: {err}")
+    finally:
+        if standin is not None:
+            report["meta"]["standin_stats"] = standin.stats()
+            standin.stop()
+    # Kapsam yalnızca tam çalıştırmada anlamlı (filtreli çalıştırmada her şey "ölçülmemiş" görünür)
+    full = not args.only and {"read", "write", "service", "maint"} <= args.groups
+    report["unmeasured"] = unmeasured([n for r in report["results"].values() for n in r]) if full else None
+    if report["unmeasured"]:
+        log(f"ölçümü olmayan metotlar: {', '.join(report['unmeasured'])}")
+
+    failed = False
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fh:
+            cmp = compare(report, json.load(fh), args.threshold, args.noise_ms)
+        report["comparison"] = cmp
+        log(f"baseline: {cmp['compared']} ölçüm, {len(cmp['regressions'])} gerileme, "
+            f"{len(cmp['improvements'])} iyileşme (eşik %{args.threshold * 100:.0f}, gürültü {args.noise_ms} ms)")
+        for r in cmp["regressions"]:
+            log(f"  GERİLEME [{r['size']}] {r['case']}: {r['baseline_ms']} → {r['median_ms']} ms (x{r['ratio']})")
+        failed = bool(cmp["regressions"]) and args.fail_on_regression
+
+    text = json.dumps(report, ensure_ascii=False, indent=1)
+    if args.out:
+        Path(args.out).write_text(text, encoding="utf-8")
+    if args.save_baseline:
+        base = {k: report[k] for k in ("meta", "results")}
+        Path(args.save_baseline).write_text(json.dumps(base, ensure_ascii=False, indent=1), encoding="utf-8")
+    if not args.out and not args.save_baseline:
+        print(text)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,200 @@
+"""
+Sentetik kütüphane üretici: benchmark'lar için 1k / 100k / 1M kelimelik veritabanları.
+
+Kelimeler uygulamanın kendi şemasına yazılır (trigger'lar açık): arama indeksi, puan
+toplamları, istatistik sayaçları, tekrar kartları ve değişiklik günlüğü gerçek kullanımdaki
+gibi dolar. Üretim tohumlu ve deterministiktir; aynı parametreler aynı veritabanını verir.
+
+    python -m benchmarks.synth --size 100k -o /tmp/lib100k.sqlite3
+    python -m benchmarks.synth --size 1m --examples 3 --exercises 1
+
+Kelime başına: `examples` örnek cümle (yarısı AI, puanlı), `exercises` görev; görevlerin
+çoğu cevaplanmış ve cevabı görevle bağlı puanlı örnek olarak da yazılır (evaluate_exercise
+gibi). Kelimelerin %20'si öğrenilmiş; eklenme tarihleri son iki yıla yayılır.
+"""
+import argparse
+import hashlib
+import random
+import shutil
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+SIZES = {"1k": 1_000, "10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+DEFAULT_CACHE = ROOT / ".bench-cache"
+BATCH_WORDS = 5000      # transaction başına kelime
+GROUPS = 50             # "Book 1".."Book 50" + grupsuz
+LEARNED_RATIO = 0.2
+ANSWERED_RATIO = 0.7
+SPAN_DAYS = 730
+GENERATOR_VERSION = 1   # üretim mantığı değişince önbellek geçersiz olur
+
+_EN_SYLLABLES = ("ab", "ac", "ad", "al", "am", "an", "ar", "as", "at", "be", "ca", "co", "de", "di", "el", "en",
+                 "er", "es", "fa", "ge", "in", "is", "la", "le", "li", "lo", "ma", "me", "mi", "ne", "no", "or",
+                 "pa", "pe", "ra", "re", "ri", "ro", "se", "si", "ta", "te", "ti", "to", "un", "ur", "ve", "vi")
+_TR_SYLLABLES = ("ka", "le", "mı", "ği", "şe", "bu", "ça", "dö", "el", "fı", "gü", "ha", "iz", "ke", "lü", "mo",
+                 "nü", "ol", "pa", "rü", "sa", "şı", "ta", "ün", "ve", "ya", "zo", "ağ", "be", "cı", "de", "er")
+_EN_SENTENCES = (
+    "Although the evidence seemed thin, her {w} eventually convinced the skeptical committee.",
+    "The {w} we overlooked at first turned out to explain most of the delay.",
+    "Had they noticed the {w} earlier, the negotiations might have ended differently.",
+    "Whatever critics say about its {w}, the novel remains remarkably readable.",
+)
+_TR_SENTENCES = (
+    "Kanıtlar zayıf görünse de {w} sonunda kuşkucu kurulu ikna etti.",
+    "İlk başta gözden kaçırdığımız {w}, gecikmenin büyük kısmını açıklıyordu.",
+    "{w} daha önce fark edilseydi müzakereler başka türlü sonuçlanabilirdi.",
+)
+
+
+def _radix(i: int, alphabet: Tuple[str, ...], min_len: int) -> str:
+    """i → benzersiz hece dizisi (rakamsız, terim indeksi için gerçekçi)."""
+    n = len(alphabet)
+    out: List[str] = []
+    while i or len(out) < min_len:
+        i, r = divmod(i, n)
+        out.append(alphabet[r])
+    return "".join(out)
+
+
+def term_for(i: int) -> str:
+    return _radix(i, _EN_SYLLABLES, 3)
+
+
+def translation_for(i: int) -> str:
+    return _radix(i * 7 + 3, _TR_SYLLABLES, 2)
+
+
+def _word_rows(start: int, stop: int, total: int, rng: random.Random, base: datetime) -> Iterator[tuple]:
+    from app.core.term_index import normalize_term
+    for i in range(start, stop):
+        term = term_for(i)
+        created = base + timedelta(seconds=int(SPAN_DAYS * 86400 * i / total) + rng.randrange(600))
+        group = None if i % (GROUPS + 1) == GROUPS else f"Book {i % (GROUPS + 1) + 1}"
+        learned = rng.random() < LEARNED_RATIO
+        learned_at = (created + timedelta(days=rng.randrange(1, 60))).strftime("%Y-%m-%d %H:%M:%S") if learned else None
+        notes = f"{term}: kök, kullanım notu" if i % 5 == 0 else ""
+        yield (term, translation_for(i), notes, group, int(learned), learned_at,
+               created.strftime("%Y-%m-%d %H:%M:%S"), normalize_term(term))
+
+
+def build(path: Path, words: int, examples: int = 2, exercises: int = 1, seed: int = 0,
+          progress: Optional[Callable[[int, int], None]] = None) -> dict:
+    """`path`'te yeni bir kütüphane üretir; satır sayıları ve süreyi döner."""
+    from app.core import database
+    path = Path(path)
+    for suffix in ("", "-wal", "-shm"):
+        Path(str(path) + suffix).unlink(missing_ok=True)
+    database.DB_PATH = path
+    t0 = time.perf_counter()
+    rng = random.Random(seed)
+    base = datetime(2024, 1, 1)
+    conn = database.get_conn()
+    try:
+        conn.execute("PRAGMA synchronous = OFF")  # yalnızca üretim sırasında; çökme = yeniden üret
+        conn.execute("PRAGMA cache_size = -262144")  # 256 MB: indeks/FTS sayfaları bellekte kalsın
+        for start in range(0, words, BATCH_WORDS):
+            stop = min(words, start + BATCH_WORDS)
+            with conn:
+                first = conn.execute("SELECT COALESCE(MAX(id), 0) FROM words").fetchone()[0] + 1
+                rows = list(_word_rows(start, stop, words, rng, base))
+                conn.executemany(
+                    "INSERT INTO words(term_en, translation_tr, notes, group_title, is_learned, learned_at, "
+                    "created_at, term_norm) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                ex_rows, task_rows = [], []
+                for k, row in enumerate(rows):
+                    word_id, term, tr, created = first + k, row[0], row[1], row[6]
+                    for j in range(examples):
+                        ai = j % 2 == 1
+                        text = _EN_SENTENCES[(word_id + j) % len(_EN_SENTENCES)].format(w=term)
+                        ex_rows.append((word_id, text, "AI" if ai else "MANUAL", "EN" if ai else None,
+                                        rng.randrange(11) if ai else None, "", None, created))
+                    for j in range(exercises):
+                        direction = "TR" if (word_id + j) % 2 else "EN"
+                        sentence = (_TR_SENTENCES[word_id % len(_TR_SENTENCES)].format(w=tr) if direction == "TR"
+                                    else _EN_SENTENCES[word_id % len(_EN_SENTENCES)].format(w=term))
+                        answered = rng.random() < ANSWERED_RATIO
+                        task_rows.append((word_id, direction, term, tr, sentence,
+                                          f"answer for {term}" if answered else "",
+                                          rng.randrange(11) if answered else None,
+                                          "Anlam korunmuş." if answered else "", created))
+                conn.executemany(
+                    "INSERT INTO examples(word_id, text, origin, direction, score, feedback, exercise_id, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", ex_rows)
+                conn.executemany(
+                    "INSERT INTO exercises(word_id, direction, source_en, source_tr, sentence, user_answer, score, "
+                    "feedback, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", task_rows)
+                # Cevaplanmış görevin cevabı, görevle bağlı puanlı örnek (uygulamadaki gibi)
+                conn.execute(
+                    "INSERT INTO examples(word_id, text, origin, direction, score, feedback, exercise_id, created_at) "
+                    "SELECT word_id, user_answer, 'AI', direction, score, feedback, id, created_at "
+                    "FROM exercises WHERE word_id >= ? AND score IS NOT NULL", (first,))
+            if progress:
+                progress(stop, words)
+        conn.execute("PRAGMA optimize")
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        counts = {t: conn.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0]
+                  for t in ("words", "examples", "exercises")}
+    finally:
+        conn.close()
+    return {**counts, "seconds": round(time.perf_counter() - t0, 1), "bytes": path.stat().st_size}
+
+
+def _schema_digest() -> str:
+    # Şema veya üretici değişince önbellekteki kütüphaneler yeniden üretilir
+    src = (ROOT / "app" / "core" / "database.py").read_bytes() + str(GENERATOR_VERSION).encode()
+    return hashlib.blake2b(src, digest_size=4).hexdigest()
+
+
+def cached(words: int, examples: int = 2, exercises: int = 1, seed: int = 0,
+           cache_dir: Path = DEFAULT_CACHE, progress: Optional[Callable[[int, int], None]] = None) -> Path:
+    """Önbellekteki kütüphane (yoksa üretilir). Değiştirmeden önce copy_to() ile kopyalayın."""
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    path = cache_dir / f"lib-{words}w-{examples}e-{exercises}x-s{seed}-{_schema_digest()}.sqlite3"
+    if not path.exists():
+        tmp = path.with_suffix(".part")
+        build(tmp, words, examples, exercises, seed, progress)
+        tmp.replace(path)
+    return path
+
+
+def copy_to(src: Path, dest_dir: Path) -> Path:
+    dest = Path(dest_dir) / "bench.sqlite3"
+    shutil.copyfile(src, dest)
+    return dest
+
+
+def parse_size(text: str) -> int:
+    return SIZES.get(text.lower()) or int(text)
+
+
+def main(argv=None) -> int:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--size", default="1k", help=f"{', '.join(SIZES)} veya kelime sayısı")
+    p.add_argument("--examples", type=int, default=2, help="kelime başına örnek cümle")
+    p.add_argument("--exercises", type=int, default=1, help="kelime başına görev")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("-o", "--output", help="hedef dosya (varsayılan: önbellek)")
+    args = p.parse_args(argv)
+    words = parse_size(args.size)
+
+    def progress(done: int, total: int) -> None:
+        print(f"\r{done}/{total}", end="", file=sys.stderr, flush=True)
+
+    if args.output:
+        info = build(Path(args.output), words, args.examples, args.exercises, args.seed, progress)
+        print(file=sys.stderr)
+        print(f"{args.output}: {info}")
+    else:
+        path = cached(words, args.examples, args.exercises, args.seed, progress=progress)
+        print(file=sys.stderr)
+        print(path)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
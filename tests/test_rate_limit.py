@@ -0,0 +1,176 @@
+"""
+ProviderLimiter: token bucket hızı, öncelik sırası, arka plan kota payı, 429 backoff,
+kullanımın toplu yazılması ve iade. Saat sahte (elle ilerletilir); bekleyen thread'ler
+stop olayıyla STOP_POLL aralığında saati yeniden okur.
+
+    python -m pytest -q tests
+"""
+import threading
+import time
+
+import pytest
+
+from app.core import database, rate_limit
+from app.core.rate_limit import BULK, INTERACTIVE, BudgetExceeded, ProviderLimiter
+from app.core.repository import UsageRepository
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(database, "DB_PATH", tmp_path / "vocab.sqlite3")
+    return tmp_path
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+def wait_until(predicate, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+class Waiter(threading.Thread):
+    """acquire()'ı arka planda çağırır; bitince sırasını `order` listesine yazar."""
+
+    def __init__(self, lim: ProviderLimiter, level: int, order: list, units: int = 1):
+        super().__init__(daemon=True)
+        self.lim, self.level, self.order, self.units = lim, level, order, units
+        self.stop = threading.Event()  # STOP_POLL ile sahte saatin ilerlemesi görülsün
+        self.result = None
+
+    def run(self):
+        self.result = self.lim.acquire(self.units, level=self.level, stop=self.stop)
+        self.order.append(self.level)
+
+
+def test_token_bucket_paces_after_burst(db, clock):
+    lim = ProviderLimiter("t", rate=2, burst=2, clock=clock)
+    assert lim.acquire() and lim.acquire()  # patlama payı beklemeden
+
+    order = []
+    waiter = Waiter(lim, INTERACTIVE, order)
+    waiter.start()
+    time.sleep(3 * rate_limit.STOP_POLL)
+    assert order == []  # jeton yok: bekliyor
+
+    clock.advance(0.5)  # rate=2/sn: bir jeton
+    waiter.join(2)
+    assert order == [INTERACTIVE] and waiter.result is True
+    assert lim.status()["tokens"] == 0
+
+
+def test_interactive_overtakes_queued_bulk(db, clock):
+    lim = ProviderLimiter("t", rate=1, burst=1, clock=clock)
+    assert lim.acquire()
+    order = []
+    bulk = Waiter(lim, BULK, order)
+    bulk.start()
+    assert wait_until(lambda: len(lim._waiters) == 1)
+    interactive = Waiter(lim, INTERACTIVE, order)
+    interactive.start()
+    assert wait_until(lambda: len(lim._waiters) == 2)
+
+    clock.advance(1.0)
+    interactive.join(2)
+    assert order == [INTERACTIVE]  # sonra gelen ama öncelikli
+    clock.advance(1.0)
+    bulk.join(2)
+    assert order == [INTERACTIVE, BULK]
+
+
+def test_stop_releases_waiter_without_counting(db, clock):
+    lim = ProviderLimiter("t", rate=1, burst=1, quota=100, clock=clock)
+    assert lim.acquire()
+    waiter = Waiter(lim, BULK, [])
+    waiter.start()
+    assert wait_until(lambda: len(lim._waiters) == 1)
+
+    waiter.stop.set()
+    waiter.join(2)
+    assert waiter.result is False and lim.used() == 1
+
+
+def test_background_work_leaves_quota_reserve(db, clock):
+    lim = ProviderLimiter("t", rate=0, quota=100, reserve=0.1, clock=clock)
+    assert lim.acquire(85, level=BULK)
+    with pytest.raises(BudgetExceeded):
+        lim.acquire(10, level=BULK)  # 95 > 90: son %10 etkileşimli çağrılara kalır
+    with rate_limit.priority(BULK):
+        with pytest.raises(BudgetExceeded):
+            lim.acquire(10)
+    assert lim.acquire(10, level=INTERACTIVE)
+    with pytest.raises(BudgetExceeded):
+        lim.acquire(10, level=INTERACTIVE)  # 105 > 100
+    assert lim.used() == 95
+
+
+def test_backoff_pauses_everyone(db, clock):
+    lim = ProviderLimiter("t", rate=10, burst=3, clock=clock)
+    lim.backoff(5)
+    order = []
+    waiter = Waiter(lim, INTERACTIVE, order)
+    waiter.start()
+
+    clock.advance(4.0)
+    time.sleep(3 * rate_limit.STOP_POLL)
+    assert order == []  # biriken jetonlar silindi, bekleme sürüyor
+    clock.advance(1.0)
+    time.sleep(3 * rate_limit.STOP_POLL)
+    assert order == []  # bekleme bitti ama jeton patlama değil `rate` hızıyla birikir
+    clock.advance(0.1)
+    waiter.join(2)
+    assert order == [INTERACTIVE]
+    assert lim.throttled == 1 and lim.status()["throttled"] == 1
+
+
+def test_usage_is_batched_then_flushed(db, clock):
+    lim = ProviderLimiter("t", rate=0, quota=1000, clock=clock)
+    usage = UsageRepository()
+    lim.acquire(10)
+    lim.acquire(20)
+    assert lim.used() == 30
+    assert usage.get("t", lim.period_key()) is None  # henüz yazılmadı
+
+    clock.advance(rate_limit.USAGE_FLUSH_S)
+    lim.acquire(5)
+    row = usage.get("t", lim.period_key())
+    assert (row["units"], row["requests"]) == (35, 3)  # tek UPSERT'le birikmiş hepsi
+    # Aynı DB'yi kullanan başka süreç (limiter) ortak sayar
+    assert ProviderLimiter("t", rate=0, quota=1000, clock=clock).used() == 35
+
+
+def test_refund_is_written_immediately(db, clock):
+    lim = ProviderLimiter("t", rate=0, quota=1000, clock=clock)
+    lim.acquire(40)
+    lim.refund(15)  # gönderilemeyen istek
+    assert lim.used() == 25
+    assert UsageRepository().get("t", lim.period_key())["units"] == 25
+    lim.refund(100)
+    assert lim.used() == 0  # sayaç eksiye düşmez
+
+
+def test_flush_all_writes_pending_usage(db, clock, monkeypatch):
+    monkeypatch.setattr(rate_limit, "_limiters", {})
+    lim = rate_limit._limiters.setdefault("t", ProviderLimiter("t", rate=0, clock=clock))
+    lim.acquire(7)
+
+    rate_limit.flush_all()
+
+    assert UsageRepository().get("t", lim.period_key())["units"] == 7
@@ -0,0 +1,128 @@
+"""
+SM-2 adımı (aralıklar, yeniden öğrenme, kolaylık tabanı), vadesi gelen kart kuyruğu ve
+egzersiz puanıyla kartın aynı transaction'da yazılması.
+
+    python -m pytest -q tests
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core import database, scheduler
+from app.core.repository import ExerciseRepository, ScheduleRepository, WordRepository
+from app.models import ReviewCard
+from app.services.word_service import WordService
+
+NOW = datetime(2030, 1, 1, 12, 0, 0)
+
+
+class FixedAI:
+    """AIClient yerine: ağsız, sabit puan."""
+    model = "test/fixed"
+
+    def __init__(self, score: int):
+        self.score = score
+
+    def grade(self, direction, original_sentence, user_translation):
+        return self.score, "ok", self.model
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(database, "DB_PATH", tmp_path / "vocab.sqlite3")
+    return tmp_path
+
+
+def _sql(query: str, params=()) -> list:
+    conn = database.get_conn()
+    try:
+        return [tuple(r) for r in conn.execute(query, params).fetchall()]
+    finally:
+        conn.close()
+
+
+def test_quality_is_monotone_with_pass_threshold():
+    qualities = [scheduler.quality_from_score(s) for s in range(11)]
+    assert qualities == sorted(qualities) and qualities[0] == 0 and qualities[-1] == 5
+    assert [s for s in range(11) if scheduler.quality_from_score(s) >= scheduler.PASS_QUALITY][0] \
+        == scheduler.PASS_SCORE == 6
+    assert scheduler.quality_from_score(-3) == 0 and scheduler.quality_from_score(14) == 5
+
+
+def test_pass_intervals():
+    card = ReviewCard(1, "EN")
+    first = scheduler.review(card, 10, NOW)
+    second = scheduler.review(first, 10, NOW)
+    third = scheduler.review(second, 10, NOW)
+
+    assert (first.repetitions, first.interval_days, first.due_at) == (1, 1.0, NOW + timedelta(days=1))
+    assert (second.repetitions, second.interval_days) == (2, 6.0)
+    assert third.repetitions == 3
+    assert third.ease == pytest.approx(2.8)
+    assert third.interval_days == pytest.approx(6.0 * 2.8)
+    assert card.repetitions == 0  # kart yerinde değişmez
+
+
+def test_lapse_resets_to_relearn():
+    card = ReviewCard(1, "EN", ease=2.5, interval_days=15.0, repetitions=3, lapses=1)
+    failed = scheduler.review(card, scheduler.PASS_SCORE - 1, NOW)
+
+    assert (failed.repetitions, failed.interval_days, failed.lapses) == (0, 0.0, 2)
+    assert failed.due_at == NOW + timedelta(minutes=scheduler.RELEARN_MINUTES)
+    assert failed.last_reviewed_at == NOW
+    # Bir sonraki geçiş yeniden ilk aralıkla başlar
+    assert scheduler.review(failed, 10, NOW).interval_days == 1.0
+
+
+def test_ease_never_below_minimum():
+    card = ReviewCard(1, "EN", ease=1.4)
+    for _ in range(5):
+        card = scheduler.review(card, 0, NOW)
+        assert card.ease >= scheduler.MIN_EASE
+    assert card.ease == scheduler.MIN_EASE
+
+
+def test_due_cards_order_and_limit(db):
+    words = WordRepository()
+    ids = [words.create_word(term, "x").id for term in ("a", "b", "c", "d")]
+    repo = ScheduleRepository()
+    # Yeni kelimenin kartları trigger'la açılır; hepsini ileri atıp yalnızca aşağıdakileri vadeli yap
+    for card in repo.due_cards(limit=100, now=NOW):
+        repo.save_card(ReviewCard(card.word_id, card.direction, due_at=NOW + timedelta(days=30)))
+    # b ve c aynı anda vadeli: word_id sırası belirler; d henüz vadesinde değil
+    for word_id, due in zip(ids, (NOW - timedelta(hours=1), NOW - timedelta(days=2),
+                                  NOW - timedelta(days=2), NOW + timedelta(minutes=1))):
+        repo.save_card(ReviewCard(word_id, "EN", due_at=due))
+    repo.save_card(ReviewCard(ids[0], "TR", due_at=NOW - timedelta(days=3)))
+
+    assert [(c.word_id, c.direction) for c in repo.due_cards(limit=10, now=NOW)] == \
+        [(ids[0], "TR"), (ids[1], "EN"), (ids[2], "EN"), (ids[0], "EN")]
+    assert [c.word_id for c in repo.due_cards(limit=2, now=NOW, direction="EN")] == [ids[1], ids[2]]
+    assert repo.count_due(now=NOW) == 4
+
+
+def test_evaluate_writes_card_with_score(db):
+    w = WordRepository().create_word("cat", "kedi")
+    ex_id = ExerciseRepository().add_exercise(w.id, "EN", "cat", "kedi", "The cat sleeps.")
+
+    score, _ = WordService(ai=FixedAI(8)).evaluate_exercise(ex_id, "Kedi uyuyor.")
+
+    card = ScheduleRepository().get_card(w.id, "EN")
+    assert score == 8 and (card.repetitions, card.interval_days) == (1, 1.0)
+    assert _sql("SELECT score FROM examples WHERE exercise_id = ?", (ex_id,)) == [(8,)]
+
+
+def test_evaluate_rolls_back_score_when_card_write_fails(db, monkeypatch):
+    w = WordRepository().create_word("cat", "kedi")
+    ex_id = ExerciseRepository().add_exercise(w.id, "EN", "cat", "kedi", "The cat sleeps.")
+
+    def fail(self, card):
+        raise RuntimeError("disk full")
+    monkeypatch.setattr(ScheduleRepository, "save_card", fail)
+
+    with pytest.raises(RuntimeError):
+        WordService(ai=FixedAI(8)).evaluate_exercise(ex_id, "Kedi uyuyor.")
+
+    assert _sql("SELECT COUNT(*) FROM examples") == [(0,)]
+    assert _sql("SELECT score FROM exercises WHERE id = ?", (ex_id,)) == [(None,)]
+    assert _sql("SELECT score_sum, score_count FROM words WHERE id = ?", (w.id,)) == [(0, 0)]
@@ -0,0 +1,120 @@
+"""
+words.score_sum / score_count / last_score trigger'ları: ekleme, puan değişimi, silme,
+arşivleme bayrağı ve eski trigger'ların düşürülüp yeniden kurulması.
+
+    python -m pytest -q tests
+"""
+import pytest
+
+from app.core import database
+from app.core.repository import ExampleRepository, WordRepository
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(database, "DB_PATH", tmp_path / "vocab.sqlite3")
+    return tmp_path
+
+
+def sql(query: str, params=()) -> list:
+    conn = database.get_conn()
+    try:
+        rows = [tuple(r) for r in conn.execute(query, params).fetchall()]
+        conn.commit()
+        return rows
+    finally:
+        conn.close()
+
+
+def totals(word_id: int) -> tuple:
+    return sql("SELECT score_sum, score_count, last_score FROM words WHERE id = ?", (word_id,))[0]
+
+
+def _add(word_id: int, score) -> int:
+    return ExampleRepository().add_example(word_id, f"örnek {score}", "MANUAL", "TR", score, "ok")
+
+
+def test_insert_update_delete_keep_totals(db):
+    w = WordRepository().create_word("cat", "kedi")
+    assert totals(w.id) == (0, 0, None)
+
+    first = _add(w.id, 4)
+    second = _add(w.id, 9)  # aynı saniye: id sırası en yeniyi belirler
+    assert totals(w.id) == (13, 2, 9)
+
+    sql("UPDATE examples SET score = 10 WHERE id = ?", (first,))
+    assert totals(w.id) == (19, 2, 9)
+
+    sql("DELETE FROM examples WHERE id = ?", (second,))
+    assert totals(w.id) == (10, 1, 10)
+
+    sql("UPDATE examples SET score = NULL WHERE id = ?", (first,))
+    assert totals(w.id) == (0, 0, None)
+
+
+def test_last_score_follows_created_at(db):
+    w = WordRepository().create_word("cat", "kedi")
+    newer = _add(w.id, 7)
+    older = _add(w.id, 2)
+    sql("UPDATE examples SET created_at = '2020-01-01 00:00:00' WHERE id = ?", (older,))
+    sql("UPDATE examples SET score = 3 WHERE id = ?", (older,))  # senkronla gelen eski satır
+    assert totals(w.id) == (10, 2, 7)
+
+    sql("DELETE FROM examples WHERE id = ?", (newer,))
+    assert totals(w.id) == (3, 1, 3)
+
+
+def test_moving_example_updates_both_words(db):
+    words = WordRepository()
+    a, b = words.create_word("cat", "kedi"), words.create_word("dog", "köpek")
+    example_id = _add(a.id, 6)
+
+    sql("UPDATE examples SET word_id = ? WHERE id = ?", (b.id, example_id))
+
+    assert totals(a.id) == (0, 0, None)
+    assert totals(b.id) == (6, 1, 6)
+
+
+def test_archiving_flag_keeps_totals(db):
+    w = WordRepository().create_word("cat", "kedi")
+    _add(w.id, 4)
+    _add(w.id, 9)
+
+    sql("INSERT INTO app_flags(name, value) VALUES ('archiving', '1')")
+    sql("DELETE FROM examples")
+    assert totals(w.id) == (13, 2, 9)  # arşivlenen puanlar ortalamada kalır
+
+    sql("DELETE FROM app_flags WHERE name = 'archiving'")
+    _add(w.id, 5)
+    assert totals(w.id) == (18, 3, 5)
+
+
+def test_stale_triggers_are_recreated(db):
+    w = WordRepository().create_word("cat", "kedi")
+    _add(w.id, 4)
+    # Eski sürüm: arşiv bayrağını ve last_score'u tanımayan trigger'lar, bayat last_score
+    sql("DROP TRIGGER trg_examples_score_del")
+    sql("""CREATE TRIGGER trg_examples_score_del AFTER DELETE ON examples
+           WHEN OLD.score IS NOT NULL
+           BEGIN
+               UPDATE words SET score_sum = score_sum - OLD.score, score_count = score_count - 1
+                WHERE id = OLD.word_id;
+           END""")
+    sql("DROP TRIGGER trg_examples_score_ins")
+    sql("""CREATE TRIGGER trg_examples_score_ins AFTER INSERT ON examples
+           WHEN NEW.score IS NOT NULL
+           BEGIN
+               UPDATE words SET score_sum = score_sum + NEW.score, score_count = score_count + 1
+                WHERE id = NEW.word_id;
+           END""")
+    sql("UPDATE words SET last_score = NULL")
+
+    database._SCHEMA_READY.discard(str(database.DB_PATH))  # yeniden açılış: şema kurulumu tekrar çalışır
+    triggers = dict(sql("SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'trg_examples_score_%'"))
+
+    assert len(triggers) == 3
+    assert "'archiving'" in triggers["trg_examples_score_del"]
+    assert all("last_score = (SELECT" in body for body in triggers.values())
+    assert totals(w.id) == (4, 1, 4)  # bayat last_score geri dolduruldu
+    _add(w.id, 8)
+    assert totals(w.id) == (12, 2, 8)
@@ -0,0 +1,213 @@
+"""
+İki geçici veritabanı arasında iki yönlü eşitleme: çakışan düzenlemeler, öğrenildi
+birleştirmesi, silme/güncelleme yarışı ve arşivlenmiş satırlar.
+
+    python -m pytest -q tests
+"""
+from contextlib import contextmanager
+
+import pytest
+
+from app.core import database
+from app.core.repository import (
+    ExampleRepository, ExerciseRepository, RegradeRepository, SyncRepository, WordRepository
+)
+from app.services.maintenance_service import MaintenanceService
+from app.services.sync_service import SyncService
+
+OLD = "2020-01-01 00:00:00"  # ARCHIVE_AFTER_DAYS'ten eski
+
+
+class Replica:
+    def __init__(self, path):
+        self.path = path
+        with self.use():
+            self.id = SyncService().replica_id()
+
+    @contextmanager
+    def use(self):
+        prev = database.DB_PATH
+        database.DB_PATH = self.path
+        try:
+            yield
+        finally:
+            database.DB_PATH = prev
+
+    def sql(self, query: str, params=()) -> list:
+        with self.use():
+            conn = database.get_conn()
+            try:
+                rows = [tuple(r) for r in conn.execute(query, params).fetchall()]
+                conn.commit()
+                return rows
+            finally:
+                conn.close()
+
+    def word(self, term: str) -> dict:
+        rows = self.sql("SELECT translation_tr, notes, is_learned, score_sum, score_count FROM words "
+                        "WHERE term_norm = ?", (term,))
+        if not rows:
+            return {}
+        return dict(zip(("translation_tr", "notes", "is_learned", "score_sum", "score_count"), rows[0]))
+
+    def stamp(self, entity: str, key: str, changed_at: str) -> None:
+        """Yerel değişikliğin zamanını sabitler (saniye çözünürlüğünde yarışları belirli kılar)."""
+        self.sql("UPDATE change_log SET changed_at = ? WHERE entity = ? AND key = ?", (changed_at, entity, key))
+
+
+def push(src: Replica, dst: Replica) -> dict:
+    with src.use():
+        bundle = SyncService().export_delta(peer=dst.id)
+    with dst.use():
+        return SyncService().apply_delta(bundle)
+
+
+def sync_both(a: Replica, b: Replica) -> None:
+    push(a, b)
+    push(b, a)
+
+
+@pytest.fixture
+def replicas(tmp_path, monkeypatch):
+    monkeypatch.setattr(database, "DB_PATH", tmp_path / "unused.sqlite3")
+    return Replica(tmp_path / "a.sqlite3"), Replica(tmp_path / "b.sqlite3")
+
+
+def _add_word(replica: Replica, term: str, translation: str):
+    with replica.use():
+        return WordRepository().create_word(term, translation)
+
+
+def _add_answer(replica: Replica, word_id: int, score: int, created_at: str = None):
+    """Görev + puanlı cevap; (example_id, exercise_id)."""
+    with replica.use():
+        ex_id = ExerciseRepository().add_exercise(word_id, "TR", "cat", "kedi", "Kedi uyuyor.")
+        example_id = ExampleRepository().add_example(word_id, "The cat sleeps.", "MANUAL", "TR", score, "ok", ex_id)
+    if created_at:
+        replica.sql("UPDATE examples SET created_at = ? WHERE id = ?", (created_at, example_id))
+        replica.sql("UPDATE exercises SET created_at = ? WHERE id = ?", (created_at, ex_id))
+    return example_id, ex_id
+
+
+def test_new_rows_flow_both_ways(replicas):
+    a, b = replicas
+    w = _add_word(a, "cat", "kedi")
+    _add_answer(a, w.id, 6)
+    _add_word(b, "dog", "köpek")
+
+    sync_both(a, b)
+
+    for r in (a, b):
+        assert r.word("cat") == {"translation_tr": "kedi", "notes": "", "is_learned": 0,
+                                 "score_sum": 6, "score_count": 1}
+        assert r.word("dog")["translation_tr"] == "köpek"
+        assert r.sql("SELECT COUNT(*) FROM examples") == [(1,)]
+    # İkinci tur: yeni bir şey gönderilmez, geri yankı yok
+    assert push(a, b)["applied"] == 0
+    assert push(b, a)["applied"] == 0
+
+
+def test_crossing_note_edits_are_merged(replicas):
+    a, b = replicas
+    w = _add_word(a, "cat", "kedi")
+    sync_both(a, b)
+    with a.use():
+        WordRepository().update_fields(w.id, {"notes": "alpha"})
+    with b.use():
+        WordRepository().update_fields(WordRepository().find_by_term("cat").id, {"notes": "beta"})
+
+    sync_both(a, b)
+    sync_both(a, b)  # birleşik sonuç kaynağa da döner
+
+    assert a.word("cat")["notes"] == b.word("cat")["notes"] == "alpha\n\nbeta"
+
+
+def test_learned_survives_newer_unlearned_edit(replicas):
+    a, b = replicas
+    w = _add_word(a, "cat", "kedi")
+    sync_both(a, b)
+    with a.use():
+        WordRepository().set_learned(w.id, True)
+    with b.use():
+        WordRepository().update_fields(WordRepository().find_by_term("cat").id, {"translation_tr": "pisi"})
+    a.stamp("word", "cat", "2030-01-01 00:00:00")
+    b.stamp("word", "cat", "2030-01-01 00:00:05")  # B'nin düzenlemesi daha yeni
+
+    sync_both(a, b)
+    sync_both(a, b)
+
+    for r in (a, b):
+        assert r.word("cat")["is_learned"] == 1
+        assert r.word("cat")["translation_tr"] == "pisi"
+
+
+@pytest.mark.parametrize("update_newer", [True, False])
+def test_delete_vs_update(replicas, update_newer):
+    a, b = replicas
+    w = _add_word(a, "cat", "kedi")
+    sync_both(a, b)
+    with a.use():
+        SyncRepository().delete_by_key("word", "cat")
+    with b.use():
+        WordRepository().update_fields(WordRepository().find_by_term("cat").id, {"notes": "hâlâ burada"})
+    a.stamp("word", "cat", "2030-01-01 00:00:00")
+    b.stamp("word", "cat", "2030-01-01 00:00:05" if update_newer else "2029-12-31 23:59:55")
+
+    sync_both(a, b)
+    sync_both(a, b)
+
+    if update_newer:
+        assert a.word("cat")["notes"] == b.word("cat")["notes"] == "hâlâ burada"
+    else:
+        assert a.word("cat") == b.word("cat") == {}
+
+
+def _archived_on_b(a: Replica, b: Replica, score: int = 4):
+    """A'da öğrenilmiş kelime + eski puanlı cevap; B'ye gelir ve B'de arşivlenir."""
+    w = _add_word(a, "cat", "kedi")
+    with a.use():
+        WordRepository().set_learned(w.id, True)
+    example_id, ex_id = _add_answer(a, w.id, score, created_at=OLD)
+    push(a, b)
+    with b.use():
+        moved = MaintenanceService().archive()
+    assert moved["examples"] == 1 and moved["exercises"] == 1
+    assert b.sql("SELECT COUNT(*) FROM examples") == [(0,)]
+    assert (b.word("cat")["score_sum"], b.word("cat")["score_count"]) == (score, 1)
+    return w, example_id, ex_id
+
+
+def test_archived_example_update_goes_to_archive(replicas):
+    a, b = replicas
+    w, example_id, ex_id = _archived_on_b(a, b)
+    with a.use():
+        RegradeRepository().save_grade(example_id, ex_id, w.id, "The cat sleeps.", 8, "iyi", "model-2")
+
+    stats = push(a, b)
+
+    assert stats["archived"] == 1 and stats["applied"] == 0
+    assert (b.word("cat")["score_sum"], b.word("cat")["score_count"]) == (8, 1)
+    assert b.sql("SELECT COUNT(*) FROM examples") == [(0,)]  # sıcak tabloya geri dönmedi
+    with b.use():
+        archived = MaintenanceService().archived(b.sql("SELECT id FROM words")[0][0])
+        summary = MaintenanceService().summary()
+    assert [(e["score"], e["grader_model"]) for e in archived["examples"]] == [(8, "model-2")]
+    assert (summary["scored"], summary["score_sum"]) == (1, 8)
+    assert b.sql("SELECT score, SUM(n) FROM stats_daily_scores GROUP BY score HAVING SUM(n) > 0") == [(8, 1)]
+    # Geri yönde arşivlenmiş satır için bir şey gönderilmez
+    assert push(b, a)["applied"] == 0
+    assert a.word("cat")["score_sum"] == 8
+
+
+def test_archived_example_delete_removes_archived_score(replicas):
+    a, b = replicas
+    _archived_on_b(a, b)
+    a.sql("DELETE FROM examples")
+
+    stats = push(a, b)
+
+    assert stats["deleted"] == 1
+    assert (b.word("cat")["score_sum"], b.word("cat")["score_count"]) == (0, 0)
+    with b.use():
+        archived = MaintenanceService().archived(b.sql("SELECT id FROM words")[0][0])
+    assert archived["examples"] == [] and len(archived["exercises"]) == 1